@@ -0,0 +1,74 @@
+"""
+Micro-benchmark del núcleo de pivoteo (src/pivoteo.py) contra los ciclos
+fila por fila que usaban simplex_solver y simplex_dos_fases.
+
+Uso: python benchmarks/bench_pivoteo.py
+"""
+import os
+import sys
+import timeit
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from pivoteo import prueba_razon, pivotear
+
+def razon_ciclo(tableau, col_pivote):
+    ratios = []
+    for i in range(1, tableau.shape[0]):
+        if tableau[i, col_pivote] > 1e-8:
+            ratio = tableau[i, -1] / tableau[i, col_pivote]
+            if ratio >= 0:
+                ratios.append(ratio)
+            else:
+                ratios.append(np.inf)
+        else:
+            ratios.append(np.inf)
+    return np.argmin(ratios) + 1
+
+def pivoteo_ciclo(tableau, fila_pivote, col_pivote):
+    pivot_val = tableau[fila_pivote, col_pivote]
+    tableau[fila_pivote] /= pivot_val
+    for i in range(tableau.shape[0]):
+        if i != fila_pivote:
+            factor = tableau[i, col_pivote]
+            tableau[i] -= factor * tableau[fila_pivote]
+
+def tableau_aleatorio(m, n, semilla=0):
+    rng = np.random.default_rng(semilla)
+    tableau = np.hstack((rng.uniform(0.1, 10, (m + 1, n + m)), rng.uniform(1, 100, (m + 1, 1))))
+    tableau[0] = -tableau[0]
+    return tableau
+
+def medir(m, n, repeticiones=20):
+    base = tableau_aleatorio(m, n)
+    col = n // 2
+
+    def ciclo():
+        t = base.copy()
+        pivoteo_ciclo(t, razon_ciclo(t, col), col)
+
+    def nucleo():
+        t = base.copy()
+        pivotear(t, prueba_razon(t[1:, col], t[1:, -1]) + 1, col)
+
+    def copia():
+        base.copy()
+
+    # Se descuenta la copia del tableau, que ambos casos hacen igual
+    t_copia = min(timeit.repeat(copia, number=repeticiones, repeat=5))
+    t_ciclo = min(timeit.repeat(ciclo, number=repeticiones, repeat=5)) - t_copia
+    t_nucleo = min(timeit.repeat(nucleo, number=repeticiones, repeat=5)) - t_copia
+    return t_ciclo / repeticiones, t_nucleo / repeticiones
+
+if __name__ == "__main__":
+    # Ambos caminos deben dejar el mismo tableau
+    a = tableau_aleatorio(50, 80)
+    b = a.copy()
+    pivoteo_ciclo(a, razon_ciclo(a, 40), 40)
+    pivotear(b, prueba_razon(b[1:, 40], b[1:, -1]) + 1, 40)
+    assert np.allclose(a, b)
+
+    print(f"{'m x n':>12} {'ciclos (ms)':>12} {'núcleo (ms)':>12} {'aceleración':>12}")
+    for m, n in [(10, 10), (50, 50), (200, 200), (500, 500), (1000, 1000)]:
+        t_ciclo, t_nucleo = medir(m, n)
+        print(f"{f'{m} x {n}':>12} {t_ciclo * 1e3:12.4f} {t_nucleo * 1e3:12.4f} {t_ciclo / t_nucleo:11.1f}x")
@@ -0,0 +1,200 @@
+"""
+Almacén de soluciones en disco: SQLite con los arreglos de cada solución
+comprimidos en un blob npz.
+
+La clave es un hash canónico del modelo (c, A, b, sentidos, objetivo,
+cotas y enteras, con A dispersa ordenada y sin ceros explícitos), así que
+el mismo modelo da la misma clave entre sesiones aunque se haya escrito
+distinto. Cada fila guarda además un hash de la estructura (dimensiones,
+sentidos y objetivo): los modelos casi iguales (otros coeficientes, otro
+lado derecho) comparten estructura y su base sirve de arranque en caliente
+para simplex_revisado.
+
+    almacen = AlmacenSoluciones("soluciones.sqlite", max_bytes=16 * 2**20)
+    clave = hash_modelo(c, A, b, sentidos, "min", cotas)
+    solucion = almacen.buscar(clave)
+    if solucion is None:
+        estructura = hash_estructura(A, sentidos, "min")
+        solucion = simplex_revisado(c, A, b, sentidos, "min", cotas,
+                                    base_inicial=almacen.base_cercana(estructura))
+        almacen.guardar(clave, estructura, solucion)
+
+Cada operación abre su propia conexión, así que el almacén se puede usar
+desde los hilos de la interfaz y desde los procesos de lote_modelos.
+"""
+import hashlib
+import io
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import scipy.sparse as sp
+
+# Archivo que usan las pantallas
+RUTA_PREDETERMINADA = Path.home() / ".simplex" / "soluciones.sqlite"
+
+def _actualizar(h, arreglo, dtype):
+    arreglo = np.ascontiguousarray(arreglo, dtype=dtype)
+    h.update(str(arreglo.shape).encode())
+    h.update(arreglo.tobytes())
+
+def hash_modelo(c, A, b, sentidos=None, objetivo="max", cotas=None, enteras=None):
+    """Hash canónico (SHA-256 en hexadecimal) del modelo completo"""
+    A = sp.csr_matrix(A, dtype=float)
+    A.sum_duplicates()
+    A.eliminate_zeros()
+    A.sort_indices()
+    m, n = A.shape
+    if sentidos is None:
+        sentidos = ["<="] * m
+    if cotas is None:
+        cotas = (np.zeros(n), np.full(n, np.inf))
+    if enteras is None:
+        enteras = np.zeros(n, dtype=bool)
+    h = hashlib.sha256()
+    h.update(f"{objetivo}|{','.join(sentidos)}|".encode())
+    _actualizar(h, c, "<f8")
+    _actualizar(h, A.indptr, "<i8")
+    _actualizar(h, A.indices, "<i8")
+    _actualizar(h, A.data, "<f8")
+    _actualizar(h, b, "<f8")
+    _actualizar(h, cotas[0], "<f8")
+    _actualizar(h, cotas[1], "<f8")
+    _actualizar(h, enteras, "?")
+    return h.hexdigest()
+
+def hash_estructura(A, sentidos=None, objetivo="max"):
+    """Hash de las dimensiones, sentidos y objetivo: lo comparten los modelos casi iguales"""
+    m, n = A.shape
+    if sentidos is None:
+        sentidos = ["<="] * m
+    return hashlib.sha256(f"{m}x{n}|{objetivo}|{','.join(sentidos)}".encode()).hexdigest()
+
+def _a_npz(solucion):
+    """Arreglos, números y textos de la solución en un npz comprimido (lo demás se omite)"""
+    arreglos = {}
+    for clave, valor in solucion.items():
+        if isinstance(valor, (np.ndarray, list, tuple, int, float, str, np.number)):
+            arreglos[clave] = np.asarray(valor)
+    salida = io.BytesIO()
+    np.savez_compressed(salida, **arreglos)
+    return salida.getvalue()
+
+def _de_npz(datos):
+    with np.load(io.BytesIO(datos), allow_pickle=False) as npz:
+        return {clave: npz[clave].item() if npz[clave].ndim == 0 else npz[clave] for clave in npz.files}
+
+class AlmacenSoluciones:
+    """
+    Soluciones óptimas en un archivo SQLite, con un tope de `max_bytes`
+    para la suma de los blobs: al pasarlo se borran las soluciones usadas
+    hace más tiempo. `aciertos` y `fallos` cuentan las búsquedas de esta
+    instancia.
+    """
+
+    def __init__(self, ruta=RUTA_PREDETERMINADA, max_bytes=64 * 2**20):
+        if max_bytes <= 0:
+            raise ValueError("El tamaño máximo del almacén debe ser positivo")
+        self.ruta = Path(ruta)
+        self.max_bytes = max_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        with self._conectar() as con:
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS soluciones (
+                    clave TEXT PRIMARY KEY,
+                    estructura TEXT NOT NULL,
+                    datos BLOB NOT NULL,
+                    bytes INTEGER NOT NULL,
+                    z REAL,
+                    iteraciones INTEGER,
+                    con_base INTEGER NOT NULL,
+                    usado REAL NOT NULL
+                )""")
+            con.execute("CREATE INDEX IF NOT EXISTS por_estructura ON soluciones (estructura, usado)")
+            con.execute("CREATE INDEX IF NOT EXISTS por_uso ON soluciones (usado)")
+
+    @contextmanager
+    def _conectar(self):
+        # Varios procesos pueden escribir a la vez: se espera el bloqueo en lugar de fallar
+        con = sqlite3.connect(self.ruta, timeout=30)
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    def buscar(self, clave):
+        """Solución guardada para el modelo con esa clave, o None"""
+        with self._conectar() as con:
+            fila = con.execute("SELECT datos FROM soluciones WHERE clave = ?", (clave,)).fetchone()
+            if fila is None:
+                self.fallos += 1
+                return None
+            con.execute("UPDATE soluciones SET usado = ? WHERE clave = ?", (time.time(), clave))
+        self.aciertos += 1
+        return _de_npz(fila[0])
+
+    def base_cercana(self, estructura):
+        """
+        La solución (con "base" y "x") usada más recientemente entre los
+        modelos de la misma estructura, para base_inicial; None si no hay
+        """
+        with self._conectar() as con:
+            fila = con.execute(
+                "SELECT datos FROM soluciones WHERE estructura = ? AND con_base = 1 "
+                "ORDER BY usado DESC LIMIT 1", (estructura,)).fetchone()
+        return None if fila is None else _de_npz(fila[0])
+
+    def guardar(self, clave, estructura, solucion):
+        """
+        Guarda la solución (un dict con "x", "z", "iteraciones" y, si la
+        hay, la "base") y aplica el tope de tamaño. Solo se guardan óptimos.
+        """
+        if solucion.get("estado", "optimo") != "optimo":
+            return
+        datos = _a_npz(solucion)
+        if len(datos) > self.max_bytes:
+            return
+        with self._conectar() as con:
+            con.execute(
+                "INSERT OR REPLACE INTO soluciones VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (clave, estructura, datos, len(datos), float(solucion["z"]),
+                 int(solucion.get("iteraciones", 0)), int("base" in solucion and "x" in solucion),
+                 time.time()))
+            self._desalojar(con)
+
+    def _desalojar(self, con):
+        """Borra las soluciones menos usadas hasta que los blobs entren en max_bytes"""
+        total = con.execute("SELECT COALESCE(SUM(bytes), 0) FROM soluciones").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for clave, tam in con.execute("SELECT clave, bytes FROM soluciones ORDER BY usado").fetchall():
+            con.execute("DELETE FROM soluciones WHERE clave = ?", (clave,))
+            total -= tam
+            if total <= self.max_bytes:
+                break
+
+    def limpiar(self):
+        with self._conectar() as con:
+            con.execute("DELETE FROM soluciones")
+        self.aciertos = self.fallos = 0
+
+    def estadisticas(self):
+        with self._conectar() as con:
+            cantidad, total = con.execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM soluciones").fetchone()
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "soluciones": cantidad,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+        }
+
+    def __len__(self):
+        with self._conectar() as con:
+            return con.execute("SELECT COUNT(*) FROM soluciones").fetchone()[0]
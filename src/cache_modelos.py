@@ -0,0 +1,112 @@
+import hashlib
+import re
+import sys
+from collections import OrderedDict
+
+import numpy as np
+
+def normalizar(texto):
+    """
+    Texto del modelo en minúsculas, sin líneas vacías ni espacios de más.
+    Entre dos letras o dígitos queda un espacio, porque "2 3x" no es "23x".
+    """
+    lineas = []
+    for linea in texto.lower().splitlines():
+        linea = re.sub(r"\s+", " ", linea.strip())
+        linea = re.sub(r" (?=\W)|(?<=\W) ", "", linea)
+        if linea:
+            lineas.append(linea)
+    return "\n".join(lineas)
+
+def clave_modelo(func_obj_str, restricciones_str, *extra):
+    """
+    Hash del objetivo y las restricciones normalizados: "z = 4x1 + 6X2" y
+    "z=4x1+6x2" dan la misma clave. `extra` distingue lecturas distintas
+    del mismo texto (por ejemplo con o sin cotas separadas).
+    """
+    partes = [normalizar(func_obj_str), normalizar(restricciones_str)] + [repr(e) for e in extra]
+    return hashlib.sha256("\x00".join(partes).encode("utf-8")).hexdigest()
+
+def _congelar(valor):
+    """Arreglos de solo lectura y listas como tuplas, para compartirlos sin copiarlos"""
+    if isinstance(valor, np.ndarray):
+        valor.flags.writeable = False
+        return valor
+    if isinstance(valor, dict):
+        return {clave: _congelar(v) for clave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return tuple(_congelar(v) for v in valor)
+    return valor
+
+def _tamano(valor):
+    """Bytes aproximados de un modelo leído: los de los arreglos más los de los textos"""
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if isinstance(valor, dict):
+        return sum(_tamano(v) for v in valor.values())
+    if isinstance(valor, tuple):
+        return sum(_tamano(v) for v in valor)
+    return sys.getsizeof(valor)
+
+class CacheModelos:
+    """
+    Caché LRU en memoria de modelos ya leídos, para no volver a detectar
+    variables ni parsear cada restricción cuando se resuelve el mismo texto.
+
+    Los modelos (dicts con los arreglos c, A y b listos) se guardan con los
+    arreglos de solo lectura y se entregan sin copiarlos. La suma de sus
+    tamaños no pasa de `max_bytes`: al pasarse se descartan los usados hace
+    más tiempo. `aciertos` y `fallos` cuentan las consultas.
+    """
+
+    def __init__(self, max_bytes=16 * 2**20):
+        if max_bytes <= 0:
+            raise ValueError("El tamaño máximo de la caché debe ser positivo")
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.entradas = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, func_obj_str, restricciones_str, construir, *extra):
+        """
+        Modelo del texto: el guardado si ya se leyó, o el que devuelve
+        construir() (que solo se llama en un fallo). Los arreglos quedan de
+        solo lectura; quien quiera modificarlos usa ndarray.copy(). Un
+        modelo más grande que max_bytes se entrega sin guardarlo. Si
+        construir() lanza una excepción no se guarda nada.
+        """
+        clave = clave_modelo(func_obj_str, restricciones_str, *extra)
+        if clave in self.entradas:
+            self.aciertos += 1
+            self.entradas.move_to_end(clave)
+            return dict(self.entradas[clave][0])
+        self.fallos += 1
+        modelo = _congelar(construir())
+        tamano = _tamano(modelo)
+        if tamano <= self.max_bytes:
+            self.entradas[clave] = (modelo, tamano)
+            self.bytes += tamano
+            while self.bytes > self.max_bytes:
+                _, (_, liberado) = self.entradas.popitem(last=False)
+                self.bytes -= liberado
+        return dict(modelo)
+
+    def limpiar(self):
+        self.entradas.clear()
+        self.bytes = 0
+        self.aciertos = self.fallos = 0
+
+    def estadisticas(self):
+        consultas = self.aciertos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tamaño": len(self.entradas),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+        }
+
+    def __len__(self):
+        return len(self.entradas)
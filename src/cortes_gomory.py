@@ -0,0 +1,199 @@
+import numpy as np
+import scipy.sparse as sp
+from pivoteo import pivotear
+from simplex_tableau import simplex_dos_fases
+
+def _filas_enteras(A, b, max_decimales=6):
+    """
+    Escala cada fila por una potencia de 10 hasta que sus coeficientes y su
+    lado derecho sean enteros: así las holguras también son enteras y los
+    cortes valen para todas las variables del tableau.
+    """
+    A = A.copy()
+    b = b.copy()
+    for i in range(len(b)):
+        for _ in range(max_decimales + 1):
+            fila = np.append(A[i], b[i])
+            if np.all(np.abs(fila - np.round(fila)) <= 1e-9 * np.maximum(1.0, np.abs(fila))):
+                break
+            A[i] *= 10
+            b[i] *= 10
+        else:
+            raise ValueError(f"La restricción {i+1} tiene coeficientes que no se pueden llevar a enteros")
+    return np.round(A), np.round(b)
+
+def _fraccion(v):
+    return v - np.floor(v)
+
+def _reoptimizar(tableau, base, fijas, tablas, max_iteraciones, tol):
+    """
+    Simplex dual sobre el tableau con cortes: la fila Z sigue siendo óptima
+    y solo las holguras de los cortes nuevos quedan negativas.
+    Devuelve None al recuperar la factibilidad o el estado si no se puede.
+    """
+    for _ in range(max_iteraciones):
+        ld = tableau[1:, -1]
+        fila = int(np.argmin(ld))
+        if ld[fila] >= -tol:
+            return None
+        alfa = tableau[fila + 1, :-1]
+        candidatas = ~fijas & (alfa < -1e-9)
+        candidatas[base[base >= 0]] = False
+        if not np.any(candidatas):
+            return "no_factible"
+        razones = np.full(len(alfa), np.inf)
+        razones[candidatas] = tableau[0, :-1][candidatas] / np.abs(alfa[candidatas])
+        col = int(np.argmin(razones))
+        pivotear(tableau, fila + 1, col)
+        tablas.agregar_pivote(fila + 1, col)
+    return "limite_iteraciones"
+
+def cortes_gomory(c, A, b, sentidos=None, objetivo="max", max_rondas=50, cortes_por_ronda=None,
+                  max_cortes=None, edad_maxima=3, regla="dantzig", variables=None,
+                  archivo_traza=None, max_iteraciones=None, tol=1e-6):
+    """
+    Cortes fraccionarios de Gomory para programación lineal entera pura:
+    todas las variables deben tomar valores enteros.
+
+    Se resuelve la relajación con simplex_dos_fases y se toma su tableau
+    final (`regla` es su regla de precio). En cada ronda, cada fila con valor básico fraccionario
+    x_B + Σ a_j x_j = β da el corte Σ frac(a_j) x_j >= frac(β), que se agrega
+    como fila nueva con su holgura básica (negativa) y se vuelve a optimizar
+    con el simplex dual. Las filas se escalan a coeficientes enteros para
+    que las holguras también sean enteras.
+
+    Para que el tableau no crezca sin límite: cada ronda agrega como mucho
+    `cortes_por_ronda` cortes (los más fraccionarios, por defecto el número
+    de variables), nunca hay más de `max_cortes` activos (por defecto
+    2·(variables + restricciones)), y un corte cuya holgura sigue básica y
+    positiva durante `edad_maxima` rondas se considera inactivo y se quita
+    con su fila y su columna. `max_iteraciones` limita los pivotes duales
+    de cada ronda.
+
+    Devuelve la TrazaSimplex de simplex_dos_fases con un segmento "RONDA k"
+    por ronda de cortes. `estado` es "optimo", "no_factible", "no_acotado",
+    "limite_rondas", "limite_cortes" o "limite_iteraciones"; `mejor` tiene
+    la solución entera, o None si no se llegó a una. `tablas.cortes` resume
+    las rondas y los cortes generados, purgados y activos.
+    """
+    c = np.asarray(c, dtype=float)
+    if sp.issparse(A):
+        A = A.toarray()
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    m, n = A.shape
+    if sentidos is None:
+        sentidos = ["<="] * m
+    A, b = _filas_enteras(A, b)
+    if cortes_por_ronda is None:
+        cortes_por_ronda = n
+    if max_cortes is None:
+        max_cortes = 2 * (n + m)
+    if max_iteraciones is None:
+        max_iteraciones = 50 * (n + m + max_cortes)
+    signo = 1.0 if objetivo == "max" else -1.0
+
+    # La relajación se minimiza; el tableau final es el punto de partida
+    tablas = simplex_dos_fases(-signo * c, A, b, sentidos, regla, archivo_traza=archivo_traza,
+                               variables=variables)
+    tablas.cortes = {"rondas": 0, "generados": 0, "purgados": 0, "activos": 0}
+    if tablas.estado != "optimo":
+        tablas.mejor = None
+        return tablas
+    _, tableau, nombres = tablas[-1]
+    tableau = tableau.copy()
+    nombres = list(nombres[:-1])
+    base = tablas.base.copy()
+    fijas = np.zeros(n + m, dtype=bool)
+    fijas[n:] = [s == "=" for s in sentidos]
+
+    # Cortes activos: nombre de la holgura y rondas seguidas inactivo
+    cortes = []
+    generados = purgados = 0
+    estado = "limite_rondas"
+
+    def purgar(edad):
+        """
+        Quita los cortes inactivos desde hace `edad` rondas o más: su holgura
+        es básica, así que sacar su fila y su columna deja el resto igual
+        """
+        nonlocal tableau, base, fijas, purgados
+        for k in [k for k, corte in enumerate(cortes) if corte["edad"] >= edad][::-1]:
+            col = n + m + k
+            fila = int(np.flatnonzero(base == col)[0])
+            tableau = np.delete(np.delete(tableau, fila + 1, axis=0), col, axis=1)
+            base = np.delete(base, fila)
+            base[base > col] -= 1
+            fijas = np.delete(fijas, col)
+            del nombres[col]
+            del cortes[k]
+            purgados += 1
+
+    for ronda in range(1, max_rondas + 1):
+        purgar(edad_maxima)
+        if len(cortes) >= max_cortes:
+            # Sin lugar se quitan antes de tiempo los cortes que ya no están activos
+            purgar(1)
+        ld = tableau[1:, -1]
+        fraccion = _fraccion(ld)
+        fraccionarias = np.flatnonzero((base >= 0) & (fraccion > tol) & (fraccion < 1 - tol))
+        if not len(fraccionarias):
+            estado = "optimo"
+            break
+        libres = max_cortes - len(cortes)
+        if libres <= 0:
+            estado = "limite_cortes"
+            break
+        # Primero las filas más fraccionarias (fracción más cerca de 1/2)
+        orden = np.argsort(np.abs(fraccion[fraccionarias] - 0.5), kind="stable")
+        filas = fraccionarias[orden[:min(cortes_por_ronda, libres)]]
+
+        k = len(filas)
+        filas_tab, columnas_tab = tableau.shape
+        nuevo = np.zeros((filas_tab + k, columnas_tab + k))
+        nuevo[:filas_tab, :columnas_tab - 1] = tableau[:, :-1]
+        nuevo[:filas_tab, -1] = tableau[:, -1]
+        for t, fila in enumerate(filas):
+            corte = -_fraccion(tableau[fila + 1, :-1])
+            corte[np.abs(corte) < 1e-9] = 0.0
+            corte[base[base >= 0]] = 0.0
+            nuevo[filas_tab + t, :columnas_tab - 1] = corte
+            nuevo[filas_tab + t, columnas_tab - 1 + t] = 1.0
+            nuevo[filas_tab + t, -1] = -fraccion[fila]
+            generados += 1
+            nombres.append(f"g{generados}")
+            cortes.append({"edad": 0})
+        tableau = nuevo
+        base = np.concatenate((base, np.arange(columnas_tab - 1, columnas_tab - 1 + k)))
+        fijas = np.concatenate((fijas, np.zeros(k, dtype=bool)))
+
+        tablas.nuevo_segmento(tableau, f"RONDA {ronda}", nombres + ["LD"], base)
+        base = tablas.base
+        resultado = _reoptimizar(tableau, base, fijas, tablas, max_iteraciones, tol)
+        tablas.cerrar_segmento(tableau)
+        tablas.cortes["rondas"] = ronda
+        if resultado is not None:
+            estado = resultado
+            break
+
+        # Envejecimiento: un corte con holgura básica positiva no está activo
+        ld = tableau[1:, -1]
+        for k, corte in enumerate(cortes):
+            filas_corte = np.flatnonzero(base == n + m + k)
+            inactivo = len(filas_corte) and ld[filas_corte[0]] > tol
+            corte["edad"] = corte["edad"] + 1 if inactivo else 0
+
+    tablas.cerrar()
+    tablas.base = base
+    tablas.estado = estado
+    tablas.cortes.update(generados=generados, purgados=purgados, activos=len(cortes))
+    if estado != "optimo":
+        tablas.mejor = None
+        return tablas
+    x = np.zeros(n)
+    for i, j in enumerate(base):
+        if 0 <= j < n:
+            x[j] = tableau[i + 1, -1]
+    x = np.round(x) + 0.0
+    tablas.mejor = {"x": x, "z": float(c @ x)}
+    return tablas
@@ -0,0 +1,104 @@
+import numpy as np
+import scipy.sparse as sp
+
+def _extremos(M, eje):
+    """Máximo y mínimo de |a| entre los no ceros de cada fila (eje=1) o columna (eje=0)"""
+    # scipy no reduce matrices dispersas vacías: esas van por el camino denso
+    if sp.issparse(M) and M.size:
+        M = sp.csr_matrix(abs(M))
+        maximo = M.max(axis=eje).toarray().ravel()
+        # El mínimo de los no ceros es el inverso del máximo de los inversos
+        inversos = M.copy()
+        inversos.data = 1.0 / inversos.data
+        minimo_inv = inversos.max(axis=eje).toarray().ravel()
+        minimo = np.divide(1.0, minimo_inv, out=np.zeros_like(minimo_inv), where=minimo_inv > 0)
+    else:
+        absM = np.abs(M.toarray() if sp.issparse(M) else M)
+        maximo = absM.max(axis=eje) if absM.size else np.zeros(absM.shape[1 - eje])
+        minimo = np.where(absM > 0, absM, np.inf).min(axis=eje) if absM.size else maximo.copy()
+        minimo = np.where(np.isfinite(minimo), minimo, 0.0)
+    return maximo, minimo
+
+def aplicar_escala(A, r, s):
+    """diag(r) A diag(s) conservando el formato de A"""
+    if sp.issparse(A):
+        return (sp.diags(r) @ A @ sp.diags(s)).tocsr()
+    return r[:, None] * np.asarray(A, dtype=float) * s[None, :]
+
+def rango(A):
+    """Cociente entre el mayor y el menor coeficiente no nulo en valor absoluto"""
+    maximo, minimo = _extremos(A, 1)
+    nz = maximo > 0
+    if not np.any(nz):
+        return 1.0
+    return float(maximo[nz].max() / minimo[nz].min())
+
+def factores_escala(A, pasadas=4, equilibrar=True):
+    """
+    Factores de fila r y de columna s para que diag(r) A diag(s) tenga sus
+    coeficientes cerca de 1: primero pasadas de media geométrica (cada fila
+    y columna se divide por sqrt(max·min)) y luego equilibrio (máximo 1).
+    Se redondean a potencias de 2 para que escalar y desescalar sean exactos.
+    """
+    m, n = A.shape
+    r, s = np.ones(m), np.ones(n)
+
+    def corregir(maximo, minimo):
+        return np.where(maximo > 0, 1.0 / np.sqrt(np.maximum(maximo * minimo, 1e-300)), 1.0)
+
+    for _ in range(pasadas):
+        r *= corregir(*_extremos(aplicar_escala(A, r, s), 1))
+        s *= corregir(*_extremos(aplicar_escala(A, r, s), 0))
+    if equilibrar:
+        maximo = _extremos(aplicar_escala(A, r, s), 1)[0]
+        r /= np.where(maximo > 0, maximo, 1.0)
+        maximo = _extremos(aplicar_escala(A, r, s), 0)[0]
+        s /= np.where(maximo > 0, maximo, 1.0)
+    return 2.0 ** np.round(np.log2(r)), 2.0 ** np.round(np.log2(s))
+
+def escalar_modelo(c, A, b, cotas=None):
+    """Modelo escalado (c·s, diag(r) A diag(s), r·b, cotas / s) y sus factores"""
+    if not sp.issparse(A):
+        A = np.asarray(A, dtype=float)
+    r, s = factores_escala(A)
+    cotas_e = None
+    if cotas is not None:
+        cotas_e = (np.asarray(cotas[0], dtype=float) / s, np.asarray(cotas[1], dtype=float) / s)
+    return (np.asarray(c, dtype=float) * s, aplicar_escala(A, r, s),
+            np.asarray(b, dtype=float) * r, cotas_e, r, s)
+
+def desescalar_primal(x, r, s):
+    """x del modelo original: estructurales por s, holguras (y artificiales) entre r"""
+    x = np.array(x, dtype=float)
+    if x.size == 0:
+        return x
+    n, m = len(s), len(r)
+    x[:n] *= s
+    for inicio in range(n, len(x), m or len(x)):
+        x[inicio:inicio + m] /= r[:len(x) - inicio]
+    return x
+
+def escalar_primal(x, r, s):
+    """Inversa de desescalar_primal, para llevar una solución previa al modelo escalado"""
+    return desescalar_primal(x, 1.0 / r, 1.0 / s)
+
+def desescalar_dual(y, r):
+    """Si A' = diag(r) A diag(s), los duales del original son y = r·y'"""
+    return np.asarray(y, dtype=float) * r
+
+def resumen_escala(rango_original, rango_escalado, iteraciones, iteraciones_sin_escala=None, comparado=False):
+    """
+    Texto para las pantallas con el efecto del escalado en el rango y las
+    iteraciones. Con `comparado` se agregan las iteraciones del modelo sin
+    escalar (None si sin escalar no se pudo resolver).
+    """
+    if not comparado:
+        return (f"Escalado: rango de coeficientes {rango_original:.3g} → {rango_escalado:.3g}; "
+                f"{iteraciones} iteraciones")
+    if iteraciones_sin_escala is None:
+        comparacion = "sin escalar no se pudo resolver"
+    else:
+        comparacion = (f"{iteraciones_sin_escala} sin escalar, "
+                       f"{iteraciones_sin_escala - iteraciones} ahorradas")
+    return (f"Escalado: rango de coeficientes {rango_original:.3g} → {rango_escalado:.3g}; "
+            f"{iteraciones} iteraciones ({comparacion})")
@@ -0,0 +1,144 @@
+import re
+
+# Un token por alternativa: número, identificador, relación u operador
+_TOKEN = re.compile(r"\s*(?:(\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)|([^\W\d]\w*)|(<=|>=|=)|([+\-*,]))")
+
+# Palabras de las líneas "x3 libre" y "x1, x2 enteras", que no son variables
+PALABRAS_CLAVE = {"libre", "entera", "enteras"}
+
+def tokenizar(texto):
+    """
+    Recorre el texto una sola vez y da los tokens (tipo, valor) con tipo
+    "num", "id", "rel" u "op". Los identificadores son cualquier nombre que
+    empiece con letra o "_" (x1, y, costo_2, año) y no distinguen mayúsculas.
+    """
+    texto = texto.lower()
+    pos, fin = 0, len(texto.rstrip())
+    while pos < fin:
+        m = _TOKEN.match(texto, pos)
+        if m is None:
+            raise ValueError(f"Carácter inesperado '{texto[pos:].lstrip()[0]}' en: {texto}")
+        pos = m.end()
+        numero, identificador, relacion, operador = m.groups()
+        if numero is not None:
+            yield "num", float(numero)
+        elif identificador is not None:
+            yield "id", identificador
+        elif relacion is not None:
+            yield "rel", relacion
+        else:
+            yield "op", operador
+
+def _sin_etiqueta(tokens):
+    """Quita el "z=" (o "min=", "max=") del comienzo de la función objetivo"""
+    tokens = list(tokens)
+    if len(tokens) >= 2 and tokens[0][0] == "id" and tokens[1] == ("rel", "="):
+        return tokens[2:]
+    return tokens
+
+def clave_natural(nombre):
+    """Orden natural: x2 antes que x10"""
+    return [int(parte) if parte.isdigit() else parte for parte in re.split(r"(\d+)", nombre)]
+
+def detectar_variables(func_obj_str, restricciones_str):
+    """Nombres de las variables del modelo, en orden natural"""
+    nombres = {valor for tipo, valor in _sin_etiqueta(tokenizar(func_obj_str)) if tipo == "id"}
+    for linea in restricciones_str.splitlines():
+        nombres.update(valor for tipo, valor in tokenizar(linea) if tipo == "id")
+    return sorted(nombres - PALABRAS_CLAVE, key=clave_natural)
+
+def tabla_simbolos(variables):
+    """Tabla nombre → índice de columna (si ya es una tabla se devuelve igual)"""
+    if isinstance(variables, dict):
+        return variables
+    return {nombre: j for j, nombre in enumerate(variables)}
+
+def lineal_de_tokens(tokens, simbolos, texto=""):
+    """
+    Arma la fila dispersa a partir de tokens (tipo, valor) ya separados;
+    la usan fila_lineal y los lectores de otros formatos. `texto` solo
+    aparece en los mensajes de error. Un operador sin término que lo siga
+    o un lado vacío de la relación ("x1 + <= 3", "<= 3") son errores.
+    """
+    coefs = {}
+    ld = 0.0
+    sentido = None
+    lado = 1.0
+    signo = 1.0
+    numero = None
+    cerrado = False
+    # Términos del lado actual y si el último token fue un operador sin su término
+    terminos = 0
+    operador = False
+
+    def cerrar_lado():
+        if operador:
+            raise ValueError(f"Falta un término después del operador en: {texto}")
+        if not terminos:
+            raise ValueError(f"Un lado de la relación está vacío en: {texto}")
+
+    for tipo, valor in tokens:
+        if tipo == "num":
+            if numero is not None or cerrado:
+                raise ValueError(f"Falta un operador entre los términos de: {texto}")
+            numero = valor
+            terminos, operador = terminos + 1, False
+        elif tipo == "id":
+            if cerrado:
+                raise ValueError(f"Término no lineal en: {texto}")
+            if valor not in simbolos:
+                raise ValueError(f"Variable desconocida '{valor}' en: {texto}")
+            j = simbolos[valor]
+            coefs[j] = coefs.get(j, 0.0) + lado * signo * (1.0 if numero is None else numero)
+            signo, numero, cerrado = 1.0, None, True
+            terminos, operador = terminos + 1, False
+        elif tipo == "op" and valor in "+-":
+            # Una constante suelta pasa al lado derecho
+            if numero is not None:
+                ld -= lado * signo * numero
+                signo, numero = 1.0, None
+            if valor == "-":
+                signo = -signo
+            cerrado, operador = False, True
+        elif tipo == "op" and valor == "*":
+            if numero is None:
+                raise ValueError(f"Falta el coeficiente antes de '*' en: {texto}")
+            operador = True
+        elif tipo == "rel":
+            if sentido is not None:
+                raise ValueError(f"Hay más de una relación en: {texto}")
+            cerrar_lado()
+            if numero is not None:
+                ld -= lado * signo * numero
+            sentido, lado, signo, numero, cerrado = valor, -1.0, 1.0, None, False
+            terminos = 0
+        else:
+            raise ValueError(f"Símbolo '{valor}' fuera de lugar en: {texto}")
+    if sentido is not None or operador:
+        cerrar_lado()
+    if numero is not None:
+        ld -= lado * signo * numero
+    return coefs, sentido, ld
+
+def fila_lineal(texto, simbolos):
+    """
+    Lee una restricción lineal en una sola pasada y la devuelve dispersa:
+    (coeficientes {índice: valor}, sentido, ld). Las variables de ambos
+    lados quedan a la izquierda y las constantes a la derecha, así que
+    "2x1 + 3 <= x2" da ({x1: 2, x2: -1}, "<=", -3).
+    """
+    return lineal_de_tokens(tokenizar(texto), tabla_simbolos(simbolos), texto)
+
+def objetivo_lineal(texto, simbolos):
+    """Coeficientes dispersos {índice: valor} de la función objetivo (sin "z=")"""
+    coefs, sentido, _ = lineal_de_tokens(_sin_etiqueta(tokenizar(texto)), tabla_simbolos(simbolos), texto)
+    if sentido is not None:
+        raise ValueError(f"La función objetivo no puede tener una relación: {texto}")
+    return coefs
+
+def densa(coefs, num_vars):
+    """Fila dispersa {índice: valor} como lista de num_vars coeficientes"""
+    fila = [0.0] * num_vars
+    for j, valor in coefs.items():
+        fila[j] = valor
+    return fila
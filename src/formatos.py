@@ -0,0 +1,580 @@
+"""
+Lectura y escritura de modelos en formato MPS (libre) y CPLEX LP.
+
+Los lectores recorren el archivo línea por línea y guardan los coeficientes
+en un buffer COO preasignado que duplica su capacidad al llenarse, sin
+armar el texto completo ni una matriz densa. Devuelven un dict con las
+mismas claves que reciben los escritores:
+
+    modelo = leer_archivo("afiro.mps")
+    solucion = simplex_revisado(modelo["c"], modelo["A"], modelo["b"], modelo["sentidos"],
+                                modelo["objetivo"], modelo["cotas"])
+    escribir_archivo("afiro.lp", **modelo)
+
+Claves: nombre, objetivo ("max" o "min"), variables, restricciones
+(nombres de las filas), c, A (CSR), b, sentidos, cotas (inferior,
+superior), enteras (bool por variable) y constante del objetivo.
+Los archivos terminados en .gz se leen y escriben comprimidos.
+"""
+import gzip
+import re
+from contextlib import contextmanager
+
+import numpy as np
+import scipy.sparse as sp
+from expresiones import lineal_de_tokens
+
+class _BufferCOO:
+    """Tripletas (fila, columna, valor) en arreglos preasignados que crecen al doble"""
+
+    def __init__(self, capacidad=1024):
+        self.filas = np.empty(capacidad, dtype=np.int64)
+        self.columnas = np.empty(capacidad, dtype=np.int64)
+        self.datos = np.empty(capacidad)
+        self.num = 0
+
+    def agregar(self, fila, columna, valor):
+        if self.num == len(self.datos):
+            self.filas = np.concatenate((self.filas, np.empty_like(self.filas)))
+            self.columnas = np.concatenate((self.columnas, np.empty_like(self.columnas)))
+            self.datos = np.concatenate((self.datos, np.empty_like(self.datos)))
+        self.filas[self.num] = fila
+        self.columnas[self.num] = columna
+        self.datos[self.num] = valor
+        self.num += 1
+
+    def matriz(self, forma):
+        k = self.num
+        return sp.csr_matrix((self.datos[:k], (self.filas[:k], self.columnas[:k])), shape=forma)
+
+@contextmanager
+def _abrir(fuente, modo="r"):
+    """Ruta (comprimida si termina en .gz) o archivo ya abierto"""
+    if hasattr(fuente, "read" if modo == "r" else "write"):
+        yield fuente
+        return
+    ruta = str(fuente)
+    if ruta.lower().endswith(".gz"):
+        archivo = gzip.open(ruta, modo + "t", encoding="utf-8")
+    else:
+        archivo = open(ruta, modo, encoding="utf-8")
+    with archivo:
+        yield archivo
+
+def _interno(simbolos, nombre):
+    """Índice de la variable, agregándola a la tabla si es nueva"""
+    j = simbolos.get(nombre)
+    if j is None:
+        j = simbolos[nombre] = len(simbolos)
+    return j
+
+def _cotas(simbolos, inferior, superior):
+    n = len(simbolos)
+    inf_arr = np.zeros(n)
+    sup_arr = np.full(n, np.inf)
+    for j, valor in inferior.items():
+        inf_arr[j] = valor
+    for j, valor in superior.items():
+        sup_arr[j] = valor
+    return inf_arr, sup_arr
+
+def _modelo(nombre, objetivo, simbolos, restricciones, c, buffer, b, sentidos, inferior, superior,
+            enteras, constante):
+    n, m = len(simbolos), len(sentidos)
+    c_arr = np.zeros(n)
+    for j, valor in c.items():
+        c_arr[j] = valor
+    enteras_arr = np.zeros(n, dtype=bool)
+    enteras_arr[list(enteras)] = True
+    return {
+        "nombre": nombre,
+        "objetivo": objetivo,
+        "variables": list(simbolos),
+        "restricciones": restricciones,
+        "c": c_arr,
+        "A": buffer.matriz((m, n)),
+        "b": np.asarray(b, dtype=float),
+        "sentidos": sentidos,
+        "cotas": _cotas(simbolos, inferior, superior),
+        "enteras": enteras_arr,
+        "constante": constante,
+    }
+
+# ---------------------------------------------------------------- MPS
+
+_SENTIDOS_MPS = {"L": "<=", "G": ">=", "E": "="}
+_SECCIONES_MPS = {"NAME", "OBJSENSE", "ROWS", "COLUMNS", "RHS", "RANGES", "BOUNDS", "ENDATA"}
+
+def _objetivo_mps(texto):
+    texto = texto.upper()
+    if texto in ("MAX", "MAXIMIZE"):
+        return "max"
+    if texto in ("MIN", "MINIMIZE"):
+        return "min"
+    raise ValueError(f"OBJSENSE desconocido: {texto}")
+
+def leer_mps(fuente):
+    """
+    Lee un modelo MPS en formato libre (nombres sin espacios): secciones
+    NAME, OBJSENSE, ROWS, COLUMNS (con marcadores INTORG/INTEND), RHS,
+    RANGES y BOUNDS. Cada fila con rango se parte en dos restricciones.
+    El objetivo es "min" salvo que OBJSENSE diga lo contrario.
+    """
+    nombre, objetivo, constante = "", "min", 0.0
+    fila_objetivo = None
+    filas = {}
+    restricciones, sentidos = [], []
+    simbolos, c = {}, {}
+    buffer = _BufferCOO()
+    b, rangos = {}, {}
+    inferior, superior, enteras = {}, {}, set()
+    seccion, en_enteras = None, False
+
+    with _abrir(fuente) as archivo:
+        for numero, linea in enumerate(archivo, 1):
+            if not linea.strip() or linea.startswith("*"):
+                continue
+            campos = linea.split()
+            if not linea[0].isspace():
+                seccion = campos[0].upper()
+                if seccion not in _SECCIONES_MPS:
+                    raise ValueError(f"Sección MPS desconocida en la línea {numero}: {campos[0]}")
+                if seccion == "NAME":
+                    nombre = campos[1] if len(campos) > 1 else ""
+                elif seccion == "OBJSENSE" and len(campos) > 1:
+                    objetivo = _objetivo_mps(campos[1])
+                elif seccion == "ENDATA":
+                    break
+                continue
+
+            try:
+                if seccion == "OBJSENSE":
+                    objetivo = _objetivo_mps(campos[0])
+                elif seccion == "ROWS":
+                    tipo, fila = campos[0].upper(), campos[1]
+                    if tipo == "N":
+                        # La primera fila libre es el objetivo; las demás se descartan
+                        if fila_objetivo is None:
+                            fila_objetivo = fila
+                        else:
+                            filas[fila] = -1
+                        continue
+                    filas[fila] = len(sentidos)
+                    restricciones.append(fila)
+                    sentidos.append(_SENTIDOS_MPS[tipo])
+                elif seccion == "COLUMNS":
+                    if len(campos) >= 3 and campos[1].strip("'").upper() == "MARKER":
+                        marca = campos[2].strip("'").upper()
+                        en_enteras = marca == "INTORG" or (en_enteras and marca != "INTEND")
+                        continue
+                    j = _interno(simbolos, campos[0])
+                    if en_enteras:
+                        enteras.add(j)
+                    for fila, valor in zip(campos[1::2], campos[2::2]):
+                        if fila == fila_objetivo:
+                            c[j] = c.get(j, 0.0) + float(valor)
+                        elif filas[fila] >= 0:
+                            buffer.agregar(filas[fila], j, float(valor))
+                elif seccion in ("RHS", "RANGES"):
+                    # El nombre del conjunto es opcional: con él la cantidad de campos es impar
+                    pares = campos[1:] if len(campos) % 2 else campos
+                    for fila, valor in zip(pares[::2], pares[1::2]):
+                        if fila == fila_objetivo:
+                            if seccion == "RHS":
+                                constante = -float(valor)
+                        elif filas[fila] >= 0:
+                            (b if seccion == "RHS" else rangos)[filas[fila]] = float(valor)
+                elif seccion == "BOUNDS":
+                    _cota_mps(campos, simbolos, inferior, superior, enteras)
+                else:
+                    raise IndexError
+            except KeyError as ex:
+                raise ValueError(f"Fila o tipo desconocido en la línea {numero}: {ex.args[0]}")
+            except (IndexError, ValueError):
+                raise ValueError(f"Línea MPS inválida ({numero}): {linea.strip()}")
+
+    b_arr = [b.get(i, 0.0) for i in range(len(sentidos))]
+    modelo = _modelo(nombre, objetivo, simbolos, restricciones, c, buffer, b_arr, sentidos, inferior,
+                     superior, enteras, constante)
+    if rangos:
+        _partir_rangos(modelo, rangos)
+    return modelo
+
+def _cota_mps(campos, simbolos, inferior, superior, enteras):
+    tipo = campos[0].upper()
+    resto = campos[1:]
+    if tipo in ("UP", "LO", "FX", "LI", "UI"):
+        columna, valor = (resto[1], resto[2]) if len(resto) >= 3 else (resto[0], resto[1])
+        valor = float(valor)
+    else:
+        columna = resto[0] if len(resto) == 1 else resto[1]
+        valor = None
+    j = _interno(simbolos, columna)
+    if tipo in ("UP", "UI"):
+        superior[j] = valor
+        # Convención MPS: una cota superior negativa sin inferior deja la variable sin cota inferior
+        if valor < 0 and j not in inferior:
+            inferior[j] = -np.inf
+    elif tipo in ("LO", "LI"):
+        inferior[j] = valor
+    elif tipo == "FX":
+        inferior[j] = superior[j] = valor
+    elif tipo == "FR":
+        inferior[j], superior[j] = -np.inf, np.inf
+    elif tipo == "MI":
+        inferior[j] = -np.inf
+    elif tipo == "PL":
+        superior[j] = np.inf
+    elif tipo == "BV":
+        inferior[j], superior[j] = 0.0, 1.0
+    else:
+        raise KeyError(tipo)
+    if tipo in ("LI", "UI", "BV"):
+        enteras.add(j)
+
+def _partir_rangos(modelo, rangos):
+    """Una fila con rango R queda como dos restricciones: la original y la del otro extremo"""
+    filas, sentidos, b = [], modelo["sentidos"], modelo["b"]
+    extra_b, extra_s, extra_nombres = [], [], []
+    for i, rango in sorted(rangos.items()):
+        if sentidos[i] == "<=":
+            extra = (">=", b[i] - abs(rango))
+        elif sentidos[i] == ">=":
+            extra = ("<=", b[i] + abs(rango))
+        elif rango >= 0:
+            sentidos[i], extra = ">=", ("<=", b[i] + rango)
+        else:
+            sentidos[i], extra = "<=", (">=", b[i] + rango)
+        filas.append(i)
+        extra_s.append(extra[0])
+        extra_b.append(extra[1])
+        extra_nombres.append(modelo["restricciones"][i] + "_rango")
+    modelo["A"] = sp.vstack((modelo["A"], modelo["A"][filas])).tocsr()
+    modelo["b"] = np.concatenate((b, extra_b))
+    modelo["sentidos"] = sentidos + extra_s
+    modelo["restricciones"] = modelo["restricciones"] + extra_nombres
+
+# ---------------------------------------------------------------- LP
+
+# Los nombres LP admiten varios símbolos, pero no empiezan con dígito ni punto
+_TOKEN_LP = re.compile(
+    r"\s*(?:(\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)"
+    r"|(<=|>=|=<|=>|<|>|=)"
+    r"|([+\-*:\[\]^])"
+    r"|([A-Za-z_!\"#$%&()/,;?@'{}|~][\w!\"#$%&()/,.;?@'{}|~]*))"
+)
+_RELACIONES_LP = {"<=": "<=", "=<": "<=", "<": "<=", ">=": ">=", "=>": ">=", ">": ">=", "=": "="}
+_SECCIONES_LP = {
+    "maximize": "max", "maximise": "max", "maximum": "max", "max": "max",
+    "minimize": "min", "minimise": "min", "minimum": "min", "min": "min",
+    "subject to": "restricciones", "such that": "restricciones", "st": "restricciones",
+    "s.t.": "restricciones", "st.": "restricciones",
+    "bounds": "cotas", "bound": "cotas",
+    "general": "enteras", "generals": "enteras", "gen": "enteras",
+    "integer": "enteras", "integers": "enteras",
+    "binary": "binarias", "binaries": "binarias", "bin": "binarias",
+    "end": "fin",
+}
+
+def _tokens_lp(linea, numero):
+    pos, fin = 0, len(linea.rstrip())
+    while pos < fin:
+        m = _TOKEN_LP.match(linea, pos)
+        if m is None:
+            raise ValueError(f"Carácter inesperado en la línea {numero}: {linea[pos:].strip()[:20]}")
+        pos = m.end()
+        numero_lp, relacion, operador, nombre = m.groups()
+        if numero_lp is not None:
+            yield "num", float(numero_lp)
+        elif relacion is not None:
+            yield "rel", _RELACIONES_LP[relacion]
+        elif operador is not None:
+            if operador in "[]^":
+                raise ValueError(f"Los términos cuadráticos no se admiten (línea {numero})")
+            yield "op", operador
+        elif nombre.lower() in ("inf", "infinity"):
+            yield "num", np.inf
+        else:
+            yield "id", nombre
+
+def _seccion_lp(linea):
+    """(sección, resto de la línea) si la línea abre una sección, o None"""
+    palabras = linea.split(None, 2)
+    for k in (2, 1):
+        clave = " ".join(palabras[:k]).lower()
+        if len(palabras) >= k and clave in _SECCIONES_LP:
+            resto = linea.split(None, k)[k] if len(linea.split(None, k)) > k else ""
+            return _SECCIONES_LP[clave], resto
+    return None
+
+def _sin_rotulo(tokens):
+    """Quita el "nombre:" del comienzo de una expresión"""
+    if len(tokens) >= 2 and tokens[0][0] == "id" and tokens[1] == ("op", ":"):
+        return tokens[0][1], tokens[2:]
+    return None, tokens
+
+def _internar(tokens, simbolos):
+    for tipo, valor in tokens:
+        if tipo == "id":
+            _interno(simbolos, valor)
+
+def _con_signo(tokens):
+    """Une cada "-" o "+" suelto con el número que sigue (para las cotas)"""
+    salida = []
+    for token in tokens:
+        if salida and salida[-1][0] == "op" and salida[-1][1] in "+-" and token[0] == "num" \
+                and (len(salida) == 1 or salida[-2][0] == "rel"):
+            signo = -1.0 if salida.pop()[1] == "-" else 1.0
+            token = ("num", signo * token[1])
+        salida.append(token)
+    return salida
+
+def _cota_lp(tokens, simbolos, inferior, superior, numero):
+    tokens = _con_signo(tokens)
+    tipos = [t for t, _ in tokens]
+
+    def fijar(nombre, relacion, valor):
+        j = _interno(simbolos, nombre)
+        if relacion in ("<=", "="):
+            superior[j] = valor
+        if relacion in (">=", "="):
+            inferior[j] = valor
+
+    invertir = {"<=": ">=", ">=": "<=", "=": "="}
+    if tipos == ["id", "id"] and tokens[1][1].lower() == "free":
+        j = _interno(simbolos, tokens[0][1])
+        inferior[j], superior[j] = -np.inf, np.inf
+    elif tipos == ["id", "rel", "num"]:
+        fijar(tokens[0][1], tokens[1][1], tokens[2][1])
+    elif tipos == ["num", "rel", "id"]:
+        fijar(tokens[2][1], invertir[tokens[1][1]], tokens[0][1])
+    elif tipos == ["num", "rel", "id", "rel", "num"]:
+        fijar(tokens[2][1], invertir[tokens[1][1]], tokens[0][1])
+        fijar(tokens[2][1], tokens[3][1], tokens[4][1])
+    else:
+        raise ValueError(f"Cota inválida en la línea {numero}")
+
+def leer_lp(fuente):
+    """
+    Lee un modelo en formato CPLEX LP: objetivo (Maximize/Minimize),
+    Subject To, Bounds, Generals, Binaries y End, con comentarios "\\".
+    Las restricciones pueden ocupar varias líneas: cada una termina en el
+    número que sigue a su relación. Las variables quedan en el orden en que
+    aparecen por primera vez.
+    """
+    objetivo, constante = "max", 0.0
+    simbolos, c = {}, {}
+    buffer = _BufferCOO()
+    restricciones, sentidos, b = [], [], []
+    inferior, superior, enteras = {}, {}, set()
+    seccion = None
+    tokens_objetivo, pendiente = [], []
+
+    def cerrar_restriccion(numero):
+        rotulo, tokens = _sin_rotulo(pendiente)
+        _internar(tokens, simbolos)
+        coefs, sentido, ld = lineal_de_tokens(tokens, simbolos, f"línea {numero}")
+        i = len(sentidos)
+        for j, valor in coefs.items():
+            buffer.agregar(i, j, valor)
+        restricciones.append(rotulo or f"R{i + 1}")
+        sentidos.append(sentido)
+        b.append(ld)
+        pendiente.clear()
+
+    with _abrir(fuente) as archivo:
+        for numero, linea in enumerate(archivo, 1):
+            linea = linea.split("\\", 1)[0]
+            if not linea.strip():
+                continue
+            nueva = _seccion_lp(linea)
+            if nueva is not None:
+                if pendiente:
+                    raise ValueError(f"Restricción incompleta antes de la línea {numero}")
+                seccion, linea = nueva
+                if seccion in ("max", "min"):
+                    objetivo = seccion
+                    seccion = "objetivo"
+                if seccion == "fin":
+                    break
+            tokens = list(_tokens_lp(linea, numero))
+            if not tokens:
+                continue
+            if seccion == "objetivo":
+                if not tokens_objetivo:
+                    _, tokens = _sin_rotulo(tokens)
+                _internar(tokens, simbolos)
+                tokens_objetivo.extend(tokens)
+            elif seccion == "restricciones":
+                for token in tokens:
+                    pendiente.append(token)
+                    # Termina con el número que sigue a la relación
+                    if token[0] == "num" and any(t[0] == "rel" for t in pendiente[:-1]) \
+                            and pendiente[-2][0] in ("rel", "op"):
+                        cerrar_restriccion(numero)
+            elif seccion == "cotas":
+                _cota_lp(tokens, simbolos, inferior, superior, numero)
+            elif seccion in ("enteras", "binarias"):
+                for tipo, nombre in tokens:
+                    if tipo != "id":
+                        raise ValueError(f"Se esperaba un nombre de variable en la línea {numero}")
+                    j = _interno(simbolos, nombre)
+                    enteras.add(j)
+                    if seccion == "binarias":
+                        inferior[j], superior[j] = 0.0, 1.0
+            else:
+                raise ValueError(f"Datos fuera de una sección en la línea {numero}")
+    if pendiente:
+        raise ValueError("El archivo termina con una restricción incompleta")
+
+    c, sentido, ld = lineal_de_tokens(tokens_objetivo, simbolos, "función objetivo")
+    if sentido is not None:
+        raise ValueError("La función objetivo no puede tener una relación")
+    return _modelo("", objetivo, simbolos, restricciones, c, buffer, b, sentidos, inferior, superior,
+                   enteras, -ld)
+
+# ---------------------------------------------------------------- Escritura
+
+def _preparar(c, A, b, sentidos, variables, restricciones, cotas, enteras):
+    c = np.asarray(c, dtype=float)
+    A = sp.csr_matrix(A, dtype=float)
+    m, n = A.shape
+    variables = list(variables) if variables is not None else [f"x{j + 1}" for j in range(n)]
+    restricciones = list(restricciones) if restricciones is not None else [f"R{i + 1}" for i in range(m)]
+    if cotas is None:
+        cotas = (np.zeros(n), np.full(n, np.inf))
+    enteras = np.zeros(n, dtype=bool) if enteras is None else np.asarray(enteras, dtype=bool)
+    sentidos = ["<="] * m if sentidos is None else list(sentidos)
+    return c, A, np.asarray(b, dtype=float), sentidos, variables, restricciones, cotas, enteras
+
+def _num(valor):
+    """Número exacto y corto: 4 en lugar de 4.0"""
+    texto = repr(float(valor))
+    return texto[:-2] if texto.endswith(".0") else texto
+
+def escribir_mps(destino, c, A, b, sentidos=None, objetivo="max", variables=None, cotas=None,
+                 enteras=None, nombre="MODELO", restricciones=None, constante=0.0):
+    """Escribe el modelo en MPS libre (con OBJSENSE) línea por línea"""
+    c, A, b, sentidos, variables, restricciones, cotas, enteras = _preparar(
+        c, A, b, sentidos, variables, restricciones, cotas, enteras)
+    tipos = {"<=": "L", ">=": "G", "=": "E"}
+    columnas = A.tocsc()
+    with _abrir(destino, "w") as archivo:
+        archivo.write(f"NAME {nombre or 'MODELO'}\n")
+        archivo.write(f"OBJSENSE\n    {'MAX' if objetivo == 'max' else 'MIN'}\n")
+        archivo.write("ROWS\n N  OBJ\n")
+        for fila, sentido in zip(restricciones, sentidos):
+            archivo.write(f" {tipos[sentido]}  {fila}\n")
+        archivo.write("COLUMNS\n")
+        marcadores, en_enteras = 0, False
+        for j, var in enumerate(variables):
+            if enteras[j] != en_enteras:
+                en_enteras = bool(enteras[j])
+                if en_enteras:
+                    marcadores += 1
+                archivo.write(f"    MARCA{marcadores:04d}  'MARKER'  '{'INTORG' if en_enteras else 'INTEND'}'\n")
+            inicio, fin = columnas.indptr[j], columnas.indptr[j + 1]
+            if c[j] != 0 or inicio == fin:
+                archivo.write(f"    {var}  OBJ  {_num(c[j])}\n")
+            for i, valor in zip(columnas.indices[inicio:fin], columnas.data[inicio:fin]):
+                archivo.write(f"    {var}  {restricciones[i]}  {_num(valor)}\n")
+        if en_enteras:
+            archivo.write(f"    MARCA{marcadores:04d}  'MARKER'  'INTEND'\n")
+        archivo.write("RHS\n")
+        for fila, valor in zip(restricciones, b):
+            if valor != 0:
+                archivo.write(f"    RHS  {fila}  {_num(valor)}\n")
+        if constante:
+            archivo.write(f"    RHS  OBJ  {_num(-constante)}\n")
+        archivo.write("BOUNDS\n")
+        for var, inf_j, sup_j, entera in zip(variables, cotas[0], cotas[1], enteras):
+            if entera and inf_j == 0 and sup_j == 1:
+                archivo.write(f" BV BND  {var}\n")
+            elif inf_j == sup_j:
+                archivo.write(f" FX BND  {var}  {_num(inf_j)}\n")
+            else:
+                if inf_j == -np.inf and sup_j == np.inf:
+                    archivo.write(f" FR BND  {var}\n")
+                    continue
+                if inf_j == -np.inf:
+                    archivo.write(f" MI BND  {var}\n")
+                elif inf_j != 0:
+                    archivo.write(f" LO BND  {var}  {_num(inf_j)}\n")
+                if sup_j != np.inf:
+                    archivo.write(f" UP BND  {var}  {_num(sup_j)}\n")
+        archivo.write("ENDATA\n")
+
+def _expresion_lp(archivo, indices, valores, variables, por_linea=8):
+    """Términos " + 3 x1 - x2" cortados en líneas cortas (el formato limita su largo)"""
+    for k, (j, valor) in enumerate(zip(indices, valores)):
+        if k and k % por_linea == 0:
+            archivo.write("\n  ")
+        signo = "-" if valor < 0 else ("+" if k else "")
+        coef = "" if abs(valor) == 1 else _num(abs(valor)) + " "
+        archivo.write(f" {signo} {coef}{variables[j]}" if signo else f" {coef}{variables[j]}")
+
+def escribir_lp(destino, c, A, b, sentidos=None, objetivo="max", variables=None, cotas=None,
+                enteras=None, nombre="MODELO", restricciones=None, constante=0.0):
+    """Escribe el modelo en formato CPLEX LP línea por línea"""
+    c, A, b, sentidos, variables, restricciones, cotas, enteras = _preparar(
+        c, A, b, sentidos, variables, restricciones, cotas, enteras)
+    with _abrir(destino, "w") as archivo:
+        archivo.write(f"\\ {nombre or 'MODELO'}\n")
+        archivo.write("Maximize\n" if objetivo == "max" else "Minimize\n")
+        archivo.write(" obj:")
+        no_cero = np.flatnonzero(c)
+        if len(no_cero) or not constante:
+            # Un objetivo vacío se escribe como 0 x1 para que quede una expresión
+            _expresion_lp(archivo, no_cero if len(no_cero) else [0], c[no_cero] if len(no_cero) else [0.0],
+                          variables)
+        if constante:
+            archivo.write(f" {'-' if constante < 0 else '+'} {_num(abs(constante))}")
+        archivo.write("\nSubject To\n")
+        for i, (fila, sentido) in enumerate(zip(restricciones, sentidos)):
+            inicio, fin = A.indptr[i], A.indptr[i + 1]
+            archivo.write(f" {fila}:")
+            if inicio == fin:
+                archivo.write(f" 0 {variables[0]}")
+            _expresion_lp(archivo, A.indices[inicio:fin], A.data[inicio:fin], variables)
+            archivo.write(f" {sentido} {_num(b[i])}\n")
+        archivo.write("Bounds\n")
+        for var, inf_j, sup_j in zip(variables, cotas[0], cotas[1]):
+            if inf_j == -np.inf and sup_j == np.inf:
+                archivo.write(f" {var} free\n")
+            elif inf_j == sup_j:
+                archivo.write(f" {var} = {_num(inf_j)}\n")
+            elif inf_j == -np.inf:
+                archivo.write(f" -inf <= {var} <= {_num(sup_j)}\n")
+            elif sup_j == np.inf:
+                # También x >= 0: una variable sin objetivo ni filas solo aparece aquí
+                archivo.write(f" {var} >= {_num(inf_j)}\n")
+            elif inf_j == 0:
+                archivo.write(f" {var} <= {_num(sup_j)}\n")
+            else:
+                archivo.write(f" {_num(inf_j)} <= {var} <= {_num(sup_j)}\n")
+        if np.any(enteras):
+            archivo.write("Generals\n")
+            for k, j in enumerate(np.flatnonzero(enteras)):
+                archivo.write((" " if k % 8 else ("\n " if k else " ")) + variables[j])
+            archivo.write("\n")
+        archivo.write("End\n")
+
+def _extension(ruta):
+    ruta = str(ruta).lower()
+    if ruta.endswith(".gz"):
+        ruta = ruta[:-3]
+    for extension in (".mps", ".lp"):
+        if ruta.endswith(extension):
+            return extension
+    raise ValueError(f"Formato desconocido (se espera .mps o .lp): {ruta}")
+
+def leer_archivo(ruta):
+    """Lee un .mps o .lp (opcionalmente .gz) según la extensión"""
+    return leer_mps(ruta) if _extension(ruta) == ".mps" else leer_lp(ruta)
+
+def escribir_archivo(ruta, **modelo):
+    """Escribe un .mps o .lp (opcionalmente .gz) según la extensión"""
+    if _extension(ruta) == ".mps":
+        escribir_mps(ruta, **modelo)
+    else:
+        escribir_lp(ruta, **modelo)
@@ -0,0 +1,281 @@
+"""
+Resolución en paralelo de un directorio de modelos de programación lineal.
+
+Cada archivo tiene la función objetivo en la primera línea, opcionalmente
+precedida de "max" o "min" (por defecto max), y una restricción por línea,
+con la misma sintaxis que los formularios (incluida la línea de enteras):
+
+    min z=2x1+3x2
+    x1+x2>=4
+    x1-x2<=2
+    x1, x2 enteras
+
+También se aceptan archivos MPS y CPLEX LP (.mps, .lp, opcionalmente .gz),
+que se leen con el módulo formatos; si tienen cotas distintas de x >= 0 se
+resuelven con el motor Revisado.
+
+Con --almacen RUTA los óptimos se guardan en un AlmacenSoluciones (SQLite):
+un modelo ya resuelto se devuelve sin resolverlo y, con el motor Revisado,
+un modelo de la misma estructura arranca desde la base guardada.
+
+Uso: python src/lote_modelos.py DIRECTORIO [--patron "*.mps"] [--workers N]
+     [--chunk K] [--desordenado] [--timeout S] [--motor tableau|revisado]
+     [--almacen RUTA]
+"""
+import argparse
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import repeat
+from pathlib import Path
+
+import numpy as np
+import scipy.sparse as sp
+from expresiones import detectar_variables, tabla_simbolos, fila_lineal, objetivo_lineal
+from formatos import leer_archivo
+from almacen_soluciones import AlmacenSoluciones, hash_modelo, hash_estructura
+from simplex_tableau import parse_cotas, parse_enteras, simplex_dos_fases, simplex_solver
+from ramificacion import ramificacion_acotamiento
+from simplex_revisado import simplex_revisado
+
+def leer_modelo(texto, con_cotas=False):
+    """
+    Devuelve (objetivo, variables, c, A, b, sentidos, cotas, enteras), con A
+    dispersa (CSR) armada fila por fila desde el tokenizador. Con
+    `con_cotas` (o si hay variables enteras) las cotas simples y las
+    variables libres se separan de las filas como en el motor Revisado; si
+    no, cotas es None.
+    """
+    lineas = [line.strip() for line in texto.splitlines() if line.strip()]
+    if not lineas:
+        raise ValueError("El modelo está vacío")
+    func_obj_str, restr_lines = lineas[0].lower(), lineas[1:]
+    objetivo = "max"
+    for prefijo in ("max", "min"):
+        # "min z=..." o "max: ...", pero no una variable que empiece igual ("minutos")
+        if func_obj_str.startswith(prefijo) and func_obj_str[len(prefijo):].startswith((" ", ":", "z=")):
+            objetivo = prefijo
+            func_obj_str = func_obj_str[len(prefijo):].lstrip(" :")
+    if not restr_lines:
+        raise ValueError("El modelo no tiene restricciones")
+
+    variables = detectar_variables(func_obj_str, "\n".join(restr_lines))
+    if not variables:
+        raise ValueError("No se detectaron variables en la función objetivo ni en las restricciones")
+    simbolos = tabla_simbolos(variables)
+    c = np.zeros(len(variables))
+    for j, valor in objetivo_lineal(func_obj_str, simbolos).items():
+        c[j] = valor
+    restr_lines, enteras = parse_enteras(restr_lines, simbolos)
+    cotas = None
+    if con_cotas or np.any(enteras):
+        restr_lines, cotas = parse_cotas(restr_lines, simbolos)
+    # Las filas dispersas se juntan en formato COO sin pasar por una matriz densa
+    filas, columnas, datos, b, sentidos = [], [], [], [], []
+    for i, line in enumerate(restr_lines):
+        coefs, sentido, val = fila_lineal(line, simbolos)
+        if sentido is None:
+            raise ValueError("Cada restricción debe contener '<=', '>=' o '='")
+        filas.extend([i] * len(coefs))
+        columnas.extend(coefs.keys())
+        datos.extend(coefs.values())
+        b.append(val)
+        sentidos.append(sentido)
+    A = sp.csr_matrix((datos, (filas, columnas)), shape=(len(b), len(variables)))
+    return objetivo, variables, c, A, np.array(b, dtype=float), sentidos, cotas, enteras
+
+def _valores_basicos(tab, base, num_vars):
+    """Valor de cada variable estructural leído del tableau final con la base del solver"""
+    valores = np.zeros(num_vars)
+    estructurales = (base >= 0) & (base < num_vars)
+    valores[base[estructurales]] = tab[1:, -1][estructurales]
+    return valores
+
+def resolver_modelo(texto, motor="tableau", almacen=None):
+    """
+    Resuelve un modelo en texto con los solvers de las pantallas. `almacen`
+    es un AlmacenSoluciones opcional donde se buscan y guardan los óptimos.
+    """
+    objetivo, variables, c, A, b, sentidos, cotas, enteras = leer_modelo(texto, motor == "revisado")
+    return _resolver(objetivo, variables, c, A, b, sentidos, cotas, enteras, motor, almacen)
+
+def resolver_formato(ruta, motor="tableau", almacen=None):
+    """Resuelve un archivo MPS o LP; las cotas no triviales piden el motor Revisado"""
+    modelo = leer_archivo(ruta)
+    cotas = modelo["cotas"]
+    if np.any(cotas[0] != 0) or np.any(cotas[1] != np.inf):
+        motor = "revisado"
+    elif motor != "revisado" and not np.any(modelo["enteras"]):
+        cotas = None
+    resultado = _resolver(modelo["objetivo"], modelo["variables"], modelo["c"], modelo["A"], modelo["b"],
+                          modelo["sentidos"], cotas, modelo["enteras"], motor, almacen)
+    if "z" in resultado:
+        resultado["z"] += modelo["constante"]
+    return resultado
+
+def _es_formato(ruta):
+    nombre = Path(ruta).name.lower()
+    return nombre.removesuffix(".gz").endswith((".mps", ".lp"))
+
+def _resolver(objetivo, variables, c, A, b, sentidos, cotas, enteras, motor, almacen=None):
+    base_inicial = None
+    if almacen is not None:
+        clave = hash_modelo(c, A, b, sentidos, objetivo, cotas, enteras)
+        guardada = almacen.buscar(clave)
+        if guardada is not None:
+            return {
+                "estado": "optimo",
+                "z": guardada["z"],
+                "valores": dict(zip(variables, guardada["x"][:len(variables)].tolist())),
+                "iteraciones": 0,
+                "almacen": True,
+            }
+        estructura = hash_estructura(A, sentidos, objetivo)
+        if motor == "revisado" and not np.any(enteras):
+            base_inicial = almacen.base_cercana(estructura)
+
+    resultado = _resolver_sin_almacen(objetivo, variables, c, A, b, sentidos, cotas, enteras, motor,
+                                      base_inicial)
+    solucion = resultado.pop("solucion", None)
+    if almacen is not None and resultado["estado"] == "optimo":
+        if solucion is None:
+            solucion = {"x": np.array(list(resultado["valores"].values())), "z": resultado["z"],
+                        "iteraciones": resultado["iteraciones"]}
+        almacen.guardar(clave, estructura, solucion)
+    return resultado
+
+def _resolver_sin_almacen(objetivo, variables, c, A, b, sentidos, cotas, enteras, motor, base_inicial=None):
+    estado = "optimo"
+    if np.any(enteras):
+        solucion = ramificacion_acotamiento(c, A, b, sentidos, objetivo, cotas, enteras)
+        if solucion["x"] is None:
+            return {"estado": solucion["estado"], "iteraciones": solucion["iteraciones"]}
+        # Con un límite de nodos queda la mejor incumbente
+        estado = solucion["estado"]
+        x = solucion["x"][:len(variables)]
+        iteraciones = solucion["iteraciones"]
+    elif motor == "revisado":
+        solucion = simplex_revisado(c, A, b, sentidos, objetivo, cotas, base_inicial=base_inicial)
+        if solucion["estado"] != "optimo":
+            return {"estado": solucion["estado"], "iteraciones": solucion["iteraciones"]}
+        x = solucion["x"][:len(variables)]
+        iteraciones = solucion["iteraciones"]
+    elif objetivo == "max" and all(s == "<=" for s in sentidos) and np.all(b >= 0):
+        tablas = simplex_solver(c, A, b)
+        x = _valores_basicos(tablas[-1][1], tablas.base, len(variables))
+        iteraciones = tablas.num_pivotes
+    else:
+        # Dos Fases minimiza; un max se resuelve como min de -c
+        signo = 1.0 if objetivo == "min" else -1.0
+        tablas = simplex_dos_fases(signo * c, A, b, sentidos)
+        iteraciones = tablas.num_pivotes
+        if tablas.estado != "optimo":
+            return {"estado": tablas.estado, "iteraciones": iteraciones}
+        x = tablas.mejor["x"]
+
+    resultado = {
+        "estado": estado,
+        "z": float(c @ x),
+        "valores": dict(zip(variables, x.tolist())),
+        "iteraciones": iteraciones,
+    }
+    if motor == "revisado" and not np.any(enteras):
+        # La solución completa (base y holguras) sirve para arrancar en caliente desde el almacén
+        resultado["solucion"] = solucion
+    return resultado
+
+def _al_vencer(signum, frame):
+    raise TimeoutError
+
+def resolver_archivo(ruta, motor="tableau", timeout=None, almacen=None):
+    """
+    Resuelve un archivo y devuelve siempre un dict (los errores quedan en
+    "estado"). `almacen` es la ruta de un AlmacenSoluciones: cada proceso
+    lo abre por su cuenta, SQLite coordina las escrituras.
+    """
+    inicio = time.perf_counter()
+    # En POSIX el límite se impone dentro del worker con una alarma; en otros
+    # sistemas solo se marca después, porque un proceso del pool no se puede cortar
+    alarma = timeout is not None and hasattr(signal, "setitimer")
+    if alarma:
+        anterior = signal.signal(signal.SIGALRM, _al_vencer)
+    try:
+        if alarma:
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        soluciones = None if almacen is None else AlmacenSoluciones(almacen)
+        if _es_formato(ruta):
+            resultado = resolver_formato(ruta, motor, soluciones)
+        else:
+            resultado = resolver_modelo(Path(ruta).read_text(encoding="utf-8"), motor, soluciones)
+    except TimeoutError:
+        resultado = {"estado": "limite_tiempo"}
+    except ValueError as ex:
+        mensaje = str(ex)
+        if "factible" in mensaje:
+            resultado = {"estado": "no_factible"}
+        elif "acotado" in mensaje:
+            resultado = {"estado": "no_acotado"}
+        elif "límite de iteraciones" in mensaje:
+            resultado = {"estado": "limite_iteraciones"}
+        else:
+            resultado = {"estado": "error", "mensaje": mensaje}
+    except Exception as ex:
+        resultado = {"estado": "error", "mensaje": f"{type(ex).__name__}: {ex}"}
+    finally:
+        if alarma:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, anterior)
+    resultado["tiempo"] = time.perf_counter() - inicio
+    if timeout is not None and resultado["tiempo"] > timeout and resultado["estado"] != "limite_tiempo":
+        resultado = {"estado": "limite_tiempo", "tiempo": resultado["tiempo"]}
+    resultado["archivo"] = str(ruta)
+    return resultado
+
+def _resolver_bloque(rutas, motor, timeout, almacen):
+    return [resolver_archivo(ruta, motor, timeout, almacen) for ruta in rutas]
+
+def resolver_directorio(directorio, patron="*.txt", workers=None, chunk=1, ordenado=True,
+                        timeout=None, motor="tableau", almacen=None):
+    """
+    Resuelve en paralelo todos los modelos del directorio que coinciden con
+    `patron` y va entregando los resultados (es un generador).
+
+    `workers` es la cantidad de procesos (por defecto uno por núcleo) y
+    `chunk` cuántos archivos recibe cada tarea. Con `ordenado` los resultados
+    salen en el orden de los archivos; si no, a medida que se terminan.
+    `timeout` es el límite en segundos por modelo y `almacen` la ruta
+    opcional del almacén de soluciones en disco.
+    """
+    rutas = sorted(Path(directorio).glob(patron))
+    with ProcessPoolExecutor(max_workers=workers) as ejecutor:
+        if ordenado:
+            yield from ejecutor.map(resolver_archivo, rutas, repeat(motor), repeat(timeout),
+                                    repeat(almacen), chunksize=chunk)
+            return
+        bloques = [rutas[i:i + chunk] for i in range(0, len(rutas), chunk)]
+        futuros = [ejecutor.submit(_resolver_bloque, bloque, motor, timeout, almacen) for bloque in bloques]
+        for futuro in as_completed(futuros):
+            yield from futuro.result()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resuelve en paralelo un directorio de modelos")
+    parser.add_argument("directorio")
+    parser.add_argument("--patron", default="*.txt")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk", type=int, default=1)
+    parser.add_argument("--desordenado", action="store_true")
+    parser.add_argument("--timeout", type=float, default=None)
+    parser.add_argument("--motor", choices=["tableau", "revisado"], default="tableau")
+    parser.add_argument("--almacen", default=None)
+    args = parser.parse_args()
+
+    for resultado in resolver_directorio(args.directorio, args.patron, args.workers, args.chunk,
+                                         not args.desordenado, args.timeout, args.motor, args.almacen):
+        linea = f"{resultado['archivo']}: {resultado['estado']} ({resultado['tiempo']:.3f} s)"
+        if resultado["estado"] == "optimo":
+            linea += f" Z = {resultado['z']:.6g}, {resultado['iteraciones']} iteraciones"
+            if resultado.get("almacen"):
+                linea += " (almacén)"
+        elif "mensaje" in resultado:
+            linea += f" {resultado['mensaje']}"
+        print(linea)
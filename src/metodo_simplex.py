@@ -1,100 +1,131 @@
 import flet as ft
 import numpy as np
-import re
-
-def clean_expression(expr):
-    return expr.replace(" ", "").lower()
-
-def detect_variables(func_obj_str, restricciones_str):
-    text = func_obj_str + "\n" + restricciones_str
-    vars_found = set(re.findall(r"x\d+", text.lower()))
-    vars_sorted = sorted(vars_found, key=lambda x: int(x[1:]))
-    return vars_sorted
-
-def parse_function_objective(line, variables):
-    line = line.lower()
-    if line.startswith("z="):
-        line = line[2:]
-    line = clean_expression(line)
-
-    coefs = [0] * len(variables)
-    for i, var in enumerate(variables):
-        pattern = re.compile(r"([+-]?[\d\.]*)" + re.escape(var))
-        matches = pattern.findall(line)
-        total = 0.0
-        for m in matches:
-            if m in ("", "+"):
-                total += 1
-            elif m == "-":
-                total -= 1
-            else:
-                total += float(m)
-        coefs[i] = total
-    return coefs
+import scipy.sparse as sp
+from simplex_revisado import simplex_revisado, resultados_revisado, comparar_reglas
+from punto_interior import punto_interior
+from reglas_precio import REGLAS
+from traza import TrazaSimplex
+from presolve import presolve, postsolve
+from escalado import escalar_modelo, rango, resumen_escala
+from sensibilidad import sensibilidad, sensibilidad_de_punto, lineas_sensibilidad
+from ramificacion import ramificacion_acotamiento
+from cortes_gomory import cortes_gomory
+from expresiones import tabla_simbolos, fila_lineal, densa
+from simplex_tableau import (clean_expression, detect_variables, parse_function_objective, parse_enteras,
+                             simplex_solver)
+from formatos import escribir_archivo
+from cache_modelos import CacheModelos
+from almacen_soluciones import AlmacenSoluciones, hash_modelo, hash_estructura
 
 def parse_restriction(line, variables):
-    line = line.lower().replace(" ", "")
-    if "<=" in line:
-        left, right = line.split("<=")
-    elif ">=" in line:
-        left, right = line.split(">=")
-        left = "-(" + left + ")"
-        right = "-" + right
-    else:
+    simbolos = tabla_simbolos(variables)
+    coefs, sentido, ld = fila_lineal(line, simbolos)
+    if sentido not in ("<=", ">="):
         raise ValueError("Cada restricción debe contener '<=' o '>='")
-    coefs = [0] * len(variables)
-    for i, var in enumerate(variables):
-        pattern = re.compile(r"([+-]?[\d\.]*)" + re.escape(var))
-        matches = pattern.findall(left)
-        total = 0.0
-        for m in matches:
-            if m in ("", "+"):
-                total += 1
-            elif m == "-":
-                total -= 1
-            else:
-                total += float(m)
-        coefs[i] = total
-    return coefs, float(right)
-
-def simplex_solver(c, A, b):
-    num_vars = len(c)
-    num_constraints = len(b)
-
-    slack = np.eye(num_constraints)
-    tableau = np.hstack((A, slack, np.array(b).reshape(-1, 1)))
-    c_row = np.hstack((-np.array(c), np.zeros(num_constraints + 1)))
-
-    tableau = np.vstack((c_row, tableau))
-
-    tablas = []
-    iteracion = 0
-
-    while True:
-        iteracion += 1
-        tablas.append((iteracion, tableau.copy()))
-
-        col_pivote = np.argmin(tableau[0, :-1])
-        if tableau[0, col_pivote] >= 0:
-            break
-
-        razones = []
-        for i in range(1, tableau.shape[0]):
-            if tableau[i, col_pivote] > 0:
-                razones.append(tableau[i, -1] / tableau[i, col_pivote])
-            else:
-                razones.append(np.inf)
-        fila_pivote = np.argmin(razones) + 1
-
-        tableau[fila_pivote] /= tableau[fila_pivote, col_pivote]
-        for i in range(tableau.shape[0]):
-            if i != fila_pivote:
-                tableau[i] -= tableau[i, col_pivote] * tableau[fila_pivote]
-
-    return tablas
+    # a·x >= b se guarda como -a·x <= -b
+    signo = -1.0 if sentido == ">=" else 1.0
+    return densa({j: signo * v for j, v in coefs.items()}, len(simbolos)), signo * ld
+
+def parse_cotas(restr_lines, variables):
+    """Separa las cotas simples (una sola variable) y las variables libres de las filas"""
+    simbolos = tabla_simbolos(variables)
+    inferior = np.zeros(len(simbolos))
+    superior = np.full(len(simbolos), np.inf)
+
+    # Primero las libres, para que una cota escrita después las pueda acotar
+    libres = [line for line in restr_lines if clean_expression(line).endswith("libre")]
+    for line in libres:
+        var = clean_expression(line)[:-len("libre")]
+        if var not in simbolos:
+            raise ValueError(f"Variable libre desconocida: {line}")
+        inferior[simbolos[var]] = -np.inf
+
+    filas = []
+    for line in restr_lines:
+        if line in libres:
+            continue
+        coefs, sentido, val = fila_lineal(line, simbolos)
+        no_cero = [j for j, v in coefs.items() if v != 0]
+        if len(no_cero) != 1 or sentido not in ("<=", ">="):
+            filas.append(line)
+            continue
+        j = no_cero[0]
+        if sentido == ">=":
+            coefs[j], val = -coefs[j], -val
+        if coefs[j] > 0:
+            superior[j] = min(superior[j], val / coefs[j])
+        else:
+            inferior[j] = max(inferior[j], val / coefs[j])
+    return filas, (inferior, superior)
+
+# Modelos ya leídos de los campos, por texto normalizado y motor
+CACHE_MODELOS = CacheModelos(max_bytes=16 * 2**20)
+
+def leer_campos(func_obj_str, restr_str, motor):
+    """
+    Lee el formulario: variables, c, A y b (arreglos, A densa de m × n con
+    >= ya pasado a <=), las líneas de restricción que quedan como filas,
+    cotas y enteras. Las cotas simples se separan salvo con Tableau sin
+    enteras o con Gomory.
+    """
+    variables = detect_variables(func_obj_str, restr_str)
+    if not variables:
+        raise ValueError("No se detectaron variables en la función objetivo ni en las restricciones")
+
+    # Tabla de símbolos única: cada línea se lee en una pasada sin buscar en la lista
+    simbolos = tabla_simbolos(variables)
+    c = parse_function_objective(func_obj_str, simbolos)
+
+    restr_lines = [line for line in restr_str.split("\n") if line.strip()]
+    restr_lines, enteras = parse_enteras(restr_lines, simbolos)
+    gomory = motor == "Cortes de Gomory"
+    cotas = None
+    if motor not in ("Tableau", "Cortes de Gomory") or (np.any(enteras) and not gomory):
+        restr_lines, cotas = parse_cotas(restr_lines, simbolos)
+    A = []
+    b = []
+    for line in restr_lines:
+        coefs, val = parse_restriction(line, simbolos)
+        A.append(coefs)
+        b.append(val)
+    return {"variables": variables, "c": np.array(c, dtype=float),
+            "A": np.array(A, dtype=float).reshape(len(b), len(variables)), "b": np.array(b, dtype=float),
+            "restr_lines": restr_lines, "cotas": cotas, "enteras": enteras}
+
+def modelo_de_campos(func_obj_str, restr_str):
+    """Modelo de los campos del formulario listo para escribir_archivo (max, con cotas y enteras)"""
+    variables = detect_variables(func_obj_str, restr_str)
+    if not variables:
+        raise ValueError("No se detectaron variables en la función objetivo ni en las restricciones")
+    simbolos = tabla_simbolos(variables)
+    restr_lines = [line for line in restr_str.splitlines() if line.strip()]
+    restr_lines, enteras = parse_enteras(restr_lines, simbolos)
+    restr_lines, cotas = parse_cotas(restr_lines, simbolos)
+    filas, columnas, datos, b, sentidos = [], [], [], [], []
+    for i, line in enumerate(restr_lines):
+        coefs, sentido, val = fila_lineal(line, simbolos)
+        if sentido not in ("<=", ">="):
+            raise ValueError("Cada restricción debe contener '<=' o '>='")
+        filas.extend([i] * len(coefs))
+        columnas.extend(coefs.keys())
+        datos.extend(coefs.values())
+        b.append(val)
+        sentidos.append(sentido)
+    return {
+        "c": parse_function_objective(func_obj_str, simbolos),
+        "A": sp.csr_matrix((datos, (filas, columnas)), shape=(len(b), len(variables))),
+        "b": b,
+        "sentidos": sentidos,
+        "objetivo": "max",
+        "variables": variables,
+        "cotas": cotas,
+        "enteras": enteras,
+    }
 
-def format_tableau(tab, variables, num_constraints):
-    slack_vars = [f"x{i+len(variables)+1}" for i in range(num_constraints)]
+def format_tableau(tab, variables, num_constraints, primera_holgura=None, base=None):
+    if primera_holgura is None:
+        primera_holgura = len(variables) + 1
+    slack_vars = [f"x{i+primera_holgura}" for i in range(num_constraints)]
     all_vars = variables + slack_vars
     headers = ["Ecuación", "Variable Básica", "Z"] + all_vars + ["LD"]
 
@@ -105,24 +136,35 @@ def format_tableau(tab, variables, num_constraints):
 
     # Filas de restricciones (ecuaciones 1..n)
     for i in range(1, tab.shape[0]):
-        var_name = slack_vars[i-1] if i-1 < len(slack_vars) else f"x?"
+        if base is not None:
+            var_name = all_vars[base[i-1]] if base[i-1] >= 0 else "-"
+        else:
+            var_name = slack_vars[i-1] if i-1 < len(slack_vars) else f"x?"
         row_vals = [f"{v:.3f}" for v in tab[i, :-1]]
         row = [str(i), var_name, "0"] + row_vals + [f"{tab[i, -1]:.3f}"]
         rows.append(row)
 
     return headers, rows
 
-def obtener_resultados(tab, variables, num_constraints):
-    slack_vars = [f"x{i+len(variables)+1}" for i in range(num_constraints)]
+def obtener_resultados(tab, variables, num_constraints, primera_holgura=None, base=None):
+    if primera_holgura is None:
+        primera_holgura = len(variables) + 1
+    slack_vars = [f"x{i+primera_holgura}" for i in range(num_constraints)]
     all_vars = variables + slack_vars
     resultados = {v: 0.0 for v in all_vars}
 
-    # Detectar variables básicas (columna con un solo 1 y demás 0)
-    for j, var in enumerate(all_vars):
-        columna = tab[1:, j]  # sin fila z
-        if np.count_nonzero(columna) == 1 and np.isclose(columna.max(), 1.0):
-            fila = np.argmax(columna) + 1
-            resultados[var] = tab[fila, -1]
+    if base is not None:
+        # Con la base del solver cada fila da su variable básica: O(m)
+        for fila, j in enumerate(base, start=1):
+            if 0 <= j < len(all_vars):
+                resultados[all_vars[j]] = tab[fila, -1]
+    else:
+        # Sin base, detectar variables básicas (columna con un solo 1 y demás 0)
+        for j, var in enumerate(all_vars):
+            columna = tab[1:, j]  # sin fila z
+            if np.count_nonzero(columna) == 1 and np.isclose(columna.max(), 1.0):
+                fila = np.argmax(columna) + 1
+                resultados[var] = tab[fila, -1]
 
     # Valor de Z
     z_val = tab[0, -1]
@@ -192,14 +234,76 @@ def main_simplex(page: ft.Page):
         multiline=True
     )
 
+    motor_combo = ft.Dropdown(
+        label="Motor de solución",
+        options=[
+            ft.dropdown.Option("Tableau"),
+            ft.dropdown.Option("Revisado"),
+            ft.dropdown.Option("Punto interior"),
+            ft.dropdown.Option("Cortes de Gomory")
+        ],
+        value="Tableau",
+        **{k: v for k, v in field_style.items() if k != "height"}
+    )
+
+    regla_combo = ft.Dropdown(
+        label="Regla de precio",
+        options=[ft.dropdown.Option(key=nombre, text=nombre.replace("_", " ").capitalize())
+                 for nombre in REGLAS] + [ft.dropdown.Option(key="comparar", text="Comparar todas")],
+        value="dantzig",
+        **{k: v for k, v in field_style.items() if k != "height"}
+    )
+
     # Área de resultados
     salida = ft.Column(
         scroll=ft.ScrollMode.AUTO,
         height=400
     )
 
+    presolve_check = ft.Checkbox(
+        label="Presolve (reducir el modelo antes de pivotear)",
+        value=True,
+        label_style=ft.TextStyle(color="#FFFFFF")
+    )
+
+    escalado_check = ft.Checkbox(
+        label="Escalar filas y columnas (media geométrica y equilibrio)",
+        value=True,
+        label_style=ft.TextStyle(color="#FFFFFF")
+    )
+
+    # Resolver de nuevo sin escalar solo para informar las iteraciones ahorradas
+    comparar_escala_check = ft.Checkbox(
+        label="Comparar con el modelo sin escalar (resuelve dos veces)",
+        value=False,
+        label_style=ft.TextStyle(color="#FFFFFF")
+    )
+
+    almacen_check = ft.Checkbox(
+        label="Guardar soluciones en disco (motor Revisado: reusar óptimos y bases entre sesiones)",
+        value=False,
+        label_style=ft.TextStyle(color="#FFFFFF")
+    )
+
+    sensibilidad_check = ft.Checkbox(
+        label="Análisis de sensibilidad (precios sombra y rangos de c y b)",
+        value=True,
+        label_style=ft.TextStyle(color="#FFFFFF")
+    )
+
     error_text = ft.Text(color="red", visible=False)
 
+    # Última base óptima por estructura del modelo, para re-resolver en caliente
+    bases_previas = {}
+    # El almacén en disco se abre la primera vez que se usa
+    almacen = None
+
+    def abrir_almacen():
+        nonlocal almacen
+        if almacen is None:
+            almacen = AlmacenSoluciones()
+        return almacen
+
     def resolver(e):
         salida.controls.clear()
         error_text.visible = False
@@ -211,19 +315,16 @@ def main_simplex(page: ft.Page):
             if not func_obj_str or not restr_str:
                 raise ValueError("Por favor complete todos los campos")
 
-            variables = detect_variables(func_obj_str, restr_str)
-            if not variables:
-                raise ValueError("No se detectaron variables, asegúrate de usar formato x1, x2, ...")
-
-            c = parse_function_objective(func_obj_str, variables)
-
-            restr_lines = [line for line in restr_str.split("\n") if line.strip()]
-            A = []
-            b = []
-            for line in restr_lines:
-                coefs, val = parse_restriction(line, variables)
-                A.append(coefs)
-                b.append(val)
+            # Con cortes de Gomory todas las variables son enteras y las cotas van como filas
+            gomory = motor_combo.value == "Cortes de Gomory"
+            # Un texto ya resuelto no se vuelve a parsear: sale de la caché
+            leido = CACHE_MODELOS.obtener(func_obj_str, restr_str,
+                                          lambda: leer_campos(func_obj_str, restr_str, motor_combo.value),
+                                          motor_combo.value)
+            # Los arreglos de la caché son de solo lectura; los solvers que pivotean reciben copias
+            variables, c, A, b = list(leido["variables"]), leido["c"], leido["A"], leido["b"]
+            restr_lines, cotas, enteras = leido["restr_lines"], leido["cotas"], leido["enteras"]
+            entero = bool(np.any(enteras)) and not gomory
 
             # Mostrar información del problema
             salida.controls.append(ft.Text(
@@ -231,6 +332,11 @@ def main_simplex(page: ft.Page):
                 weight=ft.FontWeight.BOLD,
                 color="#FFFFFF"
             ))
+            salida.controls.append(ft.Text(
+                f"Caché de modelos: {CACHE_MODELOS.aciertos} aciertos, {CACHE_MODELOS.fallos} fallos",
+                color="#FFFFFF",
+                size=12
+            ))
             salida.controls.append(ft.Text(
                 f"Función objetivo: {func_obj_str}",
                 color="#FFFFFF"
@@ -238,18 +344,197 @@ def main_simplex(page: ft.Page):
             salida.controls.append(ft.Text("Restricciones:", color="#FFFFFF"))
             for i, line in enumerate(restr_lines, 1):
                 salida.controls.append(ft.Text(f"  {i}. {line}", color="#FFFFFF"))
+            if cotas is not None:
+                for var, inf_j, sup_j in zip(variables, *cotas):
+                    if inf_j != 0 or sup_j != np.inf:
+                        salida.controls.append(ft.Text(f"  {inf_j:g} <= {var} <= {sup_j:g}", color="#FFFFFF"))
+            if entero:
+                salida.controls.append(ft.Text(
+                    "  Enteras: " + ", ".join(var for var, e in zip(variables, enteras) if e), color="#FFFFFF"
+                ))
+            if gomory:
+                salida.controls.append(ft.Text("  Enteras: todas (cortes de Gomory)", color="#FFFFFF"))
 
-            tablas = simplex_solver(c, np.array(A), np.array(b))
             num_constraints = len(b)
 
+            regla = regla_combo.value
+            if regla == "comparar":
+                if motor_combo.value != "Tableau":
+                    A_disp = sp.csr_matrix(np.reshape(A, (len(b), len(variables))))
+                    comparacion = comparar_reglas(c, A_disp, np.array(b), cotas=cotas)
+                    iteraciones = {nombre: r["iteraciones"] for nombre, r in comparacion.items()}
+                else:
+                    iteraciones = {nombre: simplex_solver(c, np.array(A), np.array(b), nombre).num_pivotes
+                                   for nombre in REGLAS}
+                salida.controls.append(ft.Text("\nIteraciones por regla de precio:", color="#FFFFFF"))
+                for nombre, num in iteraciones.items():
+                    salida.controls.append(ft.Text(f"  {nombre}: {num}", color="#FFFFFF"))
+                regla = min(iteraciones, key=iteraciones.get)
+
+            tablas = TrazaSimplex()
+            if entero:
+                A_disp = sp.csr_matrix(np.reshape(A, (len(b), len(variables))))
+                solucion = ramificacion_acotamiento(c, A_disp, np.array(b), cotas=cotas,
+                                                    enteras=enteras, regla=regla)
+                if solucion["estado"] == "no_acotado":
+                    raise ValueError("El problema no está acotado")
+                if solucion["estado"] == "limite_iteraciones":
+                    raise ValueError("Se alcanzó el límite de iteraciones sin llegar al óptimo")
+                if solucion["estado"] == "no_factible":
+                    raise ValueError("El problema no tiene solución entera factible")
+                if solucion["x"] is None:
+                    raise ValueError("Se alcanzó el límite de la ramificación sin encontrar una solución entera")
+                salida.controls.append(ft.Text(
+                    f"Ramificación y acotamiento: {solucion['nodos']} nodos, {solucion['iteraciones']} "
+                    f"iteraciones del simplex; relajación Z = {solucion['relajacion']:.3f}, "
+                    f"cota {solucion['cota']:.3f}, brecha {solucion['gap']:.2%}",
+                    color="#FFFFFF"
+                ))
+            elif gomory:
+                tablas = cortes_gomory(c, np.array(A), np.array(b), objetivo="max", regla=regla,
+                                       variables=variables)
+                if tablas.estado == "no_acotado":
+                    raise ValueError("El problema no está acotado")
+                if tablas.estado == "no_factible":
+                    raise ValueError("El problema no tiene solución entera factible")
+                if tablas.mejor is None:
+                    raise ValueError(f"Los cortes de Gomory terminaron sin solución entera ({tablas.estado}); "
+                                     "probar con ramificación y acotamiento")
+                salida.controls.append(ft.Text(
+                    f"Cortes de Gomory: {tablas.cortes['rondas']} rondas, {tablas.cortes['generados']} "
+                    f"cortes generados, {tablas.cortes['purgados']} purgados por inactivos, "
+                    f"{tablas.cortes['activos']} activos al final (las tablas minimizan -Z)",
+                    color="#FFFFFF"
+                ))
+            elif motor_combo.value == "Revisado":
+                A_disp = sp.csr_matrix(np.reshape(A, (len(b), len(variables))))
+                clave = (tuple(variables), num_constraints)
+                base_inicial = bases_previas.get(clave)
+                solucion = None
+                if almacen_check.value:
+                    # Un modelo ya resuelto en otra sesión sale del disco sin pivotear
+                    clave_disco = hash_modelo(c, A_disp, b, cotas=cotas)
+                    estructura = hash_estructura(A_disp)
+                    solucion = abrir_almacen().buscar(clave_disco)
+                    if base_inicial is None:
+                        base_inicial = abrir_almacen().base_cercana(estructura)
+                if solucion is not None:
+                    solucion["escala"] = None
+                    salida.controls.append(ft.Text(
+                        f"\nSolución leída del almacén en disco (resuelta antes en {solucion['iteraciones']} "
+                        f"iteraciones; {abrir_almacen().aciertos} aciertos en esta sesión)",
+                        weight=ft.FontWeight.BOLD,
+                        color="#90EE90"
+                    ))
+                else:
+                    solucion = simplex_revisado(c, A_disp, np.array(b), cotas=cotas,
+                                                base_inicial=base_inicial, regla=regla,
+                                                escalar=escalado_check.value)
+                    if solucion["estado"] == "no_acotado":
+                        raise ValueError("El problema no está acotado")
+                    if solucion["estado"] == "limite_iteraciones":
+                        raise ValueError("Se alcanzó el límite de iteraciones sin llegar al óptimo")
+                    if solucion["estado"] == "no_factible":
+                        raise ValueError("El problema no tiene solución factible")
+                    salida.controls.append(ft.Text(
+                        f"\nSimplex revisado ({solucion['metodo']}, arranque {solucion['arranque']}, "
+                        f"regla {solucion['regla']}): {solucion['iteraciones']} iteraciones",
+                        weight=ft.FontWeight.BOLD,
+                        color="#90EE90"
+                    ))
+                    if solucion["escala"] is not None:
+                        sin_escala = None
+                        if comparar_escala_check.value:
+                            sin_escala = simplex_revisado(c, A_disp, np.array(b), cotas=cotas,
+                                                          base_inicial=base_inicial, regla=regla,
+                                                          escalar=False)["iteraciones"]
+                        salida.controls.append(ft.Text(
+                            resumen_escala(solucion["escala"]["rango_original"],
+                                           solucion["escala"]["rango_escalado"],
+                                           solucion["iteraciones"], sin_escala,
+                                           comparado=comparar_escala_check.value),
+                            color="#FFFFFF"
+                        ))
+                    if almacen_check.value:
+                        abrir_almacen().guardar(clave_disco, estructura, solucion)
+                bases_previas[clave] = solucion
+            elif motor_combo.value == "Punto interior":
+                A_disp = sp.csr_matrix(np.reshape(A, (len(b), len(variables))))
+                solucion = punto_interior(c, A_disp, np.array(b), cotas=cotas, regla=regla)
+                if solucion["estado"] == "no_acotado":
+                    raise ValueError("El problema no está acotado")
+                if solucion["estado"] == "limite_iteraciones":
+                    raise ValueError("Se alcanzó el límite de iteraciones sin llegar al óptimo")
+                if solucion["estado"] == "no_factible":
+                    raise ValueError("El problema no tiene solución factible")
+                salida.controls.append(ft.Text(
+                    f"\nPunto interior (Mehrotra): {solucion['iteraciones_ipm']} iteraciones; "
+                    f"crossover a una base con {solucion['pivotes_crossover']} pivotes del simplex",
+                    weight=ft.FontWeight.BOLD,
+                    color="#90EE90"
+                ))
+            else:
+                modelo = None
+                variables_tab, num_constraints_tab = variables, num_constraints
+                c_tab, A_tab, b_tab = c, np.array(A), np.array(b)
+                if presolve_check.value:
+                    modelo = presolve(c, A, b)
+                    # El tableau de maximización solo admite filas <= con LD >= 0
+                    A_red, b_red = modelo["A"].copy(), modelo["b"].copy()
+                    mayores = np.array([s == ">=" for s in modelo["sentidos"]], dtype=bool)
+                    A_red[mayores] *= -1
+                    b_red[mayores] *= -1
+                    if "=" in modelo["sentidos"] or np.any(b_red < 0):
+                        modelo = None
+                        salida.controls.append(ft.Text(
+                            "Presolve omitido: el modelo reducido no queda en forma <= con LD >= 0",
+                            color="#FFFFFF"
+                        ))
+                    else:
+                        variables_tab = [variables[j] for j in modelo["columnas"]]
+                        num_constraints_tab = len(b_red)
+                        c_tab, A_tab, b_tab = modelo["c"], A_red, b_red
+                        reducciones = ", ".join(f"{k}: {v}" for k, v in modelo["estadisticas"].items() if v)
+                        salida.controls.append(ft.Text(
+                            f"Presolve: {num_constraints} → {num_constraints_tab} restricciones, "
+                            f"{len(variables)} → {len(variables_tab)} variables"
+                            + (f" ({reducciones})" if reducciones else ""),
+                            color="#FFFFFF"
+                        ))
+                if escalado_check.value:
+                    c_e, A_e, b_e, _, r_esc, s_esc = escalar_modelo(c_tab, A_tab, b_tab)
+                    tablas = simplex_solver(c_e, A_e, b_e, regla)
+                    sin_escala = None
+                    if comparar_escala_check.value:
+                        try:
+                            sin_escala = simplex_solver(c_tab, A_tab, b_tab, regla).num_pivotes
+                        except ValueError:
+                            pass
+                    salida.controls.append(ft.Text(
+                        resumen_escala(rango(A_tab), rango(A_e), tablas.num_pivotes, sin_escala,
+                                       comparado=comparar_escala_check.value)
+                        + " (las tablas muestran el modelo escalado)",
+                        color="#FFFFFF"
+                    ))
+                else:
+                    tablas = simplex_solver(c_tab, A_tab, b_tab, regla)
+
             # Mostrar tablas de iteraciones
-            for it, tab in tablas:
+            for entrada, base in zip(tablas, tablas.bases()):
+                if len(entrada) == 3:
+                    # Segmento con título y nombres propios (fases y rondas de cortes)
+                    titulo, tab, nombres = entrada
+                    headers, rows = format_tableau(tab, nombres[:-1], 0, base=base)
+                else:
+                    it, tab = entrada
+                    titulo = f"Iteración {it}"
+                    headers, rows = format_tableau(tab, variables_tab, num_constraints_tab, len(variables) + 1,
+                                                   base)
                 salida.controls.append(ft.Text(
-                    f"\nIteración {it}:",
+                    f"\n{titulo}:",
                     weight=ft.FontWeight.BOLD,
                     color="#90EE90"
                 ))
-                headers, rows = format_tableau(tab, variables, num_constraints)
                 
                 # Crear tabla con estilo
                 data_columns = []
@@ -292,7 +577,24 @@ def main_simplex(page: ft.Page):
                 salida.controls.append(grid)
 
             # Mostrar resultados finales
-            resultados, z_val = obtener_resultados(tablas[-1][1], variables, num_constraints)
+            if gomory:
+                resultados = {var: val for var, val in zip(variables, tablas.mejor["x"]) if val > 0}
+                z_val = tablas.mejor["z"]
+            elif motor_combo.value != "Tableau" or entero:
+                resultados, z_val = resultados_revisado(solucion, variables, num_constraints)
+            else:
+                resultados, z_val = obtener_resultados(tablas[-1][1], variables_tab, num_constraints_tab,
+                                                       len(variables) + 1, tablas.base)
+                if escalado_check.value:
+                    # Estructurales por s; la holgura de la fila i escalada por r_i
+                    factores = dict(zip(variables_tab, s_esc))
+                    factores.update({f"x{i + len(variables) + 1}": 1.0 / r_i for i, r_i in enumerate(r_esc)})
+                    resultados = {var: val * factores[var] for var, val in resultados.items()}
+                if modelo is not None:
+                    # Las holguras del reducido no corresponden a las filas originales
+                    x = postsolve(modelo, [resultados.get(var, 0.0) for var in variables_tab])
+                    resultados = {var: val for var, val in zip(variables, x) if val > 0}
+                    z_val += modelo["constante"]
             salida.controls.append(ft.Text(
                 "\nResultados finales:",
                 weight=ft.FontWeight.BOLD,
@@ -311,12 +613,92 @@ def main_simplex(page: ft.Page):
                 size=18
             ))
 
+            # Sensibilidad a partir de la base final, sin pivotes adicionales
+            if sensibilidad_check.value and (entero or gomory):
+                salida.controls.append(ft.Text(
+                    "\nSin análisis de sensibilidad: con variables enteras los precios sombra y "
+                    "los rangos del modelo lineal no valen para el óptimo entero",
+                    color="#FFFFFF"
+                ))
+            elif sensibilidad_check.value:
+                salida.controls.append(ft.Text(
+                    "\nAnálisis de sensibilidad:",
+                    weight=ft.FontWeight.BOLD,
+                    color="#90EE90",
+                    size=16
+                ))
+                if motor_combo.value != "Tableau":
+                    reporte = sensibilidad(c, np.array(A), np.array(b), solucion["base"], cotas=cotas,
+                                           x=solucion["x"])
+                elif modelo is None:
+                    # La base del modelo escalado es la misma que la del original
+                    reporte = sensibilidad(c, np.array(A), np.array(b), tablas.base)
+                else:
+                    # La base del reducido no sirve para las filas originales: se reconstruye desde x
+                    salida.controls.append(ft.Text(
+                        "Calculado sobre el modelo original (presolve redujo las filas; la base se "
+                        "reconstruye a partir de la solución)",
+                        color="#FFFFFF"
+                    ))
+                    try:
+                        reporte = sensibilidad_de_punto(c, np.array(A), np.array(b),
+                                                        [resultados.get(var, 0.0) for var in variables],
+                                                        cotas=cotas)
+                    except ValueError as ex:
+                        reporte = None
+                        salida.controls.append(ft.Text(
+                            f"No se pudo calcular la sensibilidad del modelo original: {ex}",
+                            color="#FFFFFF"
+                        ))
+                if reporte is not None:
+                    for linea in lineas_sensibilidad(reporte, variables, c, b):
+                        salida.controls.append(ft.Text(linea, color="#FFFFFF"))
+
         except Exception as ex:
             error_text.value = f"Error: {ex}"
             error_text.visible = True
 
         page.update()
 
+    def guardar_modelo(e):
+        # e.path es None si se cerró el diálogo sin elegir archivo
+        if not e.path:
+            return
+        error_text.visible = False
+        try:
+            func_obj_str = func_obj_field.value.strip()
+            restr_str = restricciones_field.value.strip()
+            if not func_obj_str or not restr_str:
+                raise ValueError("Por favor complete todos los campos")
+            ruta = e.path
+            if not ruta.lower().endswith((".lp", ".mps", ".lp.gz", ".mps.gz")):
+                ruta += ".lp"
+            escribir_archivo(ruta, **modelo_de_campos(func_obj_str, restr_str))
+            salida.controls.append(ft.Text(f"Modelo exportado a {ruta}", color="#90EE90"))
+        except Exception as ex:
+            error_text.value = f"Error: {ex}"
+            error_text.visible = True
+        page.update()
+
+    selector_archivo = ft.FilePicker(on_result=guardar_modelo)
+    page.overlay.append(selector_archivo)
+
+    exportar_btn = ft.ElevatedButton(
+        text="Exportar modelo (MPS/LP)",
+        on_click=lambda e: selector_archivo.save_file(
+            dialog_title="Exportar modelo",
+            file_name="modelo.lp",
+            allowed_extensions=["lp", "mps"]
+        ),
+        style=ft.ButtonStyle(
+            bgcolor=ft.Colors.with_opacity(0.5, ft.Colors.WHITE),
+            color=ft.Colors.BLACK,
+            padding=20,
+            shape=ft.RoundedRectangleBorder(radius=10)
+        ),
+        width=250
+    )
+
     resolver_btn = ft.ElevatedButton(
         text="Resolver con Simplex",
         on_click=resolver,
@@ -336,7 +718,15 @@ def main_simplex(page: ft.Page):
             info,
             func_obj_field,
             restricciones_field,
+            motor_combo,
+            regla_combo,
+            presolve_check,
+            escalado_check,
+            comparar_escala_check,
+            sensibilidad_check,
+            almacen_check,
             ft.Container(resolver_btn, alignment=ft.alignment.center),
+            ft.Container(exportar_btn, alignment=ft.alignment.center),
             ft.Container(error_text, alignment=ft.alignment.center),
             ft.Text("Proceso de solución:", color="#FFFFFF", weight=ft.FontWeight.BOLD),
             salida
@@ -1,275 +1,95 @@
 import flet as ft
 import numpy as np
-import re
-
-def clean_expression(expr):
-    return expr.replace(" ", "").lower()
-
-def detect_variables(func_obj_str, restricciones_str):
-    text = func_obj_str + "\n" + restricciones_str
-    vars_found = set(re.findall(r"x\d+", text.lower()))
-    vars_sorted = sorted(vars_found, key=lambda x: int(x[1:]))
-    return vars_sorted
-
-def parse_function_objective(line, variables):
-    line = line.lower()
-    if line.startswith("z=") or line.startswith("min="):
-        line = line[line.find("=")+1:]
-    line = clean_expression(line)
-
-    coefs = [0] * len(variables)
-    for i, var in enumerate(variables):
-        pattern = re.compile(r"([+-]?[\d\.]*)" + re.escape(var))
-        matches = pattern.findall(line)
-        total = 0.0
-        for m in matches:
-            if m in ("", "+"):
-                total += 1
-            elif m == "-":
-                total -= 1
-            else:
-                total += float(m)
-        coefs[i] = total
-    return coefs
+import scipy.sparse as sp
+from simplex_revisado import simplex_revisado, comparar_reglas
+from punto_interior import punto_interior
+from reglas_precio import REGLAS
+from traza import TrazaSimplex
+from presolve import presolve, postsolve
+from escalado import escalar_modelo, rango, resumen_escala
+from sensibilidad import sensibilidad, sensibilidad_de_punto, lineas_sensibilidad
+from ramificacion import ramificacion_acotamiento
+from cortes_gomory import cortes_gomory
+from expresiones import tabla_simbolos, fila_lineal
+from simplex_tableau import (detect_variables, parse_function_objective, parse_restriction, parse_cotas,
+                             parse_enteras, simplex_dos_fases)
+from formatos import escribir_archivo
+from cache_modelos import CacheModelos
+from almacen_soluciones import AlmacenSoluciones, hash_modelo, hash_estructura
 
-def parse_restriction(line, variables):
-    line = line.lower().replace(" ", "")
-    
-    if "<=" in line:
-        left, right = line.split("<=")
-        sentido = "<="
-    elif ">=" in line:
-        left, right = line.split(">=")
-        sentido = ">="
-    elif "=" in line:
-        left, right = line.split("=")
-        sentido = "="
-    else:
-        raise ValueError("Cada restricción debe contener '<=', '>=' o '='")
-    
-    coefs = [0] * len(variables)
-    for i, var in enumerate(variables):
-        pattern = re.compile(r"([+-]?[\d\.]*)" + re.escape(var))
-        matches = pattern.findall(left)
-        total = 0.0
-        for m in matches:
-            if m in ("", "+"):
-                total += 1
-            elif m == "-":
-                total -= 1
-            else:
-                total += float(m)
-        coefs[i] = total
-    
-    return coefs, float(right), sentido
+# Texto de los estados de límite para la pantalla
+LIMITES = {"limite_iteraciones": "límite de iteraciones", "limite_tiempo": "límite de tiempo",
+           "limite_nodos": "límite de nodos", "limite_rondas": "límite de rondas de cortes",
+           "limite_cortes": "límite de cortes activos"}
+
+# Modelos ya leídos de los campos, por texto normalizado y motor
+CACHE_MODELOS = CacheModelos(max_bytes=16 * 2**20)
 
-def simplex_dos_fases(c, A, b, sentidos):
+def leer_campos(func_obj_str, restr_str, motor):
     """
-    Método de dos fases para minimización corregido
+    Lee el formulario: variables, c, A y b (arreglos, A densa de m × n),
+    sentidos, las líneas de restricción que quedan como filas, cotas y
+    enteras. Las cotas simples se separan salvo con Dos Fases sin enteras o
+    con Gomory.
     """
-    num_vars = len(c)
-    num_rest = len(b)
-    
-    # FASE 1: Minimizar suma de variables artificiales
-    print("=== FASE 1 ===")
-    
-    # Identificar restricciones que necesitan variables artificiales
-    restricciones_artificiales = [i for i, s in enumerate(sentidos) if s in [">=", "="]]
-    num_artificiales = len(restricciones_artificiales)
-    
-    # Matriz aumentada para Fase 1
-    total_cols_f1 = num_vars + num_rest + num_artificiales  # +1 para LD después
-    
-    # Tableau Fase 1
-    tableau_f1 = np.zeros((num_rest + 1, total_cols_f1 + 1))  # +1 para LD
-    
-    # Configurar nombres de variables para Fase 1
-    nombres_f1 = [f"x{i+1}" for i in range(num_vars)]
-    nombres_f1 += [f"s{i+1}" for i in range(num_rest)]  # Holguras
-    nombres_f1 += [f"a{i+1}" for i in range(num_artificiales)]  # Artificiales
-    nombres_f1.append("LD")
-    
-    # Llenar restricciones
-    idx_artificial = 0
-    for i in range(num_rest):
-        # Variables originales
-        tableau_f1[i+1, :num_vars] = A[i]
-        
-        # Variables de holgura
-        if sentidos[i] == "<=":
-            tableau_f1[i+1, num_vars + i] = 1  # Holgura positiva
-        elif sentidos[i] == ">=":
-            tableau_f1[i+1, num_vars + i] = -1  # Exceso negativo
-            # Variable artificial
-            tableau_f1[i+1, num_vars + num_rest + idx_artificial] = 1
-            idx_artificial += 1
-        elif sentidos[i] == "=":
-            # Variable artificial
-            tableau_f1[i+1, num_vars + num_rest + idx_artificial] = 1
-            idx_artificial += 1
-        
-        # Lado derecho
-        tableau_f1[i+1, -1] = b[i]
-    
-    # Función objetivo Fase 1: Minimizar suma de artificiales
-    for i in range(num_artificiales):
-        tableau_f1[0, num_vars + num_rest + i] = 1
-    
-    # Hacer cero los coeficientes de variables básicas en Z
-    for i in range(num_rest):
-        if sentidos[i] in [">=", "="]:
-            # Encontrar la columna artificial correspondiente
-            for j in range(num_artificiales):
-                col_art = num_vars + num_rest + j
-                if tableau_f1[i+1, col_art] == 1:
-                    tableau_f1[0] -= tableau_f1[i+1]
-                    break
-    
-    tablas = []
-    tablas.append(("FASE 1 - Tabla Inicial", tableau_f1.copy(), nombres_f1))
-    
-    # Iteraciones Fase 1
-    print("Iterando Fase 1...")
-    for iter_f1 in range(10):
-        # Verificar optimalidad Fase 1 (minimización)
-        if np.all(tableau_f1[0, :-1] >= -1e-8):
-            break
-        
-        # Columna pivote (más negativo)
-        col_pivote = np.argmin(tableau_f1[0, :-1])
-        
-        # Razón mínima
-        ratios = []
-        for i in range(1, tableau_f1.shape[0]):
-            if tableau_f1[i, col_pivote] > 1e-8:
-                ratio = tableau_f1[i, -1] / tableau_f1[i, col_pivote]
-                if ratio >= 0:
-                    ratios.append(ratio)
-                else:
-                    ratios.append(np.inf)
-            else:
-                ratios.append(np.inf)
-        
-        if all(r == np.inf for r in ratios):
-            break
-        
-        fila_pivote = np.argmin(ratios) + 1
-        
-        # Pivoteo
-        pivot_val = tableau_f1[fila_pivote, col_pivote]
-        tableau_f1[fila_pivote] /= pivot_val
-        
-        for i in range(tableau_f1.shape[0]):
-            if i != fila_pivote:
-                factor = tableau_f1[i, col_pivote]
-                tableau_f1[i] -= factor * tableau_f1[fila_pivote]
-        
-        tablas.append((f"FASE 1 - Iteración {iter_f1 + 1}", tableau_f1.copy(), nombres_f1))
-    
-    # Verificar factibilidad
-    z_fase1 = tableau_f1[0, -1]
-    if abs(z_fase1) > 1e-6:
-        raise ValueError("El problema no tiene solución factible")
-    
-    print("=== FASE 2 ===")
-    # FASE 2: Usar la función objetivo original
-    
-    # Preparar tableau para Fase 2
-    # Eliminar columnas de variables artificiales
-    columnas_a_mantener = []
-    for j in range(tableau_f1.shape[1] - 1):  # Excluir LD
-        es_artificial = j >= (num_vars + num_rest) and j < (num_vars + num_rest + num_artificiales)
-        if not es_artificial:
-            columnas_a_mantener.append(j)
-    
-    # Agregar columna LD
-    columnas_a_mantener.append(tableau_f1.shape[1] - 1)
-    
-    tableau_f2 = tableau_f1[:, columnas_a_mantener]
-    
-    # Nombres para Fase 2
-    nombres_f2 = [nombres_f1[j] for j in columnas_a_mantener[:-1]] + ["LD"]
-    
-    # CORRECCIÓN: Reemplazar función objetivo por la original con limpieza mejorada
-    nueva_fila_z = np.zeros(tableau_f2.shape[1])
-    nueva_fila_z[:num_vars] = c  # Coeficientes originales
-    nueva_fila_z[-1] = 0  # LD
-    
-    # CORRECCIÓN MEJORADA: Limpiar coeficientes de variables básicas
-    # Iterar múltiples veces para asegurar que todos los coeficientes básicos sean 0
-    for _ in range(3):  # Hacer varias pasadas para mayor precisión
-        for i in range(1, tableau_f2.shape[0]):
-            # Identificar la variable básica en esta fila
-            col_basica = -1
-            for j in range(tableau_f2.shape[1] - 1):
-                if abs(tableau_f2[i, j] - 1.0) < 1e-6:
-                    # Verificar si es realmente variable básica
-                    es_basica = True
-                    for k in range(tableau_f2.shape[0]):
-                        if k != i and abs(tableau_f2[k, j]) > 1e-6:
-                            es_basica = False
-                            break
-                    if es_basica:
-                        col_basica = j
-                        break
-            
-            if col_basica != -1:
-                # Restar la fila multiplicada por el coeficiente de Z
-                coef = nueva_fila_z[col_basica]
-                if abs(coef) > 1e-10:
-                    nueva_fila_z -= coef * tableau_f2[i]
-    
-    tableau_f2[0] = nueva_fila_z
-    
-    tablas.append(("FASE 2 - Tabla Inicial", tableau_f2.copy(), nombres_f2))
-    
-    # Iteraciones Fase 2
-    print("Iterando Fase 2...")
-    for iter_f2 in range(20):
-        # Verificar optimalidad Fase 2 (minimización)
-        # Para minimización: óptimo cuando todos los coeficientes en Z son >= 0
-        if np.all(tableau_f2[0, :-1] >= -1e-8):
-            break
-        
-        # Columna pivote (más negativo)
-        col_pivote = np.argmin(tableau_f2[0, :-1])
-        
-        # Si el más negativo es >= 0, hemos terminado
-        if tableau_f2[0, col_pivote] >= -1e-8:
-            break
-        
-        # Razón mínima
-        ratios = []
-        for i in range(1, tableau_f2.shape[0]):
-            if tableau_f2[i, col_pivote] > 1e-8:
-                ratio = tableau_f2[i, -1] / tableau_f2[i, col_pivote]
-                if ratio >= 0:
-                    ratios.append(ratio)
-                else:
-                    ratios.append(np.inf)
-            else:
-                ratios.append(np.inf)
-        
-        if all(r == np.inf for r in ratios):
-            break
-        
-        fila_pivote = np.argmin(ratios) + 1
-        
-        # Pivoteo
-        pivot_val = tableau_f2[fila_pivote, col_pivote]
-        tableau_f2[fila_pivote] /= pivot_val
-        
-        for i in range(tableau_f2.shape[0]):
-            if i != fila_pivote:
-                factor = tableau_f2[i, col_pivote]
-                tableau_f2[i] -= factor * tableau_f2[fila_pivote]
-        
-        tablas.append((f"FASE 2 - Iteración {iter_f2 + 1}", tableau_f2.copy(), nombres_f2))
-    
-    return tablas
+    variables = detect_variables(func_obj_str, restr_str)
+    if not variables:
+        raise ValueError("No se detectaron variables en la función objetivo ni en las restricciones")
+
+    # Tabla de símbolos única: cada línea se lee en una pasada sin buscar en la lista
+    simbolos = tabla_simbolos(variables)
+    c = parse_function_objective(func_obj_str, simbolos)
 
-def crear_tabla_visual(tabla_data, nombres_vars, titulo):
-    """Crea una visualización de tabla para Flet"""
+    restr_lines = [line for line in restr_str.split("\n") if line.strip()]
+    restr_lines, enteras = parse_enteras(restr_lines, simbolos)
+    gomory = motor == "Cortes de Gomory"
+    cotas = None
+    if motor not in ("Dos Fases", "Cortes de Gomory") or (np.any(enteras) and not gomory):
+        restr_lines, cotas = parse_cotas(restr_lines, simbolos)
+    A = []
+    b = []
+    sentidos = []
+    for line in restr_lines:
+        coefs, val, sentido = parse_restriction(line, simbolos)
+        A.append(coefs)
+        b.append(val)
+        sentidos.append(sentido)
+    return {"variables": variables, "c": np.array(c, dtype=float),
+            "A": np.array(A, dtype=float).reshape(len(b), len(variables)), "b": np.array(b, dtype=float),
+            "sentidos": sentidos, "restr_lines": restr_lines, "cotas": cotas, "enteras": enteras}
+
+def modelo_de_campos(func_obj_str, restr_str):
+    """Modelo de los campos del formulario listo para escribir_archivo (min, con cotas y enteras)"""
+    variables = detect_variables(func_obj_str, restr_str)
+    if not variables:
+        raise ValueError("No se detectaron variables en la función objetivo ni en las restricciones")
+    simbolos = tabla_simbolos(variables)
+    restr_lines = [line for line in restr_str.splitlines() if line.strip()]
+    restr_lines, enteras = parse_enteras(restr_lines, simbolos)
+    restr_lines, cotas = parse_cotas(restr_lines, simbolos)
+    filas, columnas, datos, b, sentidos = [], [], [], [], []
+    for i, line in enumerate(restr_lines):
+        coefs, sentido, val = fila_lineal(line, simbolos)
+        if sentido is None:
+            raise ValueError("Cada restricción debe contener '<=', '>=' o '='")
+        filas.extend([i] * len(coefs))
+        columnas.extend(coefs.keys())
+        datos.extend(coefs.values())
+        b.append(val)
+        sentidos.append(sentido)
+    return {
+        "c": parse_function_objective(func_obj_str, simbolos),
+        "A": sp.csr_matrix((datos, (filas, columnas)), shape=(len(b), len(variables))),
+        "b": b,
+        "sentidos": sentidos,
+        "objetivo": "min",
+        "variables": variables,
+        "cotas": cotas,
+        "enteras": enteras,
+    }
+
+def crear_tabla_visual(tabla_data, nombres_vars, titulo, base=None):
+    """Crea una visualización de tabla para Flet; `base` da la VB de cada fila"""
     
     # Encabezados
     headers = ["Ec", "VB"] + nombres_vars
@@ -282,18 +102,10 @@ def crear_tabla_visual(tabla_data, nombres_vars, titulo):
     
     # Filas de restricciones
     for i in range(1, tabla_data.shape[0]):
-        # Determinar variable básica
+        # Variable básica de la fila, leída de la base del solver
         vb = "-"
-        for j in range(len(tabla_data[i]) - 1):  # Excluir LD
-            if abs(tabla_data[i, j] - 1) < 0.001:
-                # Verificar si es la única en la columna
-                col_vals = [tabla_data[k, j] for k in range(tabla_data.shape[0])]
-                ones_count = sum(1 for val in col_vals if abs(val - 1) < 0.001)
-                zeros_count = sum(1 for val in col_vals if abs(val) < 0.001)
-                
-                if ones_count == 1 and zeros_count == len(col_vals) - 1:
-                    vb = nombres_vars[j]
-                    break
+        if base is not None and base[i-1] >= 0:
+            vb = nombres_vars[base[i-1]]
         
         row_vals = [f"{val:.3f}" for val in tabla_data[i]]
         row = [str(i), vb] + row_vals
@@ -424,8 +236,83 @@ def main_simplex_minimizacion(page: ft.Page):
         bgcolor=ft.Colors.with_opacity(0.1, "#000000"),
     )
 
+    motor_combo = ft.Dropdown(
+        label="Motor de solución",
+        options=[
+            ft.dropdown.Option("Dos Fases"),
+            ft.dropdown.Option("Revisado"),
+            ft.dropdown.Option("Punto interior"),
+            ft.dropdown.Option("Cortes de Gomory")
+        ],
+        value="Dos Fases",
+        **{k: v for k, v in field_style.items() if k != "height"}
+    )
+
+    regla_combo = ft.Dropdown(
+        label="Regla de precio",
+        options=[ft.dropdown.Option(key=nombre, text=nombre.replace("_", " ").capitalize())
+                 for nombre in REGLAS] + [ft.dropdown.Option(key="comparar", text="Comparar todas")],
+        value="dantzig",
+        **{k: v for k, v in field_style.items() if k != "height"}
+    )
+
+    presolve_check = ft.Checkbox(
+        label="Presolve (reducir el modelo antes de pivotear)",
+        value=True,
+        label_style=ft.TextStyle(color="#FFFFFF")
+    )
+
+    escalado_check = ft.Checkbox(
+        label="Escalar filas y columnas (media geométrica y equilibrio)",
+        value=True,
+        label_style=ft.TextStyle(color="#FFFFFF")
+    )
+
+    # Resolver de nuevo sin escalar solo para informar las iteraciones ahorradas
+    comparar_escala_check = ft.Checkbox(
+        label="Comparar con el modelo sin escalar (resuelve dos veces)",
+        value=False,
+        label_style=ft.TextStyle(color="#FFFFFF")
+    )
+
+    almacen_check = ft.Checkbox(
+        label="Guardar soluciones en disco (motor Revisado: reusar óptimos y bases entre sesiones)",
+        value=False,
+        label_style=ft.TextStyle(color="#FFFFFF")
+    )
+
+    sensibilidad_check = ft.Checkbox(
+        label="Análisis de sensibilidad (precios sombra y rangos de c y b)",
+        value=True,
+        label_style=ft.TextStyle(color="#FFFFFF")
+    )
+
+    # Presupuestos de Dos Fases; vacíos = límite automático de iteraciones y sin límite de tiempo
+    max_iteraciones_field = ft.TextField(
+        label="Límite de iteraciones (opcional)",
+        value="",
+        **field_style
+    )
+
+    tiempo_limite_field = ft.TextField(
+        label="Límite de tiempo en segundos (opcional)",
+        value="",
+        **field_style
+    )
+
     error_text = ft.Text(color="red", visible=False)
 
+    # Última base óptima por estructura del modelo, para re-resolver en caliente
+    bases_previas = {}
+    # El almacén en disco se abre la primera vez que se usa
+    almacen = None
+
+    def abrir_almacen():
+        nonlocal almacen
+        if almacen is None:
+            almacen = AlmacenSoluciones()
+        return almacen
+
     def resolver_minimizacion(e):
         # Limpiar resultados anteriores
         salida.content.controls.clear()
@@ -438,27 +325,44 @@ def main_simplex_minimizacion(page: ft.Page):
             if not func_obj_str or not restr_str:
                 raise ValueError("Por favor complete todos los campos")
 
-            variables = detect_variables(func_obj_str, restr_str)
-            if not variables:
-                raise ValueError("No se detectaron variables x1, x2, ...")
+            try:
+                max_iteraciones = int(max_iteraciones_field.value) if max_iteraciones_field.value.strip() else None
+                tiempo_limite = float(tiempo_limite_field.value) if tiempo_limite_field.value.strip() else None
+            except ValueError:
+                raise ValueError("Los límites de iteraciones y de tiempo deben ser números")
 
-            c = parse_function_objective(func_obj_str, variables)
+            # Con cortes de Gomory todas las variables son enteras y las cotas van como filas
+            gomory = motor_combo.value == "Cortes de Gomory"
+            # Un texto ya resuelto no se vuelve a parsear: sale de la caché
+            leido = CACHE_MODELOS.obtener(func_obj_str, restr_str,
+                                          lambda: leer_campos(func_obj_str, restr_str, motor_combo.value),
+                                          motor_combo.value)
+            # Los arreglos de la caché son de solo lectura; los solvers que pivotean reciben copias
+            variables, c, A, b, sentidos = (list(leido["variables"]), leido["c"], leido["A"], leido["b"],
+                                            leido["sentidos"])
+            restr_lines, cotas, enteras = leido["restr_lines"], leido["cotas"], leido["enteras"]
+            entero = bool(np.any(enteras)) and not gomory
 
-            restr_lines = [line for line in restr_str.split("\n") if line.strip()]
-            A = []
-            b = []
-            sentidos = []
-            
             salida.content.controls.append(ft.Text("✓ Problema cargado correctamente", color="#90EE90"))
+            salida.content.controls.append(ft.Text(
+                f"Caché de modelos: {CACHE_MODELOS.aciertos} aciertos, {CACHE_MODELOS.fallos} fallos",
+                color="#FFFFFF", size=12
+            ))
             salida.content.controls.append(ft.Text(f"Función objetivo: {func_obj_str}", color="#FFFFFF"))
             salida.content.controls.append(ft.Text("Restricciones:", color="#FFFFFF"))
             
-            for line in restr_lines:
-                coefs, val, sentido = parse_restriction(line, variables)
-                A.append(coefs)
-                b.append(val)
-                sentidos.append(sentido)
+            for line, sentido in zip(restr_lines, sentidos):
                 salida.content.controls.append(ft.Text(f"  {line} (tipo: {sentido})", color="#FFFFFF"))
+            if cotas is not None:
+                for var, inf_j, sup_j in zip(variables, *cotas):
+                    if inf_j != 0 or sup_j != np.inf:
+                        salida.content.controls.append(ft.Text(f"  {inf_j:g} <= {var} <= {sup_j:g}", color="#FFFFFF"))
+            if entero:
+                salida.content.controls.append(ft.Text(
+                    "  Enteras: " + ", ".join(var for var, e in zip(variables, enteras) if e), color="#FFFFFF"
+                ))
+            if gomory:
+                salida.content.controls.append(ft.Text("  Enteras: todas (cortes de Gomory)", color="#FFFFFF"))
 
             # Resolver con método de dos fases
             salida.content.controls.append(ft.Text(
@@ -466,42 +370,206 @@ def main_simplex_minimizacion(page: ft.Page):
                 color="#87CEEB", weight=ft.FontWeight.BOLD
             ))
             
-            tablas = simplex_dos_fases(c, np.array(A), np.array(b), sentidos)
+            regla = regla_combo.value
+            if regla == "comparar":
+                if motor_combo.value != "Dos Fases":
+                    A_disp = sp.csr_matrix(np.reshape(A, (len(b), len(variables))))
+                    comparacion = comparar_reglas(c, A_disp, np.array(b), sentidos, "min", cotas)
+                    iteraciones = {nombre: r["iteraciones"] for nombre, r in comparacion.items()}
+                else:
+                    iteraciones = {}
+                    for nombre in REGLAS:
+                        tablas = simplex_dos_fases(c, np.array(A), np.array(b), sentidos, nombre)
+                        iteraciones[nombre] = tablas.num_pivotes
+                salida.content.controls.append(ft.Text("Iteraciones por regla de precio:", color="#FFFFFF"))
+                for nombre, num in iteraciones.items():
+                    salida.content.controls.append(ft.Text(f"  {nombre}: {num}", color="#FFFFFF"))
+                regla = min(iteraciones, key=iteraciones.get)
+
+            tablas = TrazaSimplex()
+            if entero:
+                A_disp = sp.csr_matrix(np.reshape(A, (len(b), len(variables))))
+                solucion = ramificacion_acotamiento(c, A_disp, np.array(b), sentidos, "min", cotas=cotas,
+                                                    enteras=enteras, regla=regla,
+                                                    tiempo_limite=tiempo_limite)
+                if solucion["estado"] == "no_acotado":
+                    raise ValueError("El problema no está acotado")
+                if solucion["estado"] == "limite_iteraciones":
+                    raise ValueError("Se alcanzó el límite de iteraciones sin llegar al óptimo")
+                if solucion["estado"] == "no_factible":
+                    raise ValueError("El problema no tiene solución entera factible")
+                if solucion["x"] is None:
+                    raise ValueError("Se alcanzó el límite de la ramificación sin encontrar una solución entera")
+                salida.content.controls.append(ft.Text(
+                    f"Ramificación y acotamiento: {solucion['nodos']} nodos, {solucion['iteraciones']} "
+                    f"iteraciones del simplex; relajación Z = {solucion['relajacion']:.3f}, "
+                    f"cota {solucion['cota']:.3f}, brecha {solucion['gap']:.2%}",
+                    color="#FFFFFF"
+                ))
+            elif gomory:
+                tablas = cortes_gomory(c, np.array(A), np.array(b), sentidos, "min", regla=regla,
+                                       variables=variables, max_iteraciones=max_iteraciones)
+                if tablas.estado == "no_acotado":
+                    raise ValueError("El problema no está acotado")
+                if tablas.estado == "no_factible":
+                    raise ValueError("El problema no tiene solución entera factible")
+                if tablas.mejor is None:
+                    raise ValueError(f"Se alcanzó el {LIMITES[tablas.estado]} sin llegar a una solución "
+                                     "entera; probar con ramificación y acotamiento")
+                salida.content.controls.append(ft.Text(
+                    f"Cortes de Gomory: {tablas.cortes['rondas']} rondas, {tablas.cortes['generados']} "
+                    f"cortes generados, {tablas.cortes['purgados']} purgados por inactivos, "
+                    f"{tablas.cortes['activos']} activos al final",
+                    color="#FFFFFF"
+                ))
+            elif motor_combo.value == "Revisado":
+                A_disp = sp.csr_matrix(np.reshape(A, (len(b), len(variables))))
+                clave = (tuple(variables), tuple(sentidos))
+                base_inicial = bases_previas.get(clave)
+                solucion = None
+                if almacen_check.value:
+                    # Un modelo ya resuelto en otra sesión sale del disco sin pivotear
+                    clave_disco = hash_modelo(c, A_disp, b, sentidos, "min", cotas)
+                    estructura = hash_estructura(A_disp, sentidos, "min")
+                    solucion = abrir_almacen().buscar(clave_disco)
+                    if base_inicial is None:
+                        base_inicial = abrir_almacen().base_cercana(estructura)
+                if solucion is not None:
+                    solucion["escala"] = None
+                    salida.content.controls.append(ft.Text(
+                        f"✓ Solución leída del almacén en disco (resuelta antes en {solucion['iteraciones']} "
+                        f"iteraciones; {abrir_almacen().aciertos} aciertos en esta sesión)",
+                        color="#90EE90"
+                    ))
+                else:
+                    solucion = simplex_revisado(c, A_disp, np.array(b), sentidos, objetivo="min", cotas=cotas,
+                                                base_inicial=base_inicial, regla=regla,
+                                                escalar=escalado_check.value)
+                    if solucion["estado"] == "no_factible":
+                        raise ValueError("El problema no tiene solución factible")
+                    if solucion["estado"] == "no_acotado":
+                        raise ValueError("El problema no está acotado")
+                    if solucion["estado"] == "limite_iteraciones":
+                        raise ValueError("Se alcanzó el límite de iteraciones sin llegar al óptimo")
+                    salida.content.controls.append(ft.Text(
+                        f"Simplex revisado ({solucion['metodo']}, arranque {solucion['arranque']}, "
+                        f"regla {solucion['regla']}): {solucion['iteraciones']} iteraciones",
+                        color="#FFFFFF"
+                    ))
+                    if solucion["escala"] is not None:
+                        sin_escala = None
+                        if comparar_escala_check.value:
+                            sin_escala = simplex_revisado(c, A_disp, np.array(b), sentidos, objetivo="min",
+                                                          cotas=cotas, base_inicial=base_inicial, regla=regla,
+                                                          escalar=False)["iteraciones"]
+                        salida.content.controls.append(ft.Text(
+                            resumen_escala(solucion["escala"]["rango_original"],
+                                           solucion["escala"]["rango_escalado"],
+                                           solucion["iteraciones"], sin_escala,
+                                           comparado=comparar_escala_check.value),
+                            color="#FFFFFF"
+                        ))
+                    if almacen_check.value:
+                        abrir_almacen().guardar(clave_disco, estructura, solucion)
+                bases_previas[clave] = solucion
+            elif motor_combo.value == "Punto interior":
+                A_disp = sp.csr_matrix(np.reshape(A, (len(b), len(variables))))
+                solucion = punto_interior(c, A_disp, np.array(b), sentidos, objetivo="min", cotas=cotas,
+                                          regla=regla)
+                if solucion["estado"] == "no_factible":
+                    raise ValueError("El problema no tiene solución factible")
+                if solucion["estado"] == "no_acotado":
+                    raise ValueError("El problema no está acotado")
+                if solucion["estado"] == "limite_iteraciones":
+                    raise ValueError("Se alcanzó el límite de iteraciones sin llegar al óptimo")
+                salida.content.controls.append(ft.Text(
+                    f"Punto interior (Mehrotra): {solucion['iteraciones_ipm']} iteraciones; "
+                    f"crossover a una base con {solucion['pivotes_crossover']} pivotes del simplex",
+                    color="#FFFFFF"
+                ))
+            else:
+                variables_tab = variables
+                c_tab, A_tab, b_tab, sentidos_tab = c, np.array(A), np.array(b), sentidos
+                if presolve_check.value:
+                    modelo = presolve(c, A, b, sentidos, objetivo="min")
+                    variables_tab = [variables[j] for j in modelo["columnas"]]
+                    c_tab, A_tab, b_tab, sentidos_tab = modelo["c"], modelo["A"], modelo["b"], modelo["sentidos"]
+                    reducciones = ", ".join(f"{k}: {v}" for k, v in modelo["estadisticas"].items() if v)
+                    salida.content.controls.append(ft.Text(
+                        f"Presolve: {len(b)} → {len(b_tab)} restricciones, "
+                        f"{len(variables)} → {len(variables_tab)} variables"
+                        + (f" ({reducciones})" if reducciones else ""),
+                        color="#FFFFFF"
+                    ))
+                if escalado_check.value:
+                    c_e, A_e, b_e, _, r_esc, s_esc = escalar_modelo(c_tab, A_tab, b_tab)
+                    tablas = simplex_dos_fases(c_e, A_e, b_e, sentidos_tab, regla, variables=variables_tab,
+                                               max_iteraciones=max_iteraciones, tiempo_limite=tiempo_limite)
+                    sin_escala = None
+                    if comparar_escala_check.value:
+                        # Con los mismos presupuestos que la corrida escalada
+                        comparacion = simplex_dos_fases(c_tab, A_tab, b_tab, sentidos_tab, regla,
+                                                        max_iteraciones=max_iteraciones,
+                                                        tiempo_limite=tiempo_limite)
+                        if comparacion.estado == "optimo":
+                            sin_escala = comparacion.num_pivotes
+                    salida.content.controls.append(ft.Text(
+                        resumen_escala(rango(A_tab), rango(A_e), tablas.num_pivotes, sin_escala,
+                                       comparado=comparar_escala_check.value)
+                        + " (las tablas muestran el modelo escalado)",
+                        color="#FFFFFF"
+                    ))
+                else:
+                    tablas = simplex_dos_fases(c_tab, A_tab, b_tab, sentidos_tab, regla, variables=variables_tab,
+                                               max_iteraciones=max_iteraciones, tiempo_limite=tiempo_limite)
+                if tablas.estado == "no_factible":
+                    raise ValueError("El problema no tiene solución factible")
+                if tablas.estado == "no_acotado":
+                    raise ValueError("El problema no está acotado")
+                if tablas.mejor is None:
+                    raise ValueError(f"Se alcanzó el {LIMITES[tablas.estado]} en la Fase 1, "
+                                     "sin encontrar un punto factible")
             
             # Mostrar todas las tablas
-            for titulo, tabla_data, nombres_vars in tablas:
-                tabla_widget = crear_tabla_visual(tabla_data, nombres_vars, titulo)
+            for (titulo, tabla_data, nombres_vars), base in zip(tablas, tablas.bases()):
+                tabla_widget = crear_tabla_visual(tabla_data, nombres_vars, titulo, base)
                 salida.content.controls.append(tabla_widget)
             
-            # Mostrar solución final
-            ultima_tabla = tablas[-1][1]
+            # Mostrar solución final (o el mejor punto factible si se agotó el presupuesto)
+            estado = solucion["estado"] if entero else tablas.estado
+            optimo = estado == "optimo"
             salida.content.controls.append(ft.Text(
-                "\n🎯 SOLUCIÓN ÓPTIMA ENCONTRADA:", 
-                weight=ft.FontWeight.BOLD, color="#32CD32", size=16
+                "\n🎯 SOLUCIÓN ÓPTIMA ENCONTRADA:" if optimo else
+                f"\n⚠ MEJOR PUNTO FACTIBLE ENCONTRADO ({LIMITES[estado]}):",
+                weight=ft.FontWeight.BOLD, color="#32CD32" if optimo else "#FFA500", size=16
             ))
             
             # Extraer valores de las variables originales
+            if gomory:
+                valores = tablas.mejor["x"]
+            elif motor_combo.value != "Dos Fases" or entero:
+                valores = solucion["x"][:len(variables)]
+            else:
+                valores = tablas.mejor["x"]
+                if escalado_check.value:
+                    valores = np.array(valores) * s_esc
+                if presolve_check.value:
+                    valores = postsolve(modelo, valores)
+
             valores_finales = {}
-            for i, var in enumerate(variables):
-                valor = 0.0
-                # Buscar si la variable es básica
-                for j in range(1, ultima_tabla.shape[0]):
-                    if abs(ultima_tabla[j, i] - 1) < 0.001:
-                        # Verificar si es variable básica
-                        col_data = ultima_tabla[:, i]
-                        ones_count = sum(1 for val in col_data if abs(val - 1) < 0.001)
-                        zeros_count = sum(1 for val in col_data if abs(val) < 0.001)
-                        
-                        if ones_count == 1 and zeros_count == len(col_data) - 1:
-                            valor = ultima_tabla[j, -1]
-                            break
-                
+            for var, valor in zip(variables, valores):
                 valores_finales[var] = valor
                 salida.content.controls.append(ft.Text(f"{var} = {valor:.3f}", color="#FFFFFF", size=14))
             
-            z_val = ultima_tabla[0, -1]
+            # La celda LD de la fila Z guarda -Z; se calcula con los valores originales
+            if gomory:
+                z_val = tablas.mejor["z"]
+            elif motor_combo.value != "Dos Fases" or entero:
+                z_val = solucion["z"]
+            else:
+                z_val = float(np.dot(c, valores))
             salida.content.controls.append(ft.Text(
-                f"Valor mínimo de Z = {z_val:.3f}", 
+                f"Valor mínimo de Z = {z_val:.3f}" if optimo else f"Z del mejor punto = {z_val:.3f}", 
                 weight=ft.FontWeight.BOLD, color="#FFD700", size=18
             ))
             
@@ -519,6 +587,46 @@ def main_simplex_minimizacion(page: ft.Page):
                     status = "✓" if resultado >= val - 0.001 else "✗"
                     salida.content.controls.append(ft.Text(f"R{i+1}: {resultado:.3f} >= {val} {status}", color="#FFFFFF"))
 
+            # Sensibilidad a partir de la base final, sin pivotes adicionales
+            if sensibilidad_check.value and (entero or gomory):
+                salida.content.controls.append(ft.Text(
+                    "\n📊 Sin análisis de sensibilidad: con variables enteras los precios sombra y "
+                    "los rangos del modelo lineal no valen para el óptimo entero",
+                    color="#FFFFFF"
+                ))
+            elif sensibilidad_check.value and not optimo:
+                salida.content.controls.append(ft.Text(
+                    "\n📊 Sin análisis de sensibilidad: el solver se detuvo antes del óptimo",
+                    color="#FFFFFF"
+                ))
+            elif sensibilidad_check.value:
+                salida.content.controls.append(ft.Text("\n📊 Análisis de sensibilidad:", color="#90EE90"))
+                if motor_combo.value != "Dos Fases":
+                    reporte = sensibilidad(c, np.array(A), np.array(b), solucion["base"], sentidos, "min",
+                                           cotas, solucion["x"])
+                elif not presolve_check.value:
+                    # La base del modelo escalado es la misma que la del original
+                    reporte = sensibilidad(c, np.array(A), np.array(b), tablas.base, sentidos, "min")
+                else:
+                    # La base del reducido no sirve para las filas originales: se reconstruye desde x
+                    salida.content.controls.append(ft.Text(
+                        "Calculado sobre el modelo original (presolve redujo las filas; la base se "
+                        "reconstruye a partir de la solución)",
+                        color="#FFFFFF", size=12
+                    ))
+                    try:
+                        reporte = sensibilidad_de_punto(c, np.array(A), np.array(b), valores, sentidos, "min",
+                                                        cotas)
+                    except ValueError as ex:
+                        reporte = None
+                        salida.content.controls.append(ft.Text(
+                            f"No se pudo calcular la sensibilidad del modelo original: {ex}",
+                            color="#FFFFFF"
+                        ))
+                if reporte is not None:
+                    for linea in lineas_sensibilidad(reporte, variables, c, b):
+                        salida.content.controls.append(ft.Text(linea, color="#FFFFFF", size=12))
+
         except Exception as ex:
             error_text.value = f"Error: {str(ex)}"
             error_text.visible = True
@@ -526,6 +634,44 @@ def main_simplex_minimizacion(page: ft.Page):
         salida.content.update()
         page.update()
 
+    def guardar_modelo(e):
+        # e.path es None si se cerró el diálogo sin elegir archivo
+        if not e.path:
+            return
+        error_text.visible = False
+        try:
+            func_obj_str = func_obj_field.value.strip()
+            restr_str = restricciones_field.value.strip()
+            if not func_obj_str or not restr_str:
+                raise ValueError("Por favor complete todos los campos")
+            ruta = e.path
+            if not ruta.lower().endswith((".lp", ".mps", ".lp.gz", ".mps.gz")):
+                ruta += ".lp"
+            escribir_archivo(ruta, **modelo_de_campos(func_obj_str, restr_str))
+            salida.content.controls.append(ft.Text(f"✓ Modelo exportado a {ruta}", color="#90EE90"))
+        except Exception as ex:
+            error_text.value = f"Error: {str(ex)}"
+            error_text.visible = True
+        page.update()
+
+    selector_archivo = ft.FilePicker(on_result=guardar_modelo)
+    page.overlay.append(selector_archivo)
+
+    exportar_btn = ft.ElevatedButton(
+        text="Exportar modelo (MPS/LP)",
+        on_click=lambda e: selector_archivo.save_file(
+            dialog_title="Exportar modelo",
+            file_name="modelo.lp",
+            allowed_extensions=["lp", "mps"]
+        ),
+        style=ft.ButtonStyle(
+            bgcolor="#4CAF50",
+            color="white",
+            padding=20,
+        ),
+        width=250
+    )
+
     resolver_btn = ft.ElevatedButton(
         text="Resolver con Dos Fases",
         on_click=resolver_minimizacion,
@@ -544,6 +690,15 @@ def main_simplex_minimizacion(page: ft.Page):
             ft.Text("• Fase 1: Minimizar suma de variables artificiales", color="#FFFFFF", size=12),
             ft.Text("• Fase 2: Optimizar función objetivo original", color="#FFFFFF", size=12),
             ft.Text("• Maneja restricciones =, >=, <=", color="#FFFFFF", size=12),
+            ft.Text("• Variables con cualquier nombre (x1, costo, y_2) y coeficientes como 3x1 o 2.5*costo", color="#FFFFFF", size=12),
+            ft.Text("• Con costos no negativos usa el simplex dual, sin Fase 1", color="#FFFFFF", size=12),
+            ft.Text("• Motor Revisado: cotas simples (x1<=40) y variables libres (x3 libre)", color="#FFFFFF", size=12),
+            ft.Text("• Motor Punto interior: Mehrotra con crossover a una base, para modelos grandes", color="#FFFFFF", size=12),
+            ft.Text("• Variables enteras: una línea \"x1, x2 enteras\" (ramificación y acotamiento)", color="#FFFFFF", size=12),
+            ft.Text("• Motor Cortes de Gomory: todas las variables enteras, una tabla por ronda de cortes", color="#FFFFFF", size=12),
+            ft.Text("• Presolve: quita filas y variables redundantes antes de Dos Fases", color="#FFFFFF", size=12),
+            ft.Text("• Exportar modelo: guarda los campos como .lp o .mps para abrirlos en otros solvers", color="#FFFFFF", size=12),
+            ft.Text("• Almacén en disco (~/.simplex): un modelo ya resuelto con Revisado se lee sin pivotear", color="#FFFFFF", size=12),
         ]),
         padding=10,
         margin=10,
@@ -560,7 +715,17 @@ def main_simplex_minimizacion(page: ft.Page):
                 func_obj_field,
                 restricciones_field,
                 info_adicional,
+                motor_combo,
+                regla_combo,
+                presolve_check,
+                escalado_check,
+                comparar_escala_check,
+                sensibilidad_check,
+                almacen_check,
+                max_iteraciones_field,
+                tiempo_limite_field,
                 ft.Container(resolver_btn, alignment=ft.alignment.center),
+                ft.Container(exportar_btn, alignment=ft.alignment.center),
                 ft.Container(error_text, alignment=ft.alignment.center),
                 ft.Text("Proceso y Resultados:", color="#FFFFFF", weight=ft.FontWeight.BOLD, size=16),
                 salida,
@@ -0,0 +1,442 @@
+"""
+Capa de modelado en Python: arma (c, A, b, sentidos) sin pasar por texto.
+
+    m = Modelo("max")
+    x1 = m.agregar_variable("x1")
+    x2 = m.agregar_variable("x2", superior=4)
+    m.agregar_restriccion(x1 + 2 * x2 <= 8)
+    m.agregar_restriccion(3 * x1 + 2 * x2 <= 12)
+    m.maximizar(4 * x1 + 6 * x2)
+    c, A, b, sentidos = m.arreglos()
+    solucion = m.resolver()
+
+Para modelos grandes las variables se crean en bloque y las restricciones
+salen de arreglos NumPy o matrices dispersas, sin un objeto por término:
+
+    x = m.agregar_variables(1000, "x")
+    m.agregar_restricciones(A_bloque, x, "<=", b_bloque)
+    m.maximizar(costos @ x)
+
+Las expresiones guardan sus coeficientes en un dict índice → valor; `+=`
+y `suma` acumulan en el mismo dict, así que sumar n términos es O(n).
+"""
+import numbers
+
+import numpy as np
+import scipy.sparse as sp
+from punto_interior import punto_interior
+from ramificacion import ramificacion_acotamiento
+from simplex_revisado import simplex_revisado
+
+SENTIDOS = ("<=", ">=", "=")
+
+def _es_escalar(valor):
+    return isinstance(valor, numbers.Real)
+
+class ExprLineal:
+    """Expresión lineal Σ coefs[j]·x_j + constante sobre las variables de un modelo"""
+
+    __slots__ = ("coefs", "constante")
+
+    # Que NumPy no intente operar elemento a elemento con la expresión
+    __array_ufunc__ = None
+
+    def __init__(self, coefs=None, constante=0.0):
+        self.coefs = {} if coefs is None else coefs
+        self.constante = float(constante)
+
+    @classmethod
+    def desde_arreglos(cls, indices, valores, constante=0.0):
+        """Expresión a partir de índices de columna y coeficientes (los repetidos se suman)"""
+        indices = np.asarray(indices, dtype=int).ravel()
+        valores = np.broadcast_to(np.asarray(valores, dtype=float), indices.shape)
+        if len(np.unique(indices)) == len(indices):
+            return cls(dict(zip(indices.tolist(), valores.tolist())), constante)
+        unicos, inversa = np.unique(indices, return_inverse=True)
+        return cls(dict(zip(unicos.tolist(), np.bincount(inversa, valores).tolist())), constante)
+
+    def copia(self):
+        return ExprLineal(dict(self.coefs), self.constante)
+
+    def _acumular(self, otro, factor=1.0):
+        """Suma factor·otro en el lugar (otro: expresión, variable o número)"""
+        if _es_escalar(otro):
+            self.constante += factor * otro
+            return self
+        otro = _expresion(otro)
+        if otro is None:
+            return NotImplemented
+        coefs = self.coefs
+        for j, valor in otro.coefs.items():
+            coefs[j] = coefs.get(j, 0.0) + factor * valor
+        self.constante += factor * otro.constante
+        return self
+
+    def __iadd__(self, otro):
+        return self._acumular(otro)
+
+    def __isub__(self, otro):
+        return self._acumular(otro, -1.0)
+
+    def __add__(self, otro):
+        return self.copia()._acumular(otro)
+
+    __radd__ = __add__
+
+    def __sub__(self, otro):
+        return self.copia()._acumular(otro, -1.0)
+
+    def __rsub__(self, otro):
+        return (-self)._acumular(otro)
+
+    def __neg__(self):
+        return self * -1.0
+
+    def __mul__(self, factor):
+        if not _es_escalar(factor):
+            if _expresion(factor) is not None:
+                raise TypeError("El producto de dos expresiones no es lineal")
+            return NotImplemented
+        factor = float(factor)
+        return ExprLineal({j: factor * v for j, v in self.coefs.items()}, factor * self.constante)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, divisor):
+        if not _es_escalar(divisor):
+            return NotImplemented
+        return self * (1.0 / divisor)
+
+    def _restriccion(self, otro, sentido):
+        diferencia = self - otro
+        if diferencia is NotImplemented:
+            return NotImplemented
+        return Restriccion(diferencia.coefs, sentido, -diferencia.constante)
+
+    def __le__(self, otro):
+        return self._restriccion(otro, "<=")
+
+    def __ge__(self, otro):
+        return self._restriccion(otro, ">=")
+
+    def __eq__(self, otro):
+        return self._restriccion(otro, "=")
+
+    __hash__ = None
+
+    def __repr__(self):
+        terminos = " + ".join(f"{v:g}·[{j}]" for j, v in self.coefs.items())
+        return f"ExprLineal({terminos or '0'} + {self.constante:g})"
+
+class Variable:
+    """Columna `indice` de un modelo; las operaciones aritméticas dan ExprLineal"""
+
+    __slots__ = ("modelo", "indice")
+
+    __array_ufunc__ = None
+
+    def __init__(self, modelo, indice):
+        self.modelo = modelo
+        self.indice = indice
+
+    @property
+    def nombre(self):
+        return self.modelo.variables[self.indice]
+
+    def expresion(self):
+        return ExprLineal({self.indice: 1.0})
+
+    def __add__(self, otro):
+        return self.expresion()._acumular(otro)
+
+    __radd__ = __add__
+
+    def __sub__(self, otro):
+        return self.expresion()._acumular(otro, -1.0)
+
+    def __rsub__(self, otro):
+        return ExprLineal({self.indice: -1.0})._acumular(otro)
+
+    def __neg__(self):
+        return ExprLineal({self.indice: -1.0})
+
+    def __mul__(self, factor):
+        return self.expresion() * factor
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, divisor):
+        return self.expresion() / divisor
+
+    def __le__(self, otro):
+        return self.expresion() <= otro
+
+    def __ge__(self, otro):
+        return self.expresion() >= otro
+
+    def __eq__(self, otro):
+        return self.expresion() == otro
+
+    def __hash__(self):
+        return hash((id(self.modelo), self.indice))
+
+    def __repr__(self):
+        return self.nombre
+
+class BloqueVariables:
+    """
+    Variables consecutivas creadas con agregar_variables. Se indexa como una
+    lista y `coefs @ bloque` da la expresión Σ coefs[k]·x_k sin crear un
+    objeto por variable.
+    """
+
+    __slots__ = ("modelo", "inicio", "cantidad")
+
+    __array_ufunc__ = None
+
+    def __init__(self, modelo, inicio, cantidad):
+        self.modelo = modelo
+        self.inicio = inicio
+        self.cantidad = cantidad
+
+    @property
+    def indices(self):
+        return np.arange(self.inicio, self.inicio + self.cantidad)
+
+    def __len__(self):
+        return self.cantidad
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            desde, hasta, paso = k.indices(self.cantidad)
+            if paso == 1:
+                return BloqueVariables(self.modelo, self.inicio + desde, max(hasta - desde, 0))
+            return [self[i] for i in range(desde, hasta, paso)]
+        if k < 0:
+            k += self.cantidad
+        if not 0 <= k < self.cantidad:
+            raise IndexError("Variable fuera del bloque")
+        return Variable(self.modelo, self.inicio + k)
+
+    def __iter__(self):
+        for j in range(self.inicio, self.inicio + self.cantidad):
+            yield Variable(self.modelo, j)
+
+    def __rmatmul__(self, coefs):
+        coefs = np.asarray(coefs, dtype=float)
+        if coefs.shape != (self.cantidad,):
+            raise ValueError(f"Se esperaban {self.cantidad} coeficientes y hay {coefs.size}")
+        return ExprLineal.desde_arreglos(self.indices, coefs)
+
+    def __matmul__(self, coefs):
+        return self.__rmatmul__(coefs)
+
+    def suma(self):
+        return ExprLineal.desde_arreglos(self.indices, 1.0)
+
+class Restriccion:
+    """Fila dispersa coefs·x (sentido) ld, lista para agregar al modelo"""
+
+    __slots__ = ("coefs", "sentido", "ld")
+
+    def __init__(self, coefs, sentido, ld):
+        self.coefs = coefs
+        self.sentido = sentido
+        self.ld = float(ld)
+
+    def __repr__(self):
+        return f"Restriccion({len(self.coefs)} términos {self.sentido} {self.ld:g})"
+
+def _expresion(valor):
+    if isinstance(valor, ExprLineal):
+        return valor
+    if isinstance(valor, Variable):
+        return valor.expresion()
+    return None
+
+def suma(terminos):
+    """Suma de variables, expresiones o números acumulada en una sola expresión"""
+    total = ExprLineal()
+    for termino in terminos:
+        if total._acumular(termino) is NotImplemented:
+            raise TypeError(f"No se puede sumar {type(termino).__name__} a una expresión lineal")
+    return total
+
+def _columnas(modelo, variables):
+    """Índices de columna de un bloque, una secuencia de Variable o None (todas)"""
+    if variables is None:
+        return np.arange(modelo.num_variables)
+    if isinstance(variables, BloqueVariables):
+        return variables.indices
+    if isinstance(variables, Variable):
+        return np.array([variables.indice])
+    return np.fromiter((v.indice for v in variables), dtype=int)
+
+class Modelo:
+    """
+    Modelo lineal (o entero mixto) construido con objetos: variables con
+    cotas y marca de entera, restricciones como filas dispersas y el
+    objetivo. Las filas se acumulan en trozos COO y `arreglos` arma
+    (c, A, b, sentidos) de una vez, con A en CSR.
+    """
+
+    def __init__(self, objetivo="max"):
+        if objetivo not in ("max", "min"):
+            raise ValueError("El objetivo debe ser 'max' o 'min'")
+        self.objetivo = objetivo
+        self.variables = []
+        self.simbolos = {}
+        self._inferior = []
+        self._superior = []
+        self._enteras = []
+        self.funcion_objetivo = ExprLineal()
+        # Trozos COO de las filas (índices de fila, columnas, valores), b y sentidos
+        self._filas, self._cols, self._datos = [], [], []
+        self._b = []
+        self.sentidos = []
+
+    @property
+    def num_variables(self):
+        return len(self.variables)
+
+    @property
+    def num_restricciones(self):
+        return len(self.sentidos)
+
+    def _nombre_nuevo(self, nombre):
+        if nombre is None:
+            nombre = f"x{len(self.variables) + 1}"
+        if nombre in self.simbolos:
+            raise ValueError(f"La variable {nombre} ya existe")
+        self.simbolos[nombre] = len(self.variables)
+        self.variables.append(nombre)
+
+    def agregar_variable(self, nombre=None, inferior=0.0, superior=np.inf, entera=False):
+        """Agrega una variable (x1, x2, ... si no tiene nombre) y la devuelve"""
+        self._nombre_nuevo(nombre)
+        self._inferior.append(float(inferior))
+        self._superior.append(float(superior))
+        self._enteras.append(bool(entera))
+        return Variable(self, len(self.variables) - 1)
+
+    def agregar_variables(self, cantidad, prefijo="x", inferior=0.0, superior=np.inf, entera=False):
+        """
+        Agrega `cantidad` variables prefijo1, prefijo2, ... de una vez; las
+        cotas pueden ser escalares o arreglos. Devuelve un BloqueVariables.
+        """
+        inicio = len(self.variables)
+        for k in range(cantidad):
+            self._nombre_nuevo(f"{prefijo}{k + 1}")
+        self._inferior.extend(np.broadcast_to(np.asarray(inferior, dtype=float), cantidad).tolist())
+        self._superior.extend(np.broadcast_to(np.asarray(superior, dtype=float), cantidad).tolist())
+        self._enteras.extend(np.broadcast_to(np.asarray(entera, dtype=bool), cantidad).tolist())
+        return BloqueVariables(self, inicio, cantidad)
+
+    def variable(self, nombre):
+        if nombre not in self.simbolos:
+            raise ValueError(f"Variable desconocida: {nombre}")
+        return Variable(self, self.simbolos[nombre])
+
+    def agregar_restriccion(self, restriccion):
+        """Agrega una restricción (expr <= expr, expr >= expr o expr == expr)"""
+        if not isinstance(restriccion, Restriccion):
+            raise TypeError("Se esperaba una restricción, p. ej. 2 * x + y <= 4")
+        fila = self.num_restricciones
+        self._filas.append(np.full(len(restriccion.coefs), fila))
+        self._cols.append(np.fromiter(restriccion.coefs.keys(), dtype=int, count=len(restriccion.coefs)))
+        self._datos.append(np.fromiter(restriccion.coefs.values(), dtype=float, count=len(restriccion.coefs)))
+        self._b.append(np.array([restriccion.ld]))
+        self.sentidos.append(restriccion.sentido)
+        return fila
+
+    def agregar_restricciones(self, A, variables, sentidos, b):
+        """
+        Agrega en bloque las filas A·x (sentidos) b: A es un arreglo (k, n) o
+        una matriz dispersa sobre las n `variables` (un bloque, una lista de
+        Variable o None para todas las del modelo); sentidos es uno solo o
+        uno por fila. Devuelve el rango de índices de las filas nuevas.
+        """
+        columnas = _columnas(self, variables)
+        A = sp.coo_matrix(A)
+        k, n = A.shape
+        if n != len(columnas):
+            raise ValueError(f"A tiene {n} columnas y hay {len(columnas)} variables")
+        b = np.broadcast_to(np.asarray(b, dtype=float), k)
+        if isinstance(sentidos, str):
+            sentidos = [sentidos] * k
+        sentidos = list(sentidos)
+        if len(sentidos) != k or any(s not in SENTIDOS for s in sentidos):
+            raise ValueError("Se necesita un sentido válido (<=, >= o =) por fila")
+        inicio = self.num_restricciones
+        self._filas.append(A.row + inicio)
+        self._cols.append(columnas[A.col])
+        self._datos.append(A.data.astype(float))
+        self._b.append(b.copy())
+        self.sentidos.extend(sentidos)
+        return range(inicio, inicio + k)
+
+    def _fijar_objetivo(self, expresion, objetivo):
+        expresion = expresion if _es_escalar(expresion) else _expresion(expresion)
+        if expresion is None:
+            raise TypeError("El objetivo debe ser una expresión lineal")
+        self.funcion_objetivo = ExprLineal(constante=expresion) if _es_escalar(expresion) else expresion
+        self.objetivo = objetivo
+
+    def maximizar(self, expresion):
+        self._fijar_objetivo(expresion, "max")
+
+    def minimizar(self, expresion):
+        self._fijar_objetivo(expresion, "min")
+
+    @property
+    def cotas(self):
+        return np.array(self._inferior), np.array(self._superior)
+
+    @property
+    def enteras(self):
+        return np.array(self._enteras, dtype=bool)
+
+    def arreglos(self):
+        """(c, A, b, sentidos) del modelo, con A dispersa (CSR); los términos repetidos se suman"""
+        n = self.num_variables
+        c = np.zeros(n)
+        objetivo = self.funcion_objetivo.coefs
+        if objetivo:
+            indices = np.fromiter(objetivo.keys(), dtype=int, count=len(objetivo))
+            c[indices] = np.fromiter(objetivo.values(), dtype=float, count=len(objetivo))
+        if self._filas:
+            filas = np.concatenate(self._filas)
+            cols = np.concatenate(self._cols)
+            datos = np.concatenate(self._datos)
+            b = np.concatenate(self._b)
+        else:
+            filas = cols = np.zeros(0, dtype=int)
+            datos = b = np.zeros(0)
+        if len(cols) and (cols.min() < 0 or cols.max() >= n):
+            raise ValueError("Una restricción usa una variable de otro modelo")
+        A = sp.csr_matrix((datos, (filas, cols)), shape=(len(b), n))
+        return c, A, b, list(self.sentidos)
+
+    def resolver(self, motor="revisado", **opciones):
+        """
+        Resuelve con simplex_revisado (o punto_interior con motor
+        "punto_interior"), o con ramificacion_acotamiento si hay variables
+        enteras. Devuelve el dict del solver más "valores" {nombre: x_j} y Z
+        con la constante del objetivo.
+        """
+        c, A, b, sentidos = self.arreglos()
+        enteras = self.enteras
+        if np.any(enteras):
+            solucion = ramificacion_acotamiento(c, A, b, sentidos, self.objetivo, self.cotas, enteras,
+                                                **opciones)
+        elif motor == "punto_interior":
+            solucion = punto_interior(c, A, b, sentidos, self.objetivo, self.cotas, **opciones)
+        elif motor == "revisado":
+            solucion = simplex_revisado(c, A, b, sentidos, self.objetivo, self.cotas, **opciones)
+        else:
+            raise ValueError(f"Motor desconocido: {motor}")
+        if solucion["x"] is None or solucion["estado"] in ("no_factible", "no_acotado", "limite_iteraciones"):
+            return dict(solucion, valores=None)
+        x = solucion["x"][:self.num_variables]
+        return dict(solucion, valores=dict(zip(self.variables, x.tolist())),
+                    z=solucion["z"] + self.funcion_objetivo.constante)
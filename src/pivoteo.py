@@ -0,0 +1,114 @@
+import numpy as np
+from scipy.linalg.blas import dger
+from reglas_precio import Bland, elegir_columna
+
+def prueba_razon(columna, ld, tol=1e-8, lex=None, prioridad=None):
+    """
+    Prueba de la razón mínima vectorizada.
+    Devuelve el índice (dentro de `columna`) de la fila que sale, o -1 si
+    ninguna entrada es positiva (dirección no acotada).
+
+    Los empates se rompen con `prioridad` (sale la fila de menor prioridad,
+    p. ej. el índice de su básica para Bland) o en orden lexicográfico de
+    las filas de `lex` divididas por el pivote; sin ninguno sale la primera.
+    """
+    positivas = columna > tol
+    # Incluye el caso sin filas, donde no hay razón que minimizar
+    if not np.any(positivas):
+        return -1
+    razones = np.full(len(columna), np.inf)
+    # Un LD apenas negativo por redondeo es una fila degenerada: razón cero
+    np.divide(np.maximum(ld, 0.0), columna, out=razones, where=positivas)
+    fila = int(np.argmin(razones))
+    if razones[fila] == np.inf:
+        return -1
+    if lex is None and prioridad is None:
+        return fila
+    empatadas = np.flatnonzero(razones <= razones[fila] + 1e-12 * (1.0 + razones[fila]))
+    if len(empatadas) == 1:
+        return fila
+    if prioridad is not None:
+        return int(empatadas[np.argmin(np.asarray(prioridad)[empatadas])])
+    for k in range(lex.shape[1]):
+        valores = lex[empatadas, k] / columna[empatadas]
+        empatadas = empatadas[valores <= valores.min() + 1e-12]
+        if len(empatadas) == 1:
+            break
+    return int(empatadas[0])
+
+def pivotear(tableau, fila_pivote, col_pivote):
+    """
+    Pivoteo de Gauss-Jordan en el lugar: normaliza la fila pivote y elimina
+    la columna pivote del resto con una sola actualización de rango 1.
+    """
+    tableau[fila_pivote] /= tableau[fila_pivote, col_pivote]
+    factores = tableau[:, col_pivote].copy()
+    factores[fila_pivote] = 0.0
+    if tableau.dtype == np.float64 and tableau.flags.c_contiguous:
+        # tableau.T es contiguo en orden Fortran, así BLAS lo actualiza sin copiarlo
+        dger(-1.0, tableau[fila_pivote], factores, a=tableau.T, overwrite_a=1)
+    elif tableau.dtype == np.float64 and tableau.flags.f_contiguous:
+        dger(-1.0, factores, tableau[fila_pivote], a=tableau, overwrite_a=1)
+    else:
+        tableau -= np.outer(factores, tableau[fila_pivote])
+    # La columna pivote queda unitaria exacta, sin residuos de redondeo
+    tableau[:, col_pivote] = 0.0
+    tableau[fila_pivote, col_pivote] = 1.0
+
+class ControlDegeneracion:
+    """
+    Evita que el simplex de tableau se estanque o cicle en modelos degenerados.
+
+    - Los empates de la razón mínima se rompen en orden lexicográfico sobre
+      las columnas de la base inicial (`columnas_lex`, que forman B^-1).
+    - En el primer pivoteo degenerado se activa una perturbación acotada del
+      LD (a lo sumo `escala`·(1 + |b_i|), distinta en cada fila) que solo usa
+      la prueba de la razón: el tableau no se modifica, así que las tablas y
+      la traza muestran los valores exactos.
+    - Tras `umbral` pivoteos degenerados seguidos se pasa a la regla de Bland
+      (menor índice entrante y saliente) hasta el siguiente pivoteo que avanza.
+    """
+
+    def __init__(self, tableau, columnas_lex=None, umbral=None, escala=1e-9, tol=1e-8):
+        self.num_filas = tableau.shape[0] - 1
+        self.columnas_lex = columnas_lex
+        self.umbral = umbral if umbral is not None else max(20, self.num_filas)
+        self.escala = escala
+        self.tol = tol
+        self.perturbacion = None
+        self.degenerados = 0
+        self.bland = False
+        self.regla_bland = Bland()
+
+    def columna(self, regla, tableau):
+        return elegir_columna(self.regla_bland if self.bland else regla, tableau, self.tol)
+
+    def fila(self, tableau, col, base):
+        """Fila saliente (índice dentro de las restricciones) o -1 si no está acotado"""
+        ld = tableau[1:, -1]
+        if self.perturbacion is not None:
+            ld = ld + self.perturbacion
+        if self.bland:
+            return prueba_razon(tableau[1:, col], ld, self.tol, prioridad=base)
+        lex = tableau[1:, self.columnas_lex] if self.columnas_lex is not None else tableau[1:, :-1]
+        return prueba_razon(tableau[1:, col], ld, self.tol, lex=lex)
+
+    def registrar(self, tableau, fila, col):
+        """Se llama antes de pivotear en (fila, col), con fila dentro de las restricciones"""
+        columna = tableau[1:, col]
+        ld = tableau[1:, -1]
+        if max(ld[fila], 0.0) / columna[fila] > self.tol:
+            self.degenerados = 0
+            self.bland = False
+        else:
+            self.degenerados += 1
+            if self.perturbacion is None:
+                pasos = 1.0 + np.arange(self.num_filas) / max(self.num_filas, 1)
+                self.perturbacion = self.escala * (1.0 + np.abs(ld)) * pasos
+            if self.degenerados > self.umbral:
+                self.bland = True
+        if self.perturbacion is not None:
+            # La perturbación sigue las mismas operaciones de fila que el LD
+            paso = self.perturbacion[fila] / columna[fila]
+            self.perturbacion -= columna * paso
+            self.perturbacion[fila] = paso
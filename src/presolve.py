@@ -0,0 +1,224 @@
+import numpy as np
+import scipy.sparse as sp
+
+def _infactible():
+    raise ValueError("El problema no tiene solución factible")
+
+def _actividad(fila, inferior, superior):
+    """Mínimo y máximo de a·x con x dentro de sus cotas"""
+    nz = fila != 0
+    a = fila[nz]
+    bajo = np.where(a > 0, inferior[nz], superior[nz])
+    alto = np.where(a > 0, superior[nz], inferior[nz])
+    return np.sum(a * bajo), np.sum(a * alto)
+
+def presolve(c, A, b, sentidos=None, objetivo="max", cotas=None, estandar=True, tol=1e-9):
+    """
+    Reduce el modelo antes de pivotear: quita filas vacías, duplicadas,
+    singleton y redundantes, variables fijas y columnas dominadas, y cotas
+    superiores que ya implican las restricciones.
+
+    Con `estandar` el modelo reducido queda con x >= 0 (las cotas inferiores
+    se desplazan y las superiores pasan a ser filas <=), listo para
+    simplex_solver o simplex_dos_fases; si no, se devuelven sus cotas.
+    `postsolve` lleva la solución del reducido al modelo original.
+    """
+    if sp.issparse(A):
+        A = A.toarray()
+    c = np.array(c, dtype=float)
+    b = np.array(b, dtype=float)
+    m, n = len(b), len(c)
+    W = np.array(A, dtype=float).reshape(m, n)
+    sentidos = list(sentidos) if sentidos is not None else ["<="] * m
+    costos = c if objetivo == "max" else -c
+    if cotas is None:
+        inferior, superior = np.zeros(n), np.full(n, np.inf)
+    else:
+        inferior, superior = (np.array(v, dtype=float) for v in cotas)
+
+    filas = np.ones(m, dtype=bool)
+    columnas = np.ones(n, dtype=bool)
+    fijos = np.full(n, np.nan)
+    estadisticas = dict.fromkeys(["filas_vacias", "filas_duplicadas", "filas_singleton",
+                                  "filas_redundantes", "variables_fijas",
+                                  "columnas_dominadas", "cotas_redundantes"], 0)
+
+    def quitar_fila(i):
+        filas[i] = False
+        W[i] = 0.0
+
+    def fijar(j, valor):
+        b[:] -= W[:, j] * valor
+        fijos[j] = valor
+        columnas[j] = False
+        W[:, j] = 0.0
+
+    cambio = True
+    while cambio:
+        cambio = False
+        nnz = np.count_nonzero(W, axis=1)
+
+        # Filas vacías: 0 (sentido) b
+        for i in np.flatnonzero(filas & (nnz == 0)):
+            if ((sentidos[i] == "<=" and b[i] < -tol) or (sentidos[i] == ">=" and b[i] > tol)
+                    or (sentidos[i] == "=" and abs(b[i]) > tol)):
+                _infactible()
+            quitar_fila(i)
+            estadisticas["filas_vacias"] += 1
+            cambio = True
+
+        # Filas singleton: a·x_j (sentido) b se vuelve una cota de x_j
+        for i in np.flatnonzero(filas & (nnz == 1)):
+            j = int(np.flatnonzero(W[i])[0])
+            a, valor = W[i, j], b[i] / W[i, j]
+            sube = sentidos[i] == "=" or (sentidos[i] == "<=") == (a > 0)
+            baja = sentidos[i] == "=" or (sentidos[i] == ">=") == (a > 0)
+            if sube:
+                superior[j] = min(superior[j], valor)
+            if baja:
+                inferior[j] = max(inferior[j], valor)
+            if inferior[j] > superior[j] + tol:
+                _infactible()
+            quitar_fila(i)
+            estadisticas["filas_singleton"] += 1
+            cambio = True
+
+        # Variables fijas por sus cotas
+        for j in np.flatnonzero(columnas & (superior - inferior <= tol)):
+            fijar(j, inferior[j])
+            estadisticas["variables_fijas"] += 1
+            cambio = True
+
+        # Columnas dominadas: si mover x_j en la dirección que mejora el objetivo
+        # solo empeora las filas, x_j queda en la cota contraria
+        for j in np.flatnonzero(columnas):
+            col = W[:, j]
+            activas = np.flatnonzero(col)
+            empeora = [sentidos[i] == "=" or (sentidos[i] == "<=") == (col[i] > 0) for i in activas]
+            mejora = [sentidos[i] == "=" or (sentidos[i] == ">=") == (col[i] > 0) for i in activas]
+            if costos[j] <= 0 and not any(mejora) and np.isfinite(inferior[j]):
+                fijar(j, inferior[j])
+            elif costos[j] >= 0 and not any(empeora) and np.isfinite(superior[j]):
+                fijar(j, superior[j])
+            else:
+                continue
+            estadisticas["columnas_dominadas"] += 1
+            cambio = True
+
+        # Filas que las cotas ya cumplen siempre (o que nunca pueden cumplirse)
+        for i in np.flatnonzero(filas):
+            minimo, maximo = _actividad(W[i], inferior, superior)
+            if ((sentidos[i] != ">=" and minimo > b[i] + tol)
+                    or (sentidos[i] != "<=" and maximo < b[i] - tol)):
+                _infactible()
+            if ((sentidos[i] == "<=" and maximo <= b[i] + tol)
+                    or (sentidos[i] == ">=" and minimo >= b[i] - tol)
+                    or (sentidos[i] == "=" and maximo - minimo <= tol)):
+                quitar_fila(i)
+                estadisticas["filas_redundantes"] += 1
+                cambio = True
+
+        # Filas duplicadas (o proporcionales): se intersectan sus intervalos
+        grupos = {}
+        for i in np.flatnonzero(filas):
+            factor = W[i, np.flatnonzero(W[i])[0]]
+            grupos.setdefault(tuple(np.round(W[i] / factor, 9)), []).append((i, factor))
+        for grupo in grupos.values():
+            if len(grupo) == 1:
+                continue
+            bajo, alto = -np.inf, np.inf
+            for i, factor in grupo:
+                valor = b[i] / factor
+                sentido = sentidos[i]
+                if factor < 0 and sentido != "=":
+                    sentido = ">=" if sentido == "<=" else "<="
+                if sentido != ">=":
+                    alto = min(alto, valor)
+                if sentido != "<=":
+                    bajo = max(bajo, valor)
+            if bajo > alto + tol:
+                _infactible()
+            if len(grupo) == 2 and np.isfinite(alto) and np.isfinite(bajo) and alto - bajo > tol:
+                continue
+            (primera, f1), (segunda, f2) = grupo[0], grupo[1]
+            W[primera] /= f1
+            if alto - bajo <= tol:
+                sentidos[primera], b[primera] = "=", alto
+                quitar_fila(segunda)
+            elif np.isfinite(alto) and np.isfinite(bajo):
+                sentidos[primera], b[primera] = "<=", alto
+                W[segunda] /= f2
+                sentidos[segunda], b[segunda] = ">=", bajo
+            else:
+                sentidos[primera], b[primera] = ("<=", alto) if np.isfinite(alto) else (">=", bajo)
+                quitar_fila(segunda)
+            for i, _ in grupo[2:]:
+                quitar_fila(i)
+            estadisticas["filas_duplicadas"] += len(grupo) - 2 + (not filas[segunda])
+            cambio = True
+
+    # Cotas superiores redundantes: alguna fila ya implica una cota más fuerte
+    for j in np.flatnonzero(columnas & np.isfinite(superior)):
+        for i in np.flatnonzero(W[:, j]):
+            a = W[i, j]
+            resto = W[i].copy()
+            resto[j] = 0.0
+            minimo, maximo = _actividad(resto, inferior, superior)
+            if a > 0 and sentidos[i] != ">=":
+                implicada = (b[i] - minimo) / a
+            elif a < 0 and sentidos[i] != "<=":
+                implicada = (b[i] - maximo) / a
+            else:
+                continue
+            if implicada <= superior[j]:
+                superior[j] = np.inf
+                estadisticas["cotas_redundantes"] += 1
+                break
+
+    # Modelo reducido
+    cols = np.flatnonzero(columnas)
+    rows = np.flatnonzero(filas)
+    A_r = W[np.ix_(rows, cols)]
+    b_r = b[rows]
+    sentidos_r = [sentidos[i] for i in rows]
+    inferior_r, superior_r = inferior[cols], superior[cols]
+    desplazamiento = np.zeros(len(cols))
+    cotas_r = (inferior_r, superior_r)
+
+    if estandar:
+        if np.any(np.isinf(inferior_r)):
+            raise ValueError("La forma estándar requiere cotas inferiores finitas")
+        desplazamiento = inferior_r
+        b_r = b_r - A_r @ desplazamiento
+        acotadas = np.flatnonzero(np.isfinite(superior_r))
+        A_r = np.vstack((A_r, np.eye(len(cols))[acotadas]))
+        b_r = np.concatenate((b_r, (superior_r - inferior_r)[acotadas]))
+        sentidos_r += ["<="] * len(acotadas)
+        # Lados derechos no negativos para arrancar el tableau
+        negativas = b_r < 0
+        A_r[negativas] *= -1
+        b_r[negativas] *= -1
+        sentidos_r = [{"<=": ">=", ">=": "<="}.get(s, s) if neg else s
+                      for s, neg in zip(sentidos_r, negativas)]
+        cotas_r = None
+
+    fijas = ~np.isnan(fijos)
+    return {
+        "c": c[cols],
+        "A": A_r,
+        "b": b_r,
+        "sentidos": sentidos_r,
+        "cotas": cotas_r,
+        "columnas": cols,
+        "desplazamiento": desplazamiento,
+        "fijos": fijos,
+        "constante": c[fijas] @ fijos[fijas] + c[cols] @ desplazamiento,
+        "estadisticas": estadisticas,
+    }
+
+def postsolve(modelo, x_reducido):
+    """Valores de las variables originales a partir de la solución del reducido"""
+    x = modelo["fijos"].copy()
+    k = len(modelo["columnas"])
+    x[modelo["columnas"]] = np.asarray(x_reducido, dtype=float)[:k] + modelo["desplazamiento"]
+    return x
@@ -0,0 +1,208 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.linalg import cho_factor, cho_solve, qr
+from simplex_revisado import simplex_revisado
+
+def _forma_estandar(c, A, b, sentidos, objetivo, cotas):
+    """
+    Lleva el modelo a min c_s·z sujeto a A_s z = b_s, z >= 0.
+
+    Cada x_j se escribe como l_j + z (cota inferior finita), u_j - z (solo
+    superior) o z⁺ - z⁻ (libre); una cota superior junto a una inferior agrega
+    la fila z + w = u_j - l_j. Cada fila <= / >= recibe su holgura.
+    Devuelve (c_s, A_s, b_s, T, x0): x = x0 + T z.
+    """
+    m, n = A.shape
+    inferior, superior = cotas
+    signo = -1.0 if objetivo == "max" else 1.0
+
+    T_cols, filas_cota = [], []
+    for j in range(n):
+        if np.isfinite(inferior[j]):
+            T_cols.append((j, 1.0))
+            if np.isfinite(superior[j]):
+                filas_cota.append((len(T_cols) - 1, superior[j] - inferior[j]))
+        elif np.isfinite(superior[j]):
+            T_cols.append((j, -1.0))
+        else:
+            T_cols.extend([(j, 1.0), (j, -1.0)])
+    k = len(T_cols)
+    T = np.zeros((n, k))
+    for col, (j, s) in enumerate(T_cols):
+        T[j, col] = s
+    x0 = np.where(np.isfinite(inferior), inferior, np.where(np.isfinite(superior), superior, 0.0))
+
+    holguras = [i for i, s in enumerate(sentidos) if s != "="]
+    h, q = len(holguras), len(filas_cota)
+    AT = A @ T
+    if sp.issparse(AT):
+        AT = AT.toarray()
+    A_s = np.zeros((m + q, k + h + q))
+    A_s[:m, :k] = AT
+    for col, i in enumerate(holguras):
+        A_s[i, k + col] = 1.0 if sentidos[i] == "<=" else -1.0
+    for fila, (col, valor) in enumerate(filas_cota):
+        A_s[m + fila, col] = 1.0
+        A_s[m + fila, k + h + fila] = 1.0
+    b_s = np.concatenate((b - A @ x0, [valor for _, valor in filas_cota]))
+    c_s = np.zeros(k + h + q)
+    c_s[:k] = signo * (T.T @ c)
+    return c_s, A_s, b_s, T, x0
+
+def _cholesky(M):
+    """Factoriza las ecuaciones normales; regulariza si A no tiene rango completo"""
+    delta = 1e-14 * max(1.0, np.max(np.diag(M)))
+    for _ in range(12):
+        try:
+            return cho_factor(M + delta * np.eye(len(M)), check_finite=False)
+        except np.linalg.LinAlgError:
+            delta *= 100
+    raise np.linalg.LinAlgError("Las ecuaciones normales no son definidas positivas")
+
+def _paso_maximo(v, dv):
+    """Mayor alfa en (0, 1] con v + alfa dv >= 0"""
+    negativos = dv < 0
+    if not np.any(negativos):
+        return 1.0
+    return min(1.0, float(np.min(-v[negativos] / dv[negativos])))
+
+def _mehrotra(c, A, b, max_iteraciones, tol):
+    """
+    Predictor-corrector de Mehrotra para min c·x, A x = b, x >= 0.
+    Devuelve (x, y, s, iteraciones, convergió).
+    """
+    m, n = A.shape
+    # Punto inicial de Mehrotra: mínimos cuadrados corridos al interior
+    fact = _cholesky(A @ A.T)
+    x = A.T @ cho_solve(fact, b)
+    y = cho_solve(fact, A @ c)
+    s = c - A.T @ y
+    x += max(-1.5 * np.min(x, initial=0.0), 0.0)
+    s += max(-1.5 * np.min(s, initial=0.0), 0.0)
+    xs = x @ s
+    x += 0.5 * xs / max(np.sum(s), 1e-12) + (xs == 0)
+    s += 0.5 * xs / max(np.sum(x), 1e-12) + (xs == 0)
+
+    norma_b, norma_c = 1.0 + np.linalg.norm(b), 1.0 + np.linalg.norm(c)
+    for iteracion in range(max_iteraciones):
+        rp = b - A @ x
+        rd = c - A.T @ y - s
+        mu = x @ s / n
+        # Brecha por complementariedad: c·x - b·y se estanca cuando A D A^T queda mal condicionada
+        brecha = x @ s / (1.0 + abs(c @ x))
+        if (np.linalg.norm(rp) / norma_b < tol and np.linalg.norm(rd) / norma_c < tol
+                and brecha < tol):
+            return x, y, s, iteracion, True
+        if not (np.all(np.isfinite(x)) and np.max(x) < 1e12 and np.max(np.abs(y)) < 1e12):
+            break
+
+        d = x / s
+        fact = _cholesky((A * d) @ A.T)
+
+        def direccion(rc):
+            # S dx + X ds = rc, A dx = rp, A^T dy + ds = rd
+            dy = cho_solve(fact, rp - A @ (rc / s) + A @ (d * rd))
+            ds = rd - A.T @ dy
+            return (rc - x * ds) / s, dy, ds
+
+        # Predictor (afín) y corrector con centrado sigma = (mu_af / mu)^3
+        dx_af, dy_af, ds_af = direccion(-x * s)
+        alfa_p, alfa_d = _paso_maximo(x, dx_af), _paso_maximo(s, ds_af)
+        mu_af = (x + alfa_p * dx_af) @ (s + alfa_d * ds_af) / n
+        sigma = (mu_af / mu) ** 3
+        dx, dy, ds = direccion(-x * s - dx_af * ds_af + sigma * mu)
+
+        alfa_p = min(1.0, 0.995 * _paso_maximo(x, dx))
+        alfa_d = min(1.0, 0.995 * _paso_maximo(s, ds))
+        x = x + alfa_p * dx
+        y = y + alfa_d * dy
+        s = s + alfa_d * ds
+    return x, y, s, max_iteraciones, False
+
+def _base_crossover(A, sentidos, x, holguras, cotas, costos_reducidos):
+    """
+    Base de m columnas (estructurales y holguras del simplex revisado) para
+    arrancar el crossover: las variables más lejos de sus cotas, relativas a
+    su costo reducido, van primero, y un QR con pivoteo sobre las columnas
+    ponderadas elige un conjunto linealmente independiente.
+    """
+    m, n = A.shape
+    inferior, superior = cotas
+    distancia = np.concatenate((np.minimum(x - inferior, superior - x), holguras))
+    distancia[n:][np.array([s == "=" for s in sentidos], dtype=bool)] = 0.0
+    distancia = np.maximum(np.nan_to_num(distancia, posinf=1e12), 0.0)
+    puntaje = distancia / (distancia + np.abs(costos_reducidos) + 1e-12)
+
+    sigma = np.array([-1.0 if s == ">=" else 1.0 for s in sentidos])
+    A_denso = A.toarray() if sp.issparse(A) else A
+    # El término pequeño deja que las holguras completen la base si hace falta
+    columnas = np.hstack((A_denso, np.diag(sigma))) * (puntaje + 1e-8)
+    _, pivotes = qr(columnas, mode="r", pivoting=True)
+    return np.sort(pivotes[:m])
+
+def punto_interior(c, A, b, sentidos=None, objetivo="max", cotas=None, max_iteraciones=100,
+                   tol=1e-8, crossover=True, regla="dantzig"):
+    """
+    Método de punto interior (predictor-corrector de Mehrotra) para
+    optimizar c·x sujeto a A x (<=, >=, =) b y cotas en x.
+
+    Cada iteración factoriza por Cholesky las ecuaciones normales
+    A D A^T (D = X S^-1) y la reutiliza para el predictor y el corrector,
+    así que el costo no depende de cuántos vértices recorrería el simplex.
+
+    Con `crossover` el punto interior se lleva a una solución básica: se
+    elige una base a partir de las variables lejos de sus cotas y se
+    termina con simplex_revisado en caliente desde esa base, de modo que el
+    resultado tiene el mismo formato (x, z, duales, base); `regla` es la
+    regla de precio de esos pivotes. Si el método no
+    converge (p. ej. modelo no factible o no acotado) el simplex resuelve
+    desde cero y da el diagnóstico.
+    """
+    c = np.asarray(c, dtype=float)
+    if not sp.issparse(A):
+        A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    m, n = A.shape
+    if sentidos is None:
+        sentidos = ["<="] * m
+    if cotas is None:
+        cotas = (np.zeros(n), np.full(n, np.inf))
+    cotas = (np.asarray(cotas[0], dtype=float), np.asarray(cotas[1], dtype=float))
+    if np.any(cotas[0] > cotas[1]):
+        solucion = simplex_revisado(c, A, b, sentidos, objetivo, cotas, regla=regla)
+        return dict(solucion, metodo="punto_interior", iteraciones=0, iteraciones_ipm=0,
+                    pivotes_crossover=solucion["iteraciones"])
+
+    c_s, A_s, b_s, T, x0 = _forma_estandar(c, A, b, sentidos, objetivo, cotas)
+    z, y, _, iteraciones, convergio = _mehrotra(c_s, A_s, b_s, max_iteraciones, tol)
+
+    if not convergio:
+        solucion = simplex_revisado(c, A, b, sentidos, objetivo, cotas, regla=regla)
+        return dict(solucion, metodo="punto_interior", iteraciones=iteraciones,
+                    iteraciones_ipm=iteraciones, pivotes_crossover=solucion["iteraciones"])
+
+    x = x0 + T @ z[:T.shape[1]]
+    holguras = np.array([-1.0 if s == ">=" else 1.0 for s in sentidos]) * (b - A @ x)
+    # Duales de las filas originales con el signo del objetivo pedido
+    duales = -y[:m] if objetivo == "max" else y[:m]
+
+    if not crossover:
+        return {
+            "estado": "optimo",
+            "x": np.concatenate((x, holguras)),
+            "z": float(c @ x),
+            "duales": duales,
+            "base": None,
+            "iteraciones": iteraciones,
+            "metodo": "punto_interior",
+            "iteraciones_ipm": iteraciones,
+            "pivotes_crossover": 0,
+        }
+
+    signo = 1.0 if objetivo == "max" else -1.0
+    reducidos = np.concatenate((signo * (c - A.T @ duales), duales))
+    base = _base_crossover(A, sentidos, x, holguras, cotas, reducidos)
+    solucion = simplex_revisado(c, A, b, sentidos, objetivo, cotas, regla=regla,
+                                base_inicial={"base": base, "x": np.concatenate((x, holguras))})
+    return dict(solucion, metodo="punto_interior", iteraciones=iteraciones,
+                iteraciones_ipm=iteraciones, pivotes_crossover=solucion["iteraciones"])
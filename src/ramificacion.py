@@ -0,0 +1,163 @@
+import heapq
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+from simplex_revisado import simplex_revisado
+
+# Modelo compartido por los procesos del pool (se carga una vez por proceso)
+_MODELO = None
+
+def _iniciar_proceso(modelo):
+    global _MODELO
+    _MODELO = modelo
+
+def _relajacion(modelo, inferior, superior, padre):
+    """LP de un nodo: las cotas de la rama cambian y se arranca en caliente desde la base del padre"""
+    c, A, b, sentidos, objetivo, regla = modelo
+    return simplex_revisado(c, A, b, sentidos, objetivo, (inferior, superior), base_inicial=padre,
+                            regla=regla)
+
+def _relajacion_en_proceso(args):
+    return _relajacion(_MODELO, *args)
+
+def _fraccionaria(x, enteras, tol):
+    """Variable entera más fraccionaria de x, o -1 si todas son enteras"""
+    fraccion = np.abs(x - np.round(x))
+    fraccion[~enteras] = 0.0
+    j = int(np.argmax(fraccion))
+    return j if fraccion[j] > tol else -1
+
+def ramificacion_acotamiento(c, A, b, sentidos=None, objetivo="max", cotas=None, enteras=None,
+                             gap=1e-6, max_nodos=10000, tiempo_limite=None, workers=None,
+                             regla="dantzig", tol_entera=1e-6):
+    """
+    Ramificación y acotamiento para programación lineal entera mixta: las
+    variables con `enteras` True deben tomar valores enteros.
+
+    Cada nodo es la relajación lineal con cotas más ajustadas, resuelta con
+    simplex_revisado en caliente desde la solución del padre: cambiar una cota
+    deja la base dual factible, así que el simplex dual suele necesitar pocos
+    pivotes. Se ramifica en la variable más fraccionaria.
+
+    Los nodos pendientes esperan en un heap ordenado por cota (mejor cota
+    primero); después de ramificar se baja en profundidad por el hijo del lado
+    del redondeo, para encontrar pronto una solución entera que pode el árbol.
+    Termina cuando la brecha relativa entre la mejor cota y la incumbente es
+    menor que `gap`.
+
+    Con `workers` los nodos se evalúan de a `workers` en un pool de procesos
+    (sin la bajada en profundidad).
+
+    Devuelve un dict como el de simplex_revisado (x con las holguras, z, base)
+    más "cota", "gap", "nodos" e "iteraciones" (pivotes de todos los nodos);
+    estado es "optimo", "no_factible", "no_acotado", "limite_nodos" o
+    "limite_tiempo" (con x de la mejor incumbente, o None si no hay).
+    """
+    c = np.asarray(c, dtype=float)
+    if not sp.issparse(A):
+        A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    m, n = A.shape
+    if cotas is None:
+        cotas = (np.zeros(n), np.full(n, np.inf))
+    enteras = np.zeros(n, dtype=bool) if enteras is None else np.asarray(enteras, dtype=bool)
+    # Las cotas de una variable entera se pueden redondear hacia adentro
+    inferior = np.where(enteras, np.ceil(np.asarray(cotas[0], dtype=float) - tol_entera), cotas[0])
+    superior = np.where(enteras, np.floor(np.asarray(cotas[1], dtype=float) + tol_entera), cotas[1])
+    signo = 1.0 if objetivo == "max" else -1.0
+    modelo = (c, A, b, sentidos, objetivo, regla)
+    fin = None if tiempo_limite is None else time.perf_counter() + tiempo_limite
+
+    mejor, valor_mejor = None, -np.inf
+    pendientes = []
+    contador = 0
+    nodos = iteraciones = 0
+    estado = "optimo"
+
+    def brecha(cota):
+        return (cota - valor_mejor) / max(1.0, abs(valor_mejor))
+
+    def procesar(nodo, solucion):
+        """Poda o ramifica un nodo evaluado; devuelve el hijo para bajar en profundidad (o None)"""
+        nonlocal mejor, valor_mejor, contador, iteraciones
+        iteraciones += solucion["iteraciones"]
+        if solucion["estado"] != "optimo":
+            return None
+        cota = signo * solucion["z"]
+        if mejor is not None and brecha(cota) <= gap:
+            return None
+        x = solucion["x"][:n]
+        j = _fraccionaria(x, enteras, tol_entera)
+        if j < 0:
+            mejor, valor_mejor = solucion, cota
+            return None
+        inf_j, sup_j = nodo[0], nodo[1]
+        abajo = (inf_j, sup_j.copy(), solucion)
+        abajo[1][j] = math.floor(x[j])
+        arriba = (inf_j.copy(), sup_j, solucion)
+        arriba[0][j] = math.ceil(x[j])
+        hijos = [abajo, arriba] if x[j] - math.floor(x[j]) < 0.5 else [arriba, abajo]
+        for hijo in hijos[1:] if workers is None else hijos:
+            heapq.heappush(pendientes, (-cota, contador, hijo))
+            contador += 1
+        return hijos[0] if workers is None else None
+
+    raiz = (inferior, superior, None)
+    solucion = _relajacion(modelo, inferior, superior, None)
+    nodos = 1
+    relajacion = solucion
+    if solucion["estado"] in ("no_factible", "no_acotado", "limite_iteraciones"):
+        return dict(solucion, cota=np.nan, gap=np.nan, nodos=1, relajacion=solucion["z"])
+    siguiente = procesar(raiz, solucion)
+
+    ejecutor = None if workers is None else ProcessPoolExecutor(workers, initializer=_iniciar_proceso,
+                                                               initargs=(modelo,))
+    try:
+        while siguiente is not None or pendientes:
+            if nodos >= max_nodos:
+                estado = "limite_nodos"
+                break
+            if fin is not None and time.perf_counter() > fin:
+                estado = "limite_tiempo"
+                break
+            if siguiente is not None:
+                # Bajada en profundidad por el hijo del lado del redondeo
+                nodo, siguiente = siguiente, None
+                nodos += 1
+                siguiente = procesar(nodo, _relajacion(modelo, *nodo))
+                continue
+            if mejor is not None and brecha(-pendientes[0][0]) <= gap:
+                break
+            if ejecutor is None:
+                _, _, nodo = heapq.heappop(pendientes)
+                nodos += 1
+                siguiente = procesar(nodo, _relajacion(modelo, *nodo))
+                continue
+            lote = [heapq.heappop(pendientes)[2] for _ in range(min(workers, len(pendientes)))]
+            lote = [nodo for nodo in lote if mejor is None or brecha(signo * nodo[2]["z"]) > gap]
+            nodos += len(lote)
+            soluciones = ejecutor.map(_relajacion_en_proceso, lote)
+            for nodo, sol in zip(lote, soluciones):
+                procesar(nodo, sol)
+    finally:
+        if ejecutor is not None:
+            ejecutor.shutdown()
+
+    # La cota global es la mejor entre la incumbente y los nodos sin explorar
+    abiertas = [-clave for clave, _, _ in pendientes]
+    if siguiente is not None:
+        abiertas.append(signo * siguiente[2]["z"])
+    cota = max(abiertas + [valor_mejor])
+    if mejor is None:
+        if estado == "optimo":
+            estado = "no_factible"
+        return dict(relajacion, estado=estado, x=None, z=np.nan, cota=signo * cota, gap=np.inf,
+                    nodos=nodos, iteraciones=iteraciones, relajacion=relajacion["z"])
+
+    x = mejor["x"].copy()
+    x[:n][enteras] = np.round(x[:n][enteras]) + 0.0
+    return dict(mejor, estado=estado, x=x, z=float(c @ x[:n]), cota=signo * cota, gap=max(brecha(cota), 0.0),
+                nodos=nodos, iteraciones=iteraciones, relajacion=relajacion["z"])
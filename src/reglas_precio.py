@@ -0,0 +1,189 @@
+import numpy as np
+
+class ReglaPrecio:
+    """
+    Regla de precio del simplex primal: decide qué variable entra a la base.
+
+    El motor calcula los costos reducidos de las columnas que entrega
+    `segmentos` (None = todas) y la regla elige entre las que mejoran el
+    objetivo. Después de cada pivoteo el motor llama a `actualizar` con la
+    fila pivote (y, si la regla lo pide, el producto a_j·B^-T d_q) para que
+    las reglas con pesos los mantengan sin recalcularlos desde cero.
+    """
+
+    nombre = ""
+    usa_fila_pivote = False
+    usa_producto = False
+
+    def iniciar(self, normas):
+        """Recibe ||B^-1 a_j||^2 de cada columna en la base inicial"""
+        self.num_columnas = len(normas)
+
+    def segmentos(self, num_columnas):
+        yield None
+
+    def criterio(self, puntajes, columnas):
+        return puntajes
+
+    def elegir(self, puntajes, columnas):
+        """Columna entrante (índice global) o -1 si ninguna mejora el objetivo"""
+        if not np.any(puntajes):
+            return -1
+        k = int(np.argmax(self.criterio(puntajes, columnas)))
+        return k if columnas is None else int(columnas[k])
+
+    def actualizar(self, entrante, saliente, alfa_fila, alfa_pivote, producto=None, gamma=None):
+        pass
+
+class Dantzig(ReglaPrecio):
+    """Entra la variable con mayor |d_j|"""
+
+    nombre = "dantzig"
+
+class Devex(ReglaPrecio):
+    """Aproximación de Forrest-Goldfarb a la arista más empinada con pesos de referencia"""
+
+    nombre = "devex"
+    usa_fila_pivote = True
+
+    def iniciar(self, normas):
+        super().iniciar(normas)
+        self.pesos = np.ones(len(normas))
+
+    def criterio(self, puntajes, columnas):
+        pesos = self.pesos if columnas is None else self.pesos[columnas]
+        return puntajes ** 2 / pesos
+
+    def actualizar(self, entrante, saliente, alfa_fila, alfa_pivote, producto=None, gamma=None):
+        razon = alfa_fila / alfa_pivote
+        peso_q = self.pesos[entrante]
+        self.pesos = np.maximum(self.pesos, razon ** 2 * peso_q)
+        if saliente >= 0:
+            self.pesos[saliente] = max(peso_q / alfa_pivote ** 2, 1.0)
+
+class SteepestEdge(ReglaPrecio):
+    """Arista más empinada: d_j^2 / (1 + ||B^-1 a_j||^2) con la actualización de Goldfarb-Reid"""
+
+    nombre = "steepest_edge"
+    usa_fila_pivote = True
+    usa_producto = True
+
+    def iniciar(self, normas):
+        super().iniciar(normas)
+        self.pesos = 1.0 + np.asarray(normas, dtype=float)
+
+    def criterio(self, puntajes, columnas):
+        pesos = self.pesos if columnas is None else self.pesos[columnas]
+        return puntajes ** 2 / pesos
+
+    def actualizar(self, entrante, saliente, alfa_fila, alfa_pivote, producto=None, gamma=None):
+        razon = alfa_fila / alfa_pivote
+        nuevos = self.pesos - 2.0 * razon * producto + razon ** 2 * gamma
+        self.pesos = np.maximum(nuevos, 1.0 + razon ** 2)
+        if saliente >= 0:
+            self.pesos[saliente] = max(gamma / alfa_pivote ** 2, 1.0)
+
+class PrecioParcial(ReglaPrecio):
+    """
+    Precio parcial: solo revisa un bloque de columnas por iteración.
+
+    Se queda en el bloque mientras tenga candidatas y pasa al siguiente (en
+    forma circular) cuando se agota; declara óptimo solo tras revisar todos.
+    """
+
+    nombre = "parcial"
+
+    def __init__(self, tam_bloque=None):
+        self.tam_bloque = tam_bloque
+        self.actual = 0
+
+    def segmentos(self, num_columnas):
+        tam = self.tam_bloque or max(50, num_columnas // 8)
+        num_bloques = -(-num_columnas // tam)
+        for k in range(num_bloques):
+            self.actual = (self.actual + (k > 0)) % num_bloques
+            inicio = self.actual * tam
+            yield np.arange(inicio, min(inicio + tam, num_columnas))
+
+class PrecioMultiple(ReglaPrecio):
+    """
+    Precio múltiple: un precio completo elige varias candidatas y las
+    iteraciones siguientes solo recalculan esas hasta que ninguna mejora.
+    """
+
+    nombre = "multiple"
+
+    def __init__(self, num_candidatas=8):
+        self.num_candidatas = num_candidatas
+        self.lista = np.array([], dtype=int)
+
+    def segmentos(self, num_columnas):
+        if len(self.lista):
+            yield self.lista
+        yield None
+
+    def elegir(self, puntajes, columnas):
+        if columnas is None:
+            mejores = np.argsort(-puntajes)[:self.num_candidatas]
+            self.lista = mejores[puntajes[mejores] > 0]
+        else:
+            self.lista = columnas[puntajes > 0]
+            puntajes = puntajes[puntajes > 0]
+        if not len(self.lista):
+            return -1
+        k = int(np.argmax(puntajes if columnas is not None else puntajes[self.lista]))
+        entrante = int(self.lista[k])
+        self.lista = np.delete(self.lista, k)
+        return entrante
+
+class Bland(ReglaPrecio):
+    """Regla de Bland: entra la primera columna que mejora; nunca cicla, pero avanza lento"""
+
+    nombre = "bland"
+
+    def elegir(self, puntajes, columnas):
+        candidatas = np.flatnonzero(puntajes)
+        if not len(candidatas):
+            return -1
+        return int(candidatas[0]) if columnas is None else int(columnas[candidatas[0]])
+
+REGLAS = {
+    "dantzig": Dantzig,
+    "devex": Devex,
+    "steepest_edge": SteepestEdge,
+    "parcial": PrecioParcial,
+    "multiple": PrecioMultiple,
+    "bland": Bland,
+}
+
+def crear_regla(regla):
+    """Acepta el nombre de una regla o una instancia de ReglaPrecio"""
+    if isinstance(regla, ReglaPrecio):
+        return regla
+    if regla not in REGLAS:
+        raise ValueError(f"Regla de precio desconocida: {regla}")
+    return REGLAS[regla]()
+
+def elegir_columna(regla, tableau, tol=1e-8):
+    """Columna entrante del tableau según la regla (-1 si la fila Z ya es óptima)"""
+    z = tableau[0, :-1]
+    for columnas in regla.segmentos(len(z)):
+        d = -z if columnas is None else -z[columnas]
+        puntajes = np.where(d > tol, d, 0.0)
+        entrante = regla.elegir(puntajes, columnas)
+        if entrante >= 0:
+            return entrante
+    return -1
+
+def actualizar_tableau(regla, tableau, fila_pivote, col_pivote, saliente):
+    """Actualiza los pesos de la regla con el tableau antes del pivoteo"""
+    if not regla.usa_fila_pivote:
+        return
+    alfa_fila = tableau[fila_pivote, :-1].copy()
+    producto = gamma = None
+    if regla.usa_producto:
+        # En el tableau B^-1 a_j está explícito: a_j·B^-T d_q = (B^-1 a_j)·d_q
+        columna_q = tableau[1:, col_pivote]
+        producto = tableau[1:, :-1].T @ columna_q
+        gamma = 1.0 + columna_q @ columna_q
+    regla.actualizar(col_pivote, saliente, alfa_fila, alfa_fila[col_pivote], producto, gamma)
@@ -0,0 +1,324 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.linalg import lu_factor, lu_solve
+from pivoteo import prueba_razon, pivotear
+from simplex_revisado import simplex_revisado
+
+def _modelo_estandar(A, sentidos, cotas):
+    """Columnas [A | diag(sigma)] y cotas de estructurales y holguras, como en simplex_revisado"""
+    m, n = A.shape
+    sigma = np.array([-1.0 if s == ">=" else 1.0 for s in sentidos])
+    columnas = np.hstack((A, np.diag(sigma)))
+    if cotas is None:
+        cotas = (np.zeros(n), np.full(n, np.inf))
+    inferior = np.concatenate((np.asarray(cotas[0], dtype=float), np.zeros(m)))
+    superior = np.concatenate((np.asarray(cotas[1], dtype=float), np.full(m, np.inf)))
+    superior[n:][np.array([s == "=" for s in sentidos], dtype=bool)] = 0.0
+    return columnas, inferior, superior
+
+def _base_estandar(base, n, m):
+    """Base sobre [A | holguras]: una artificial o un -1 se cambian por la holgura de su fila"""
+    base = np.array(base, dtype=int)
+    base = np.where(base >= n + m, base - m, base)
+    base = np.where(base < 0, n + np.arange(m), base)
+    if len(base) != m or len(set(base.tolist())) != m:
+        raise ValueError("La base debe tener una columna distinta por restricción")
+    return base
+
+def _margenes(valores, paso, inferior, superior, tol):
+    """Cuánto puede bajar y subir t sin que valores + t·paso salga de [inferior, superior]"""
+    arriba, abajo = superior - valores, valores - inferior
+    sube, baja = paso > tol, paso < -tol
+    aumento = min(np.min(arriba[sube] / paso[sube], initial=np.inf),
+                  np.min(abajo[baja] / -paso[baja], initial=np.inf))
+    disminucion = min(np.min(abajo[sube] / paso[sube], initial=np.inf),
+                      np.min(arriba[baja] / -paso[baja], initial=np.inf))
+    return max(disminucion, 0.0), max(aumento, 0.0)
+
+def sensibilidad(c, A, b, base, sentidos=None, objetivo="max", cotas=None, x=None, tol=1e-9):
+    """
+    Análisis de sensibilidad de una solución óptima a partir de su base.
+
+    `base` es la columna básica de cada fila sobre [A | holguras] (la de
+    TrazaSimplex o la de simplex_revisado; -1 o una artificial se cambian por
+    la holgura de la fila). Con `x` (n + m valores) las no básicas quedan
+    donde las dejó el solver, p. ej. en su cota superior; si no, en su cota
+    finita. Solo se factoriza B una vez: no hace falta pivotear.
+
+    Devuelve un dict con x, z, "duales" (precio sombra de cada fila: cambio
+    de Z por unidad de b_i), "costos_reducidos" de las estructurales y, para
+    cada c_j y b_i, la disminución y el aumento permitidos sin que la base
+    deje de ser óptima (c) o factible (b): "c_disminucion", "c_aumento",
+    "b_disminucion", "b_aumento" (np.inf si no hay límite).
+    """
+    c = np.asarray(c, dtype=float)
+    A = A.toarray() if sp.issparse(A) else np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    m, n = A.shape
+    if sentidos is None:
+        sentidos = ["<="] * m
+    columnas, inferior, superior = _modelo_estandar(A, sentidos, cotas)
+
+    base = _base_estandar(base, n, m)
+    es_basica = np.zeros(n + m, dtype=bool)
+    es_basica[base] = True
+    no_basicas = np.flatnonzero(~es_basica)
+
+    valores = np.where(np.isfinite(inferior), inferior, np.where(np.isfinite(superior), superior, 0.0))
+    if x is not None:
+        valores[no_basicas] = np.asarray(x, dtype=float)[:n + m][no_basicas]
+    lu = lu_factor(columnas[:, base], check_finite=False)
+    if np.any(np.abs(np.diag(lu[0])) < tol):
+        raise ValueError("La matriz de la base es singular")
+    B_inv = lu_solve(lu, np.eye(m))
+    valores[base] = B_inv @ (b - columnas[:, no_basicas] @ valores[no_basicas])
+
+    # Internamente se maximiza signo·c, como en simplex_revisado
+    signo = 1.0 if objetivo == "max" else -1.0
+    costos = np.zeros(n + m)
+    costos[:n] = signo * c
+    y = B_inv.T @ costos[base]
+    d = costos - columnas.T @ y
+    d[base] = 0.0
+    alfa = B_inv @ columnas
+
+    # Estado de cada no básica: fija, libre, en la cota superior o en la inferior
+    fija = inferior == superior
+    libre = ~np.isfinite(inferior) & ~np.isfinite(superior)
+    en_superior = ~fija & np.isfinite(superior) & (np.abs(valores - superior) <= tol * (1 + np.abs(superior)))
+    en_inferior = ~fija & ~libre & ~en_superior
+
+    c_disminucion, c_aumento = np.full(n, np.inf), np.full(n, np.inf)
+    for j in range(n):
+        if es_basica[j]:
+            # d_k(t) = d_k - t·alfa_rk debe conservar su signo en cada no básica k
+            fila = alfa[int(np.flatnonzero(base == j)[0])]
+            holgura = np.where(en_superior, d, -d)[no_basicas]
+            direccion = np.where(en_superior, -fila, fila)[no_basicas]
+            cuenta = en_inferior[no_basicas] | en_superior[no_basicas]
+            baja = cuenta & (direccion > tol)
+            sube = cuenta & (direccion < -tol)
+            c_disminucion[j] = np.min(holgura[baja] / direccion[baja], initial=np.inf)
+            c_aumento[j] = np.min(holgura[sube] / -direccion[sube], initial=np.inf)
+            if np.any(libre[no_basicas] & (np.abs(fila[no_basicas]) > tol)):
+                c_disminucion[j] = c_aumento[j] = 0.0
+        elif en_inferior[j]:
+            c_aumento[j] = -d[j]
+        elif en_superior[j]:
+            c_disminucion[j] = d[j]
+        elif libre[j]:
+            c_disminucion[j] = c_aumento[j] = 0.0
+    c_disminucion, c_aumento = np.maximum(c_disminucion, 0.0), np.maximum(c_aumento, 0.0)
+    if objetivo != "max":
+        # Subir el costo interno -c_j es bajar c_j
+        c_disminucion, c_aumento = c_aumento, c_disminucion
+
+    b_disminucion, b_aumento = np.empty(m), np.empty(m)
+    for i in range(m):
+        b_disminucion[i], b_aumento[i] = _margenes(valores[base], B_inv[:, i], inferior[base],
+                                                   superior[base], tol)
+
+    duales, reducidos = signo * y, signo * d[:n]
+    return {
+        "x": valores,
+        "z": float(c @ valores[:n]),
+        "duales": np.where(np.abs(duales) > tol, duales, 0.0),
+        "costos_reducidos": np.where(np.abs(reducidos) > tol, reducidos, 0.0),
+        "c_disminucion": c_disminucion,
+        "c_aumento": c_aumento,
+        "b_disminucion": b_disminucion,
+        "b_aumento": b_aumento,
+        "base": base,
+    }
+
+def base_de_punto(A, b, x, sentidos=None, cotas=None, tol=1e-7):
+    """
+    Base sobre [A | holguras] implícita en un vértice x (n valores) del
+    modelo, por ejemplo el que devuelve postsolve: las columnas que no están
+    en una cota son básicas y se completa hasta m columnas independientes,
+    primero con holguras. Devuelve (base, valores de las n + m columnas).
+    """
+    A = A.toarray() if sp.issparse(A) else np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    m, n = A.shape
+    if sentidos is None:
+        sentidos = ["<="] * m
+    columnas, inferior, superior = _modelo_estandar(A, sentidos, cotas)
+    x = np.asarray(x, dtype=float)[:n]
+    sigma = np.diag(columnas[:, n:])
+    valores = np.concatenate((x, (b - A @ x) / sigma))
+
+    escala = tol * (1 + np.abs(valores))
+    en_cota = (np.abs(valores - inferior) <= escala) | (np.abs(valores - superior) <= escala)
+    candidatas = np.concatenate((np.flatnonzero(~en_cota),
+                                 n + np.flatnonzero(en_cota[n:]), np.flatnonzero(en_cota[:n])))
+    base = []
+    for k, j in enumerate(candidatas):
+        if len(base) == m:
+            break
+        if np.linalg.matrix_rank(columnas[:, base + [j]]) == len(base) + 1:
+            base.append(int(j))
+        elif k < np.count_nonzero(~en_cota):
+            raise ValueError("El punto no es un vértice del modelo")
+    return np.array(base, dtype=int), valores
+
+def sensibilidad_de_punto(c, A, b, x, sentidos=None, objetivo="max", cotas=None, tol=1e-9):
+    """
+    Sensibilidad del modelo original a partir de un óptimo x sin base
+    conocida (el de un modelo reducido por presolve, tras postsolve). La
+    base de base_de_punto arranca simplex_revisado en caliente, que solo
+    pivotea si al completarla quedó una base degenerada no óptima.
+    """
+    base, valores = base_de_punto(A, b, x, sentidos, cotas)
+    solucion = simplex_revisado(c, A, b, sentidos, objetivo, cotas, escalar=False,
+                                base_inicial={"base": base, "x": valores})
+    if solucion["estado"] != "optimo":
+        raise ValueError(f"El modelo original no tiene óptimo ({solucion['estado']})")
+    return sensibilidad(c, A, b, solucion["base"], sentidos, objetivo, cotas, solucion["x"], tol)
+
+def lineas_sensibilidad(reporte, variables, c, b):
+    """Texto del análisis de sensibilidad para las pantallas"""
+    def rango(valor, disminucion, aumento):
+        desde = "-∞" if np.isinf(disminucion) else f"{valor - disminucion:.3f}"
+        hasta = "∞" if np.isinf(aumento) else f"{valor + aumento:.3f}"
+        return f"[{desde}, {hasta}]"
+
+    lineas = ["Variables (valor, costo reducido, rango de c_j con la misma base óptima):"]
+    for j, var in enumerate(variables):
+        lineas.append(f"  {var} = {reporte['x'][j]:.3f}; costo reducido {reporte['costos_reducidos'][j]:.3f}; "
+                      f"c = {c[j]:g} ∈ {rango(c[j], reporte['c_disminucion'][j], reporte['c_aumento'][j])}")
+    lineas.append("Restricciones (precio sombra, rango de b_i con la misma base factible):")
+    for i, b_i in enumerate(b):
+        lineas.append(f"  R{i+1}: precio sombra {reporte['duales'][i]:.3f}; "
+                      f"b = {b_i:g} ∈ {rango(b_i, reporte['b_disminucion'][i], reporte['b_aumento'][i])}")
+    return lineas
+
+def parametrico(c, A, b, direccion, parametro="b", sentidos=None, objetivo="max", theta_max=1.0,
+                base=None, max_pivotes=None, tol=1e-9):
+    """
+    Programación paramétrica: optimiza con b + θ·direccion (parametro="b") o
+    con c + θ·direccion (parametro="c") para θ entre 0 y `theta_max`.
+
+    Parte de la base óptima en θ = 0 (`base`, o la de simplex_revisado si no
+    se da) y recorre los puntos de quiebre: en cada uno sale la básica que se
+    vuelve negativa con un pivote dual (b) o entra la no básica cuyo costo
+    reducido cambia de signo con un pivote primal (c). Z(θ) es lineal entre
+    quiebres (cóncava en b y convexa en c al maximizar).
+
+    Devuelve {"segmentos", "estado", "pivotes"}: cada segmento tiene "desde",
+    "hasta", "z_desde", "z_hasta", "pendiente", "base" y "x" (en "desde").
+    estado es "completo", o "no_factible" / "no_acotado" si el modelo deja
+    de tener óptimo en el último "hasta".
+    """
+    if parametro not in ("b", "c"):
+        raise ValueError("El parámetro debe ser \"b\" o \"c\"")
+    c = np.asarray(c, dtype=float)
+    A = A.toarray() if sp.issparse(A) else np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    direccion = np.asarray(direccion, dtype=float)
+    m, n = A.shape
+    if sentidos is None:
+        sentidos = ["<="] * m
+    if base is None:
+        solucion = simplex_revisado(c, A, b, sentidos, objetivo, escalar=False)
+        if solucion["estado"] != "optimo":
+            raise ValueError(f"El modelo en θ = 0 no tiene óptimo ({solucion['estado']})")
+        base = solucion["base"]
+    base = _base_estandar(base, n, m)
+    columnas, _, superior = _modelo_estandar(A, sentidos, None)
+    fijas = superior == 0.0
+    N = n + m
+    if max_pivotes is None:
+        max_pivotes = 50 * N
+
+    # Tableau [B^-1 columnas | B^-1 d_b | B^-1 b] con la fila Z arriba y la
+    # fila Z de la dirección de costos abajo; los pivotes actualizan todo
+    signo = 1.0 if objetivo == "max" else -1.0
+    costos = np.zeros(N)
+    costos[:n] = signo * c
+    costos_d = np.zeros(N)
+    if parametro == "c":
+        costos_d[:n] = signo * direccion
+    B_inv = np.linalg.inv(columnas[:, base])
+    tableau = np.zeros((m + 2, N + 2))
+    tableau[1:m + 1, :N] = B_inv @ columnas
+    tableau[1:m + 1, N] = B_inv @ direccion if parametro == "b" else 0.0
+    tableau[1:m + 1, -1] = B_inv @ b
+    for fila, cst in ((0, costos), (m + 1, costos_d)):
+        y = B_inv.T @ cst[base]
+        tableau[fila, :N] = y @ columnas - cst
+        tableau[fila, N] = y @ direccion if parametro == "b" else 0.0
+        tableau[fila, -1] = y @ b
+    if np.any(tableau[1:m + 1, -1] < -1e-7) or np.any(tableau[0, :N][~fijas] < -1e-7):
+        raise ValueError("La base inicial no es óptima en θ = 0")
+
+    segmentos, estado, pivotes, theta = [], "completo", 0, 0.0
+    while True:
+        ld, paso = tableau[1:m + 1, -1], tableau[1:m + 1, N]
+        no_basicas = np.ones(N, dtype=bool)
+        no_basicas[base] = False
+        no_basicas &= ~fijas
+        if parametro == "b":
+            # x_B(θ) = ld + θ·paso: quiebre cuando una básica llega a cero
+            baja = paso < -tol
+            limites = np.full(m, np.inf)
+            limites[baja] = -ld[baja] / paso[baja]
+        else:
+            # Costo reducido r_k(θ) = r_k + θ·s_k: quiebre cuando uno se hace negativo
+            r, s_d = tableau[0, :N], tableau[m + 1, :N]
+            baja = no_basicas & (s_d < -tol)
+            limites = np.full(N, np.inf)
+            limites[baja] = -r[baja] / s_d[baja]
+        k = int(np.argmin(limites))
+        hasta = min(max(limites[k], theta), theta_max)
+
+        if not segmentos or hasta > theta + tol:
+            if segmentos and segmentos[-1]["hasta"] - segmentos[-1]["desde"] <= tol:
+                # Tramo de largo cero de un quiebre degenerado en θ = 0
+                segmentos.pop()
+            x = np.zeros(N)
+            x[base] = ld + theta * paso
+            if parametro == "b":
+                z_desde = signo * (tableau[0, -1] + theta * tableau[0, N])
+                pendiente = signo * tableau[0, N]
+            else:
+                z_desde = (c + theta * direccion) @ x[:n]
+                pendiente = direccion @ x[:n]
+            segmentos.append({
+                "desde": theta,
+                "hasta": hasta,
+                "z_desde": z_desde,
+                "z_hasta": z_desde + pendiente * (hasta - theta),
+                "pendiente": pendiente,
+                "base": base.copy(),
+                "x": x,
+            })
+        theta = hasta
+        if theta >= theta_max or not np.isfinite(limites[k]):
+            break
+        if pivotes >= max_pivotes:
+            raise ValueError("Se alcanzó el límite de iteraciones sin llegar al óptimo")
+
+        if parametro == "b":
+            # Pivote dual: sale la fila k; entra la de menor razón r_j / |alfa_kj|
+            fila = k
+            alfa = tableau[fila + 1, :N]
+            candidatas = no_basicas & (alfa < -tol)
+            if not np.any(candidatas):
+                estado = "no_factible"
+                break
+            razones = np.full(N, np.inf)
+            razones[candidatas] = tableau[0, :N][candidatas] / -alfa[candidatas]
+            col = int(np.argmin(razones))
+        else:
+            # Pivote primal: entra k con la prueba de la razón en θ
+            col = k
+            fila = prueba_razon(tableau[1:m + 1, col], ld + theta * paso, tol)
+            if fila < 0:
+                estado = "no_acotado"
+                break
+        pivotear(tableau, fila + 1, col)
+        base[fila] = col
+        pivotes += 1
+
+    return {"segmentos": segmentos, "estado": estado, "pivotes": pivotes}
@@ -0,0 +1,137 @@
+import numpy as np
+import scipy.sparse as sp
+
+def _desempatar(T, columnas, razones, n):
+    """
+    Fila saliente de cada instancia con el desempate lexicográfico de
+    ControlDegeneracion: entre las filas de razón mínima, la menor en orden
+    lexicográfico de las columnas de holgura (B^-1) divididas por el pivote.
+    """
+    minimas = razones.min(axis=1, keepdims=True)
+    empatadas = np.isfinite(razones) & (razones <= minimas + 1e-12 * (1.0 + minimas))
+    for k in range(T.shape[2] - n - 1):
+        if not np.any(empatadas.sum(axis=1) > 1):
+            break
+        valores = np.full(razones.shape, np.inf)
+        np.divide(T[:, 1:, n + k], columnas, out=valores, where=empatadas)
+        empatadas &= valores <= valores.min(axis=1, keepdims=True) + 1e-12
+    return np.argmax(empatadas, axis=1)
+
+def simplex_lote(c, A, b, max_iteraciones=None, tol=1e-8):
+    """
+    Resuelve a la vez K problemas max c_k·x sujeto a A x <= b_k, x >= 0.
+
+    Los K tableaux se apilan en un arreglo (K, m+1, n+m+1) y cada iteración
+    pivotea con NumPy todas las instancias que siguen activas; las que ya
+    terminaron quedan fuera de la máscara. Usa la regla de Dantzig de
+    simplex_solver (columna más negativa, razón mínima) con su control de
+    degeneración por instancia: los empates de la razón se rompen en orden
+    lexicográfico y, tras max(20, m) pivoteos degenerados seguidos, esa
+    instancia pasa a la regla de Bland hasta el siguiente pivoteo que avanza.
+    Una instancia que llega a `max_iteraciones` (por defecto 50·(n + m))
+    queda en "limite_iteraciones".
+
+    c es (K, n) y b es (K, m); A es (m, n) compartida o (K, m, n).
+    Devuelve (tableaux finales, estados, iteraciones por instancia, bases),
+    con bases (K, m) la columna básica de cada fila de cada tableau.
+    """
+    c = np.atleast_2d(np.asarray(c, dtype=float))
+    b = np.atleast_2d(np.asarray(b, dtype=float))
+    if sp.issparse(A):
+        A = A.toarray()
+    A = np.asarray(A, dtype=float)
+    K, n = c.shape
+    m = b.shape[1]
+    if b.shape[0] != K:
+        raise ValueError("c y b deben tener la misma cantidad de instancias")
+    if np.any(b < 0):
+        raise ValueError("El lote requiere lados derechos no negativos")
+
+    tableaux = np.zeros((K, m + 1, n + m + 1))
+    tableaux[:, 0, :n] = -c
+    tableaux[:, 1:, :n] = A
+    tableaux[:, 1:, n:n + m] = np.eye(m)
+    tableaux[:, 1:, -1] = b
+
+    if max_iteraciones is None:
+        max_iteraciones = 50 * (n + m)
+    umbral = max(20, m)
+    bases = np.tile(np.arange(n, n + m), (K, 1))
+    estados = np.full(K, "optimo", dtype=object)
+    iteraciones = np.zeros(K, dtype=int)
+    degenerados = np.zeros(K, dtype=int)
+    activos = np.arange(K)
+    filas_restr = np.arange(1, m + 1)
+
+    while len(activos):
+        agotados = iteraciones[activos] >= max_iteraciones
+        estados[activos[agotados]] = "limite_iteraciones"
+        activos = activos[~agotados]
+
+        # Columna entrante: la más negativa de la fila Z (con Bland, la primera negativa)
+        z = tableaux[activos, 0, :-1]
+        bland = degenerados[activos] > umbral
+        col = np.where(bland, np.argmax(z < -tol, axis=1), np.argmin(z, axis=1))
+        sigue = z[np.arange(len(activos)), col] < -tol
+        activos, col, bland = activos[sigue], col[sigue], bland[sigue]
+        if not len(activos):
+            break
+
+        # Prueba de la razón enmascarada sobre todas las instancias activas
+        columnas = tableaux[activos[:, None], filas_restr[None, :], col[:, None]]
+        ld = np.maximum(tableaux[activos, 1:, -1], 0.0)
+        positivas = columnas > tol
+        razones = np.full(columnas.shape, np.inf)
+        np.divide(ld, columnas, out=razones, where=positivas)
+        fila = np.argmin(razones, axis=1)
+        acotados = np.isfinite(razones[np.arange(len(activos)), fila])
+        estados[activos[~acotados]] = "no_acotado"
+        activos, col, bland = activos[acotados], col[acotados], bland[acotados]
+        columnas, razones = columnas[acotados], razones[acotados]
+        if not len(activos):
+            break
+        k = np.arange(len(activos))
+        minimas = razones[k, np.argmin(razones, axis=1)]
+        fila = _desempatar(tableaux[activos], columnas, razones, n)
+        if np.any(bland):
+            # Bland: entre las empatadas sale la de menor índice básico
+            empatadas = razones[bland] <= minimas[bland, None] + 1e-12 * (1.0 + minimas[bland, None])
+            indices = np.where(empatadas, bases[activos[bland]], n + m)
+            fila[bland] = np.argmin(indices, axis=1)
+        degenerados[activos] = np.where(minimas > tol, 0, degenerados[activos] + 1)
+        fila = fila + 1
+
+        # Pivoteo de rango 1 de todas las instancias a la vez
+        # Mientras todas sigan activas se trabaja sobre el arreglo sin copiarlo
+        todas = len(activos) == K
+        T = tableaux if todas else tableaux[activos]
+        fila_pivote = T[k, fila] / T[k, fila, col][:, None]
+        factores = T[k, :, col]
+        factores[k, fila] = 0.0
+        T -= factores[:, :, None] * fila_pivote[:, None, :]
+        T[k, fila] = fila_pivote
+        T[k, :, col] = 0.0
+        T[k, fila, col] = 1.0
+        if not todas:
+            tableaux[activos] = T
+        bases[activos, fila - 1] = col
+        iteraciones[activos] += 1
+
+    return tableaux, estados, iteraciones, bases
+
+def resultados_lote(tableaux, bases, variables, num_constraints):
+    """
+    Variables positivas y Z de cada tableau final, leídas con las bases que
+    devuelve simplex_lote (como obtener_resultados con la base del solver).
+    """
+    slack_vars = [f"x{i+len(variables)+1}" for i in range(num_constraints)]
+    all_vars = list(variables) + slack_vars
+
+    valores = np.zeros((len(tableaux), len(all_vars)))
+    np.put_along_axis(valores, bases, tableaux[:, 1:, -1], axis=1)
+
+    resultados = []
+    for k in range(len(tableaux)):
+        positivos = {var: valores[k, j] for j, var in enumerate(all_vars) if valores[k, j] > 0}
+        resultados.append((positivos, tableaux[k, 0, -1]))
+    return resultados
@@ -0,0 +1,620 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse.linalg import splu
+import time
+from reglas_precio import Bland, crear_regla
+from escalado import escalar_modelo, escalar_primal, desescalar_primal, desescalar_dual, rango
+
+class FactorizacionBase:
+    """Factorización LU de la base con actualizaciones en forma producto (etas)"""
+
+    def __init__(self, B):
+        if sp.issparse(B):
+            self.lu = splu(sp.csc_matrix(B))
+        else:
+            self.lu = lu_factor(B)
+        self.etas = []
+
+    def _resolver(self, v, trans):
+        if isinstance(self.lu, tuple):
+            return lu_solve(self.lu, v, trans=1 if trans else 0)
+        return self.lu.solve(v, trans="T" if trans else "N")
+
+    def actualizar(self, fila, d):
+        # La nueva inversa es E·B^-1, con E la identidad cuya columna "fila" es eta
+        eta = -d / d[fila]
+        eta[fila] = 1.0 / d[fila]
+        self.etas.append((fila, eta))
+
+    def ftran(self, a):
+        # Resuelve B x = a
+        x = self._resolver(np.asarray(a, dtype=float), False)
+        for fila, eta in self.etas:
+            x_r = x[fila]
+            x += x_r * eta
+            x[fila] = x_r * eta[fila]
+        return x
+
+    def btran(self, c):
+        # Resuelve y B = c
+        w = np.array(c, dtype=float)
+        for fila, eta in reversed(self.etas):
+            w[fila] = w @ eta
+        return self._resolver(w, True)
+
+class _Simplex:
+    """
+    Estado del simplex revisado sobre las columnas [A | diag(sigma) | diag(tau)].
+
+    Las columnas de holgura (sigma) y artificiales (tau) son implícitas: solo se
+    guarda su signo por fila. A puede ser densa o dispersa (se guarda en CSC).
+    Cada variable tiene cotas [inferior, superior]; las no básicas quedan en una
+    de sus cotas (o en cero si son libres) y sus valores se guardan en x.
+    Las fases se detienen con "limite_iteraciones" al llegar a
+    `max_iteraciones` pivotes y cambios de cota (por defecto 50·(n + m)).
+
+    Contra el ciclado se sigue la idea de ControlDegeneracion: en el primer
+    pivoteo degenerado se activa una perturbación acotada de x_B que solo usa
+    la prueba de la razón, y tras `umbral` pivoteos degenerados seguidos se
+    pasa a la regla de Bland (menor índice entrante y saliente) hasta el
+    siguiente pivoteo que avanza.
+    """
+
+    def __init__(self, A, b, sigma, tau, inferior, superior, x, base, regla, refactorizar_cada, tol,
+                 max_iteraciones=None):
+        self.disperso = sp.issparse(A)
+        self.A = sp.csc_matrix(A, dtype=float) if self.disperso else A
+        self.m, self.n = A.shape
+        self.b = b
+        self.sigma = sigma
+        self.tau = tau
+        self.inferior = inferior
+        self.superior = superior
+        self.x = x
+        self.refactorizar_cada = refactorizar_cada
+        self.tol = tol
+
+        self.base = base
+        self.es_basica = np.zeros(self.n + 2 * self.m, dtype=bool)
+        self.es_basica[base] = True
+        self.iteraciones = 0
+        self.cambios_cota = 0
+        if max_iteraciones is None:
+            max_iteraciones = 50 * (self.n + self.m)
+        self.max_iteraciones = max_iteraciones
+        self.umbral = max(20, self.m)
+        self.degenerados = 0
+        self.bland = False
+        self.regla_bland = Bland()
+        self.perturbacion = None
+        self.refactorizar()
+
+        # Normas de las columnas para las reglas con pesos (exactas si B es diagonal)
+        if self.disperso:
+            normas = np.asarray(self.A.multiply(self.A).sum(axis=0)).ravel()
+        else:
+            normas = np.sum(self.A ** 2, axis=0)
+        self.regla = regla
+        self.regla.iniciar(np.concatenate((normas, np.ones(2 * self.m))))
+
+    def columna(self, j):
+        col = np.zeros(self.m)
+        if j < self.n:
+            if self.disperso:
+                inicio, fin = self.A.indptr[j], self.A.indptr[j + 1]
+                col[self.A.indices[inicio:fin]] = self.A.data[inicio:fin]
+            else:
+                col[:] = self.A[:, j]
+        elif j < self.n + self.m:
+            col[j - self.n] = self.sigma[j - self.n]
+        else:
+            col[j - self.n - self.m] = self.tau[j - self.n - self.m]
+        return col
+
+    def producto_transpuesto(self, v, columnas=None):
+        """Calcula a_j · v para las columnas pedidas de [A | diag(sigma) | diag(tau)]"""
+        if columnas is None:
+            return np.concatenate((self.A.T @ v, self.sigma * v, self.tau * v))
+        res = np.empty(len(columnas))
+        estructurales = columnas < self.n
+        res[estructurales] = self.A[:, columnas[estructurales]].T @ v
+        logicas = columnas[~estructurales]
+        fila = (logicas - self.n) % self.m
+        signo = np.where(logicas < self.n + self.m, self.sigma[fila], self.tau[fila])
+        res[~estructurales] = signo * v[fila]
+        return res
+
+    def producto(self, v):
+        """Calcula [A | diag(sigma) | diag(tau)] · v"""
+        n, m = self.n, self.m
+        return self.A @ v[:n] + self.sigma * v[n:n + m] + self.tau * v[n + m:]
+
+    def matriz_base(self):
+        filas, cols, vals = [], [], []
+        for k, j in enumerate(self.base):
+            if j < self.n:
+                if self.disperso:
+                    inicio, fin = self.A.indptr[j], self.A.indptr[j + 1]
+                    idx = self.A.indices[inicio:fin]
+                    filas.extend(idx)
+                    vals.extend(self.A.data[inicio:fin])
+                    cols.extend([k] * len(idx))
+                else:
+                    idx = np.flatnonzero(self.A[:, j])
+                    filas.extend(idx)
+                    vals.extend(self.A[idx, j])
+                    cols.extend([k] * len(idx))
+            else:
+                i = (j - self.n) % self.m
+                signo = self.sigma[i] if j < self.n + self.m else self.tau[i]
+                filas.append(i)
+                cols.append(k)
+                vals.append(signo)
+        B = sp.csc_matrix((vals, (filas, cols)), shape=(self.m, self.m))
+        return B if self.disperso else B.toarray()
+
+    def refactorizar(self):
+        self.fact = FactorizacionBase(self.matriz_base())
+        # x_B = B^-1 (b - N x_N)
+        x_N = self.x.copy()
+        x_N[self.base] = 0.0
+        self.x_B = self.fact.ftran(self.b - self.producto(x_N))
+
+    def costos_reducidos(self, costos, columnas=None, y=None):
+        if y is None:
+            y = self.fact.btran(costos[self.base])
+        if columnas is None:
+            d = costos - self.producto_transpuesto(y)
+            d[self.es_basica] = 0.0
+        else:
+            d = costos[columnas] - self.producto_transpuesto(y, columnas)
+            d[self.es_basica[columnas]] = 0.0
+        return d
+
+    def pivotear(self, fila, entrante, d_col, paso, direccion, valor_saliente):
+        saliente = self.base[fila]
+        self.x_B -= paso * direccion * d_col
+        self.x_B[fila] = self.x[entrante] + paso * direccion
+        self.x[saliente] = valor_saliente
+        self.es_basica[saliente] = False
+        self.es_basica[entrante] = True
+        self.base[fila] = entrante
+        self.fact.actualizar(fila, d_col)
+        self.iteraciones += 1
+        if len(self.fact.etas) >= self.refactorizar_cada:
+            self.refactorizar()
+
+    def puntajes(self, d, columnas=None):
+        """|d_j| de las no básicas que mejoran el objetivo; cero para las demás"""
+        if columnas is None:
+            columnas = slice(None)
+        x = self.x[columnas]
+        # Una variable puede subir si no está en su cota superior y bajar si
+        # no está en la inferior; las fijas (inferior == superior) nunca entran
+        sube = (d > self.tol) & (x < self.superior[columnas] - self.tol)
+        baja = (d < -self.tol) & (x > self.inferior[columnas] + self.tol)
+        return np.where((sube | baja) & ~self.es_basica[columnas], np.abs(d), 0.0)
+
+    def actualizar_regla(self, fila, entrante, d_col):
+        """Pasa a la regla de precio la fila pivote antes de cambiar la base"""
+        if not self.regla.usa_fila_pivote:
+            return
+        e_r = np.zeros(self.m)
+        e_r[fila] = 1.0
+        alfa_fila = self.producto_transpuesto(self.fact.btran(e_r))
+        alfa_fila[self.es_basica] = 0.0
+        alfa_fila[entrante] = 0.0
+        producto = gamma = None
+        if self.regla.usa_producto:
+            producto = self.producto_transpuesto(self.fact.btran(d_col))
+            gamma = 1.0 + d_col @ d_col
+        self.regla.actualizar(entrante, self.base[fila], alfa_fila, d_col[fila], producto, gamma)
+
+    def agotado(self):
+        return self.iteraciones + self.cambios_cota >= self.max_iteraciones
+
+    def registrar_paso(self, paso):
+        """Cuenta los pivoteos degenerados seguidos y decide si se usa Bland"""
+        if paso > self.tol:
+            self.degenerados = 0
+            self.bland = False
+            return
+        self.degenerados += 1
+        if self.perturbacion is None:
+            # Cada básica se aleja de su cota más cercana, distinto en cada fila
+            pasos = 1.0 + np.arange(self.m) / max(self.m, 1)
+            magnitud = 1e-9 * (1.0 + np.abs(self.x_B)) * pasos
+            cerca_sup = (self.superior[self.base] - self.x_B) < (self.x_B - self.inferior[self.base])
+            self.perturbacion = np.where(cerca_sup, -magnitud, magnitud)
+        if self.degenerados > self.umbral:
+            self.bland = True
+
+    def fila_saliente(self, pasos, candidatas):
+        """Fila de menor razón; con Bland, entre las empatadas la de menor índice básico"""
+        fila = int(np.argmin(pasos))
+        if self.bland and np.isfinite(pasos[fila]):
+            empatadas = np.flatnonzero(candidatas & (pasos <= pasos[fila] + self.tol))
+            fila = int(empatadas[np.argmin(self.base[empatadas])])
+        return fila
+
+    def fase(self, costos):
+        """Itera el simplex primal acotado (maximización) hasta el óptimo de la fase"""
+        while True:
+            if self.agotado():
+                return "limite_iteraciones"
+            y = self.fact.btran(costos[self.base])
+            entrante = -1
+            regla = self.regla_bland if self.bland else self.regla
+            for columnas in regla.segmentos(len(costos)):
+                d = self.costos_reducidos(costos, columnas, y)
+                entrante = regla.elegir(self.puntajes(d, columnas), columnas)
+                if entrante >= 0:
+                    break
+            if entrante < 0:
+                return "optimo"
+            d_entrante = costos[entrante] - self.columna(entrante) @ y
+            direccion = 1.0 if d_entrante > 0 else -1.0
+
+            # Prueba de la razón acotada sobre la columna entrante transformada
+            d_col = self.fact.ftran(self.columna(entrante))
+            delta = direccion * d_col
+            inf_B = self.inferior[self.base]
+            sup_B = self.superior[self.base]
+            bajan = delta > self.tol
+            suben = delta < -self.tol
+            x_B = self.x_B if self.perturbacion is None else self.x_B + self.perturbacion
+            pasos = np.full(self.m, np.inf)
+            pasos[bajan] = (x_B[bajan] - inf_B[bajan]) / delta[bajan]
+            pasos[suben] = (sup_B[suben] - x_B[suben]) / -delta[suben]
+            pasos = np.maximum(pasos, 0.0)
+
+            fila = self.fila_saliente(pasos, bajan | suben) if self.m else -1
+            paso_fila = pasos[fila] if self.m else np.inf
+            if np.isfinite(paso_fila) and self.perturbacion is not None:
+                # El paso real usa x_B sin perturbar
+                distancia = self.x_B[fila] - inf_B[fila] if bajan[fila] else sup_B[fila] - self.x_B[fila]
+                paso_fila = max(distancia / abs(delta[fila]), 0.0)
+            paso_cota = self.superior[entrante] - self.inferior[entrante]
+
+            if min(paso_fila, paso_cota) == np.inf:
+                return "no_acotado"
+
+            if paso_cota <= paso_fila:
+                # La entrante llega a su otra cota antes que cualquier básica: se
+                # cambia de cota sin pivotear
+                self.x_B -= paso_cota * delta
+                if direccion > 0:
+                    self.x[entrante] = self.superior[entrante]
+                else:
+                    self.x[entrante] = self.inferior[entrante]
+                self.cambios_cota += 1
+                continue
+
+            saliente = self.base[fila]
+            if delta[fila] > 0:
+                valor_saliente = self.inferior[saliente]
+            else:
+                valor_saliente = self.superior[saliente]
+            self.registrar_paso(paso_fila)
+            if self.perturbacion is not None:
+                # La perturbación sigue el mismo pivoteo que x_B
+                extra = self.perturbacion[fila] / delta[fila]
+                self.perturbacion -= extra * delta
+                self.perturbacion[fila] = extra * direccion
+            self.actualizar_regla(fila, entrante, d_col)
+            self.pivotear(fila, entrante, d_col, paso_fila, direccion, valor_saliente)
+
+    def fase_dual(self, costos):
+        """Simplex dual acotado (maximización); parte de una base dual factible"""
+        while self.m:
+            if self.agotado():
+                return "limite_iteraciones"
+            # Fila saliente: la básica más alejada de sus cotas
+            inf_B = self.inferior[self.base]
+            sup_B = self.superior[self.base]
+            debajo = inf_B - self.x_B
+            encima = self.x_B - sup_B
+            violacion = np.maximum(debajo, encima)
+            fila = int(np.argmax(violacion))
+            if violacion[fila] <= self.tol:
+                break
+            if self.bland:
+                # Bland dual: sale la básica infactible de menor índice
+                infactibles = np.flatnonzero(violacion > self.tol)
+                fila = int(infactibles[np.argmin(self.base[infactibles])])
+
+            e_r = np.zeros(self.m)
+            e_r[fila] = 1.0
+            rho = self.fact.btran(e_r)
+            alfa = self.producto_transpuesto(rho)
+            d = self.costos_reducidos(costos)
+
+            # Entrantes que mueven a la saliente hacia la cota violada
+            puede_subir = ~self.es_basica & (self.x < self.superior - self.tol)
+            puede_bajar = ~self.es_basica & (self.x > self.inferior + self.tol)
+            if debajo[fila] > 0:
+                objetivo = inf_B[fila]
+                candidatas = (puede_subir & (alfa < -self.tol)) | (puede_bajar & (alfa > self.tol))
+            else:
+                objetivo = sup_B[fila]
+                candidatas = (puede_subir & (alfa > self.tol)) | (puede_bajar & (alfa < -self.tol))
+            if not np.any(candidatas):
+                return "no_factible"
+
+            # Prueba de la razón dual: conserva el signo correcto de los costos reducidos
+            razones = np.full(len(alfa), np.inf)
+            razones[candidatas] = np.abs(d[candidatas]) / np.abs(alfa[candidatas])
+            entrante = int(np.argmin(razones))
+            # Pivoteo dual degenerado: los costos reducidos no cambian
+            self.registrar_paso(razones[entrante])
+
+            d_col = self.fact.ftran(self.columna(entrante))
+            paso = (self.x_B[fila] - objetivo) / d_col[fila]
+            self.pivotear(fila, entrante, d_col, paso, 1.0, objetivo)
+        return "optimo"
+
+    def sacar_artificiales(self):
+        """Saca de la base las artificiales que quedaron en cero tras la Fase 1"""
+        for fila in range(self.m):
+            if self.base[fila] < self.n + self.m:
+                continue
+            e_r = np.zeros(self.m)
+            e_r[fila] = 1.0
+            rho = self.fact.btran(e_r)
+            alfa = self.producto_transpuesto(rho)
+            alfa[self.es_basica | (self.inferior == self.superior)] = 0.0
+            entrante = int(np.argmax(np.abs(alfa)))
+            # Si toda la fila es cero la restricción es redundante y la artificial se queda
+            if abs(alfa[entrante]) > self.tol:
+                d_col = self.fact.ftran(self.columna(entrante))
+                paso = self.x_B[fila] / d_col[fila]
+                self.pivotear(fila, entrante, d_col, paso, 1.0, 0.0)
+
+    def es_factible(self):
+        inf_B = self.inferior[self.base]
+        sup_B = self.superior[self.base]
+        return bool(np.all(self.x_B >= inf_B - 1e-7) and np.all(self.x_B <= sup_B + 1e-7))
+
+    def solucion(self):
+        x = self.x.copy()
+        x[self.base] = self.x_B
+        return x
+
+def _resultado(simplex, estado, metodo, c, signo, arranque="frio", factible=True):
+    """Dict de la solución; con `factible` falso (o "no_factible") x y los duales quedan en cero"""
+    n, m = simplex.n, simplex.m
+    x = simplex.solucion()
+    factible = factible and estado != "no_factible"
+    costos_B = np.zeros(m)
+    estructurales = simplex.base < n
+    costos_B[estructurales] = signo * c[simplex.base[estructurales]]
+    return {
+        "estado": estado,
+        "x": x[:n + m] if factible else np.zeros(n + m),
+        "z": float(c @ x[:n]) if factible else np.nan,
+        "duales": signo * simplex.fact.btran(costos_B) if factible else np.zeros(m),
+        "base": simplex.base,
+        "iteraciones": simplex.iteraciones,
+        "cambios_cota": simplex.cambios_cota,
+        "metodo": metodo,
+        "arranque": arranque,
+        "regla": simplex.regla.nombre,
+    }
+
+def _arranque_caliente(A, b, sigma, inferior, superior, base_inicial, regla, refactorizar_cada, tol,
+                       max_iteraciones):
+    """
+    Reconstruye el simplex desde una solución previa ({"base", "x"}).
+
+    Las no básicas se ubican en la cota más cercana a su valor anterior, de modo
+    que un cambio de cotas (o de b, o de c) solo mueve lo necesario. Devuelve
+    None si la base ya no sirve (dimensiones distintas o matriz singular).
+    """
+    m, n = A.shape
+    base = np.array(base_inicial["base"], dtype=int)
+    x_previo = np.asarray(base_inicial["x"], dtype=float)
+    if len(base) != m or len(x_previo) != n + m:
+        return None
+    # Una artificial que quedó básica (fila redundante) se cambia por su holgura
+    base = np.where(base >= n + m, base - m, base)
+    if len(set(base)) != m:
+        return None
+
+    x = np.zeros(n + 2 * m)
+    x[:n + m] = x_previo
+    cerca_sup = np.abs(x - superior) < np.abs(x - inferior)
+    x = np.where(cerca_sup & np.isfinite(superior), superior,
+                 np.where(np.isfinite(inferior), inferior,
+                          np.where(np.isfinite(superior), superior, 0.0)))
+    try:
+        simplex = _Simplex(A, b, sigma, np.ones(m), inferior, superior, x, base, regla,
+                           refactorizar_cada, tol, max_iteraciones)
+    except (RuntimeError, np.linalg.LinAlgError):
+        return None
+    if not np.all(np.isfinite(simplex.x_B)):
+        return None
+    return simplex
+
+def _resolver(c, A, b, sentidos, objetivo, cotas, metodo, base_inicial, regla,
+              refactorizar_cada, tol, max_iteraciones):
+    """Cuerpo de simplex_revisado sobre el modelo ya escalado (o sin escalar)"""
+    c = np.asarray(c, dtype=float)
+    if not sp.issparse(A):
+        A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    m, n = A.shape
+    if sentidos is None:
+        sentidos = ["<="] * m
+    if cotas is None:
+        cotas = (np.zeros(n), np.full(n, np.inf))
+    regla = crear_regla(regla)
+
+    inferior = np.concatenate((np.asarray(cotas[0], dtype=float), np.zeros(2 * m)))
+    superior = np.concatenate((np.asarray(cotas[1], dtype=float), np.full(2 * m, np.inf)))
+    es_igualdad = np.array([s == "=" for s in sentidos], dtype=bool)
+    superior[n:n + m][es_igualdad] = 0.0
+    # Las artificiales solo existen en la Fase 1; fuera de ella quedan fijas en cero
+    superior[n + m:] = 0.0
+
+    # Holgura con signo +1 (<=) o -1 (exceso, >=); las de "=" quedan fijas en 0
+    sigma = np.array([-1.0 if s == ">=" else 1.0 for s in sentidos])
+
+    signo = 1.0 if objetivo == "max" else -1.0
+    costos = np.zeros(n + 2 * m)
+    costos[:n] = signo * c
+
+    if np.any(inferior > superior):
+        return {
+            "estado": "no_factible",
+            "x": np.zeros(n + m),
+            "z": np.nan,
+            "duales": np.zeros(m),
+            "base": np.arange(n, n + m),
+            "iteraciones": 0,
+            "cambios_cota": 0,
+            "metodo": metodo,
+            "arranque": "frio",
+            "regla": regla.nombre,
+        }
+
+    if base_inicial is not None:
+        simplex = _arranque_caliente(A, b, sigma, inferior, superior, base_inicial, regla,
+                                     refactorizar_cada, tol, max_iteraciones)
+        if simplex is not None:
+            if simplex.es_factible():
+                return _resultado(simplex, simplex.fase(costos), "primal", c, signo, "caliente")
+            if not np.any(simplex.puntajes(simplex.costos_reducidos(costos))):
+                estado = simplex.fase_dual(costos)
+                # Si el dual se detiene antes, la base todavía no es primal factible
+                factible = estado != "limite_iteraciones"
+                if estado == "optimo":
+                    estado = simplex.fase(costos)
+                return _resultado(simplex, estado, "dual", c, signo, "caliente", factible)
+
+    # Las no básicas arrancan en su cota finita (o en cero si son libres)
+    x = np.zeros(n + 2 * m)
+    x[:n] = np.where(np.isfinite(inferior[:n]), inferior[:n],
+                     np.where(np.isfinite(superior[:n]), superior[:n], 0.0))
+    residuo = b - (A @ x[:n])
+    tau = np.where(residuo < 0, -1.0, 1.0)
+    holgura_valida = ~es_igualdad & (sigma * residuo >= 0)
+    indices = np.arange(m)
+
+    # Con y = 0 los costos reducidos de la base de holguras son los costos: es
+    # dual factible si cada variable puede ubicarse en la cota que pide su costo
+    x_dual = x.copy()
+    x_dual[:n] = np.where(costos[:n] > tol, superior[:n],
+                          np.where(costos[:n] < -tol, inferior[:n], x[:n]))
+    dual_factible = bool(np.all(np.isfinite(x_dual[:n])))
+
+    if metodo == "dual" and not dual_factible:
+        raise ValueError("La base inicial no es dual factible")
+    if metodo == "dual" or (metodo == "auto" and dual_factible and not np.all(holgura_valida)):
+        simplex = _Simplex(A, b, sigma, tau, inferior, superior, x_dual, n + indices, regla,
+                           refactorizar_cada, tol, max_iteraciones)
+        estado = simplex.fase_dual(costos)
+        factible = estado != "limite_iteraciones"
+        if estado == "optimo":
+            estado = simplex.fase(costos)
+        return _resultado(simplex, estado, "dual", c, signo, factible=factible)
+
+    base = np.where(holgura_valida, n + indices, n + m + indices)
+    simplex = _Simplex(A, b, sigma, tau, inferior, superior, x, base, regla, refactorizar_cada, tol,
+                       max_iteraciones)
+
+    # Fase 1: minimizar la suma de artificiales (maximizar su negativo)
+    if not np.all(holgura_valida):
+        simplex.superior[n + m:] = np.inf
+        costos_f1 = np.zeros(n + 2 * m)
+        costos_f1[n + m:] = -1.0
+        if simplex.fase(costos_f1) == "limite_iteraciones":
+            return _resultado(simplex, "limite_iteraciones", "primal", c, signo, factible=False)
+        if np.sum(simplex.solucion()[n + m:]) > 1e-6:
+            return _resultado(simplex, "no_factible", "primal", c, signo)
+        simplex.superior[n + m:] = 0.0
+    simplex.sacar_artificiales()
+
+    # Fase 2: función objetivo original (internamente siempre se maximiza)
+    return _resultado(simplex, simplex.fase(costos), "primal", c, signo)
+
+def simplex_revisado(c, A, b, sentidos=None, objetivo="max", cotas=None, metodo="auto",
+                     base_inicial=None, regla="dantzig", escalar=True, refactorizar_cada=50, tol=1e-9,
+                     max_iteraciones=None):
+    """
+    Simplex revisado para optimizar c·x sujeto a A x (<=, >=, =) b y cotas en x.
+
+    En lugar de reescribir el tableau completo solo mantiene el conjunto de
+    índices básicos y una factorización LU de B, que se actualiza con etas
+    después de cada pivoteo y se refactoriza cada `refactorizar_cada` pivoteos.
+    A puede ser un arreglo denso o una matriz scipy.sparse (CSR/CSC); las
+    holguras y artificiales nunca se materializan como bloques identidad.
+
+    `cotas` es un par (inferiores, superiores) por variable (por defecto
+    x >= 0); se admiten -inf/inf, así que las variables libres no necesitan
+    dividirse en dos columnas. Las cotas no agregan filas: el simplex acotado
+    cambia la variable de cota sin pivotear cuando es posible.
+
+    Con metodo="auto", si la base de holguras no es factible pero sí dual
+    factible (p. ej. minimizar con costos no negativos) se usa el simplex dual,
+    sin Fase 1 ni artificiales; si no, se resuelve primero una Fase 1.
+
+    `base_inicial` es un resultado previo de esta función (con "base" y "x")
+    para el mismo modelo con otros coeficientes, cotas o lados derechos: si la
+    base sigue siendo primal factible se continúa con el primal, si sigue
+    siendo dual factible con el dual, y si no se arranca en frío.
+
+    `regla` elige la columna entrante del simplex primal: "dantzig", "devex",
+    "steepest_edge", "parcial", "multiple" o una instancia de ReglaPrecio.
+
+    Con `escalar` (por defecto) filas y columnas se escalan por media
+    geométrica y equilibrio antes de resolver; x, z y los duales se devuelven
+    en las unidades del modelo original y "escala" informa el rango de los
+    coeficientes antes y después.
+
+    `max_iteraciones` (por defecto 50·(variables + restricciones)) limita los
+    pivotes y cambios de cota de todas las fases juntas; al agotarse estado
+    es "limite_iteraciones", con x el último punto si ya era factible (si
+    no, ceros y z en nan, como con "no_factible").
+    """
+    if not escalar:
+        solucion = _resolver(c, A, b, sentidos, objetivo, cotas, metodo, base_inicial, regla,
+                             refactorizar_cada, tol, max_iteraciones)
+        solucion["escala"] = None
+        return solucion
+
+    c_e, A_e, b_e, cotas_e, r, s = escalar_modelo(c, A, b, cotas)
+    if base_inicial is not None:
+        base_inicial = dict(base_inicial, x=escalar_primal(base_inicial["x"], r, s))
+    solucion = _resolver(c_e, A_e, b_e, sentidos, objetivo, cotas_e, metodo, base_inicial, regla,
+                         refactorizar_cada, tol, max_iteraciones)
+    solucion["x"] = desescalar_primal(solucion["x"], r, s)
+    solucion["duales"] = desescalar_dual(solucion["duales"], r)
+    if not np.isnan(solucion["z"]):
+        solucion["z"] = float(np.asarray(c, dtype=float) @ solucion["x"][:len(s)])
+    solucion["escala"] = {"rango_original": rango(A), "rango_escalado": rango(A_e)}
+    return solucion
+
+def comparar_reglas(c, A, b, sentidos=None, objetivo="max", cotas=None, reglas=None):
+    """Resuelve el mismo modelo con cada regla de precio y reporta iteraciones y tiempo"""
+    if reglas is None:
+        reglas = ["dantzig", "devex", "steepest_edge", "parcial", "multiple"]
+    comparacion = {}
+    for regla in reglas:
+        inicio = time.perf_counter()
+        solucion = simplex_revisado(c, A, b, sentidos, objetivo, cotas, regla=regla)
+        comparacion[solucion["regla"]] = {
+            "estado": solucion["estado"],
+            "iteraciones": solucion["iteraciones"],
+            "tiempo": time.perf_counter() - inicio,
+            "z": solucion["z"],
+        }
+    return comparacion
+
+def resultados_revisado(solucion, variables, num_constraints):
+    """Devuelve la solución del simplex revisado con el formato de obtener_resultados"""
+    slack_vars = [f"x{i+len(variables)+1}" for i in range(num_constraints)]
+    all_vars = variables + slack_vars
+    # Con cotas y variables libres una variable puede valer negativo
+    resultados = {v: val for v, val in zip(all_vars, solucion["x"]) if abs(val) > 1e-9}
+    return resultados, solucion["z"]
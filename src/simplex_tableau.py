@@ -0,0 +1,456 @@
+"""
+Simplex de tableau y lectura de las líneas de los formularios, sin la
+interfaz: lo usan las dos pantallas y lote_modelos (cuyos procesos no
+deben cargar flet).
+
+simplex_solver maximiza con filas <=; simplex_dos_fases (y simplex_dual,
+al que delega cuando los costos ya son no negativos) minimiza con filas
+<=, >= y =. Los tres devuelven una TrazaSimplex.
+"""
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from reglas_precio import crear_regla, actualizar_tableau
+from pivoteo import ControlDegeneracion, pivotear
+from traza import TrazaSimplex
+from expresiones import detectar_variables, tabla_simbolos, fila_lineal, objetivo_lineal, densa
+
+def clean_expression(expr):
+    return expr.replace(" ", "").lower()
+
+def detect_variables(func_obj_str, restricciones_str):
+    return detectar_variables(func_obj_str, restricciones_str)
+
+def parse_function_objective(line, variables):
+    simbolos = tabla_simbolos(variables)
+    return densa(objetivo_lineal(line, simbolos), len(simbolos))
+
+def parse_restriction(line, variables):
+    simbolos = tabla_simbolos(variables)
+    coefs, sentido, ld = fila_lineal(line, simbolos)
+    if sentido is None:
+        raise ValueError("Cada restricción debe contener '<=', '>=' o '='")
+    return densa(coefs, len(simbolos)), ld, sentido
+
+def parse_cotas(restr_lines, variables):
+    """Separa las cotas simples (una sola variable) y las variables libres de las filas"""
+    simbolos = tabla_simbolos(variables)
+    inferior = np.zeros(len(simbolos))
+    superior = np.full(len(simbolos), np.inf)
+
+    # Primero las libres, para que una cota escrita después las pueda acotar
+    libres = [line for line in restr_lines if clean_expression(line).endswith("libre")]
+    for line in libres:
+        var = clean_expression(line)[:-len("libre")]
+        if var not in simbolos:
+            raise ValueError(f"Variable libre desconocida: {line}")
+        inferior[simbolos[var]] = -np.inf
+
+    filas = []
+    for line in restr_lines:
+        if line in libres:
+            continue
+        coefs, sentido, val = fila_lineal(line, simbolos)
+        no_cero = [j for j, v in coefs.items() if v != 0]
+        if len(no_cero) != 1 or sentido is None:
+            filas.append(line)
+            continue
+        j = no_cero[0]
+        cota = val / coefs[j]
+        if sentido == "=":
+            inferior[j] = max(inferior[j], cota)
+            superior[j] = min(superior[j], cota)
+        elif (sentido == "<=") == (coefs[j] > 0):
+            superior[j] = min(superior[j], cota)
+        else:
+            inferior[j] = max(inferior[j], cota)
+    return filas, (inferior, superior)
+
+def parse_enteras(restr_lines, variables):
+    """Separa las líneas "x1, x2 enteras" (o "x1 entera") y marca esas variables como enteras"""
+    simbolos = tabla_simbolos(variables)
+    enteras = np.zeros(len(simbolos), dtype=bool)
+    filas = []
+    for line in restr_lines:
+        texto = clean_expression(line)
+        for sufijo in ("enteras", "entera"):
+            if texto.endswith(sufijo):
+                for var in texto[:-len(sufijo)].split(","):
+                    if var not in simbolos:
+                        raise ValueError(f"Variable entera desconocida: {line}")
+                    enteras[simbolos[var]] = True
+                break
+        else:
+            filas.append(line)
+    return filas, enteras
+
+def simplex_solver(c, A, b, regla="dantzig", archivo_traza=None, max_iteraciones=None):
+    # El tableau es denso por naturaleza; para modelos grandes usar simplex_revisado.
+    # Devuelve una TrazaSimplex; `archivo_traza` guarda los pivotes en disco.
+    # La base final (columna básica de cada fila) queda en `tablas.base`.
+    # Los modelos degenerados terminan gracias a ControlDegeneracion; además
+    # hay un límite de iteraciones (por defecto 50·(variables + restricciones))
+    if sp.issparse(A):
+        A = A.toarray()
+    num_vars = len(c)
+    num_constraints = len(b)
+
+    slack = np.eye(num_constraints)
+    tableau = np.hstack((A, slack, np.array(b).reshape(-1, 1)))
+    c_row = np.hstack((-np.array(c), np.zeros(num_constraints + 1)))
+
+    tableau = np.vstack((c_row, tableau))
+
+    regla = crear_regla(regla)
+    regla.iniciar(np.sum(tableau[1:, :-1] ** 2, axis=0))
+    base = list(range(num_vars, num_vars + num_constraints))
+    # Las holguras forman la base inicial: sus columnas son B^-1 en cada tableau
+    control = ControlDegeneracion(tableau, columnas_lex=base.copy())
+    if max_iteraciones is None:
+        max_iteraciones = 50 * (num_vars + num_constraints)
+
+    tablas = TrazaSimplex(archivo_traza)
+    tablas.nuevo_segmento(tableau, base=base)
+    # La traza actualiza la base en cada pivote; el solver lee la misma
+    base = tablas.base
+
+    # El archivo de la traza se cierra al salir, también con una excepción
+    with tablas:
+        while True:
+            col_pivote = control.columna(regla, tableau)
+            if col_pivote < 0:
+                break
+            if tablas.num_pivotes >= max_iteraciones:
+                raise ValueError("Se alcanzó el límite de iteraciones sin llegar al óptimo")
+
+            fila = control.fila(tableau, col_pivote, base)
+            if fila < 0:
+                raise ValueError("El problema no está acotado")
+            control.registrar(tableau, fila, col_pivote)
+            fila_pivote = fila + 1
+            actualizar_tableau(regla, tableau, fila_pivote, col_pivote, base[fila_pivote - 1])
+
+            pivotear(tableau, fila_pivote, col_pivote)
+            tablas.agregar_pivote(fila_pivote, col_pivote)
+
+        tablas.cerrar_segmento(tableau)
+    return tablas
+
+def _limite(tablas, max_iteraciones, fin):
+    """Estado de límite si se agotó el presupuesto de iteraciones o de tiempo"""
+    if tablas.num_pivotes >= max_iteraciones:
+        return "limite_iteraciones"
+    if fin is not None and time.perf_counter() >= fin:
+        return "limite_tiempo"
+    return None
+
+def _punto(tableau, base, c):
+    """Valores de las variables originales y Z según las básicas del tableau"""
+    x = np.zeros(len(c))
+    for i, j in enumerate(base):
+        if 0 <= j < len(c):
+            x[j] = tableau[i + 1, -1]
+    return {"x": x, "z": float(np.dot(c, x))}
+
+def simplex_dual(c, A, b, sentidos, archivo_traza=None, variables=None, max_iteraciones=None,
+                 tiempo_limite=None):
+    """
+    Simplex dual para minimización partiendo de la base de holguras.
+
+    Requiere costos no negativos (base dual factible). Las filas >= se
+    multiplican por -1 para que su holgura sea básica, y las holguras de las
+    filas = quedan fijas en cero: nunca entran y salen si su valor no es cero.
+    No necesita Fase 1 ni variables artificiales. Los empates de la razón
+    dual se rompen por el menor índice. Los puntos intermedios no son
+    factibles, así que con un límite `mejor` queda en None.
+    """
+    num_vars = len(c)
+    num_rest = len(b)
+
+    tableau = np.zeros((num_rest + 1, num_vars + num_rest + 1))
+    nombres = list(variables) if variables else [f"x{i+1}" for i in range(num_vars)]
+    nombres += [f"s{i+1}" for i in range(num_rest)]
+    nombres.append("LD")
+
+    for i in range(num_rest):
+        signo = -1 if sentidos[i] == ">=" else 1
+        tableau[i+1, :num_vars] = signo * np.asarray(A[i])
+        tableau[i+1, num_vars + i] = 1
+        tableau[i+1, -1] = signo * b[i]
+    tableau[0, :num_vars] = c
+
+    fijas = np.zeros(num_vars + num_rest, dtype=bool)
+    fijas[num_vars:] = [s == "=" for s in sentidos]
+    base = list(range(num_vars, num_vars + num_rest))
+
+    if max_iteraciones is None:
+        max_iteraciones = 50 * (num_vars + num_rest)
+    fin = None if tiempo_limite is None else time.perf_counter() + tiempo_limite
+
+    tablas = TrazaSimplex(archivo_traza)
+    tablas.nuevo_segmento(tableau, "DUAL", nombres, base)
+    # La traza actualiza la base en cada pivote; el solver lee la misma
+    base = tablas.base
+
+    while True:
+        # Fila saliente: la básica más infactible (negativa, o distinta de cero si es fija)
+        ld = tableau[1:, -1]
+        infactibilidad = np.where(fijas[base], np.abs(ld), -ld)
+        # Sin filas (p. ej. un modelo que presolve resolvió entero) el punto ya es óptimo
+        fila = int(np.argmax(infactibilidad)) if num_rest else -1
+        if fila < 0 or infactibilidad[fila] <= 1e-8:
+            tablas.mejor = _punto(tableau, base, c)
+            break
+        estado = _limite(tablas, max_iteraciones, fin)
+        if estado:
+            tablas.estado = estado
+            break
+        fila_pivote = fila + 1
+
+        # Prueba de la razón dual sobre las no básicas que no son fijas
+        alfa = tableau[fila_pivote, :-1]
+        candidatas = ~fijas
+        candidatas[base] = False
+        if ld[fila] < 0:
+            candidatas &= alfa < -1e-8
+        else:
+            candidatas &= alfa > 1e-8
+        if not np.any(candidatas):
+            tablas.estado = "no_factible"
+            break
+        razones = np.full(len(alfa), np.inf)
+        razones[candidatas] = tableau[0, :-1][candidatas] / np.abs(alfa[candidatas])
+        col_pivote = int(np.argmin(razones))
+
+        pivotear(tableau, fila_pivote, col_pivote)
+        tablas.agregar_pivote(fila_pivote, col_pivote)
+
+    tablas.cerrar_segmento(tableau)
+    tablas.cerrar()
+    return tablas
+
+def simplex_dos_fases(c, A, b, sentidos, regla="dantzig", archivo_traza=None, variables=None,
+                      max_iteraciones=None, tiempo_limite=None):
+    """
+    Método de dos fases para minimización corregido.
+    `regla` es la regla de precio de ambas fases (el simplex dual no la usa).
+    Devuelve una TrazaSimplex con la base final en `tablas.base` (índices de
+    la Fase 2); `archivo_traza` guarda los pivotes en disco.
+    Cada fase usa ControlDegeneracion contra el estancamiento y el ciclado.
+
+    `max_iteraciones` (por defecto 50·(variables + restricciones)) y
+    `tiempo_limite` (segundos) son presupuestos para ambas fases juntas. La
+    traza lleva el resultado en `estado` y en `mejor` el mejor punto factible
+    encontrado: en la Fase 2 cada tableau es factible y Z no empeora, así que
+    es el último; si el presupuesto se agota en la Fase 1 queda en None.
+    """
+    # El tableau es denso por naturaleza; para modelos grandes usar simplex_revisado
+    if sp.issparse(A):
+        A = A.toarray()
+
+    # Con costos no negativos la base de holguras ya es dual factible
+    if np.all(np.asarray(c) >= 0):
+        return simplex_dual(c, A, b, sentidos, archivo_traza, variables, max_iteraciones,
+                            tiempo_limite)
+
+    # La Fase 1 necesita lados derechos no negativos: esas filas se multiplican por -1
+    negativas = np.asarray(b, dtype=float) < 0
+    if np.any(negativas):
+        A = np.where(negativas[:, None], -np.asarray(A, dtype=float), A)
+        b = np.abs(np.asarray(b, dtype=float))
+        inverso = {"<=": ">=", ">=": "<=", "=": "="}
+        sentidos = [inverso[s] if neg else s for s, neg in zip(sentidos, negativas)]
+
+    num_vars = len(c)
+    num_rest = len(b)
+    if max_iteraciones is None:
+        max_iteraciones = 50 * (num_vars + num_rest)
+    fin = None if tiempo_limite is None else time.perf_counter() + tiempo_limite
+    
+    # FASE 1: Minimizar suma de variables artificiales
+    
+    # Identificar restricciones que necesitan variables artificiales
+    restricciones_artificiales = [i for i, s in enumerate(sentidos) if s in [">=", "="]]
+    num_artificiales = len(restricciones_artificiales)
+    
+    # Matriz aumentada para Fase 1
+    total_cols_f1 = num_vars + num_rest + num_artificiales  # +1 para LD después
+    
+    # Tableau Fase 1
+    tableau_f1 = np.zeros((num_rest + 1, total_cols_f1 + 1))  # +1 para LD
+    
+    # Configurar nombres de variables para Fase 1
+    nombres_f1 = list(variables) if variables else [f"x{i+1}" for i in range(num_vars)]
+    nombres_f1 += [f"s{i+1}" for i in range(num_rest)]  # Holguras
+    nombres_f1 += [f"a{i+1}" for i in range(num_artificiales)]  # Artificiales
+    nombres_f1.append("LD")
+    
+    # Llenar restricciones
+    idx_artificial = 0
+    for i in range(num_rest):
+        # Variables originales
+        tableau_f1[i+1, :num_vars] = A[i]
+        
+        # Variables de holgura
+        if sentidos[i] == "<=":
+            tableau_f1[i+1, num_vars + i] = 1  # Holgura positiva
+        elif sentidos[i] == ">=":
+            tableau_f1[i+1, num_vars + i] = -1  # Exceso negativo
+            # Variable artificial
+            tableau_f1[i+1, num_vars + num_rest + idx_artificial] = 1
+            idx_artificial += 1
+        elif sentidos[i] == "=":
+            # Variable artificial
+            tableau_f1[i+1, num_vars + num_rest + idx_artificial] = 1
+            idx_artificial += 1
+        
+        # Lado derecho
+        tableau_f1[i+1, -1] = b[i]
+    
+    # Función objetivo Fase 1: Minimizar suma de artificiales
+    for i in range(num_artificiales):
+        tableau_f1[0, num_vars + num_rest + i] = 1
+    
+    # Base inicial: holgura en filas <=, artificial en las demás
+    base = []
+    idx_artificial = 0
+    for i in range(num_rest):
+        if sentidos[i] == "<=":
+            base.append(num_vars + i)
+        else:
+            base.append(num_vars + num_rest + idx_artificial)
+            idx_artificial += 1
+
+    # Hacer cero los coeficientes de las artificiales básicas en Z
+    for i, j in enumerate(base):
+        if j >= num_vars + num_rest:
+            tableau_f1[0] -= tableau_f1[i+1]
+    regla = crear_regla(regla)
+    regla.iniciar(np.sum(tableau_f1[1:, :-1] ** 2, axis=0))
+    # Las columnas de la base inicial son B^-1 durante toda la Fase 1
+    control = ControlDegeneracion(tableau_f1, columnas_lex=base.copy())
+
+    tablas = TrazaSimplex(archivo_traza)
+    tablas.nuevo_segmento(tableau_f1, "FASE 1", nombres_f1, base)
+    base = tablas.base
+    
+    # Iteraciones Fase 1
+    while True:
+        # Verificar optimalidad Fase 1 (minimización) y elegir la columna pivote
+        col_pivote = control.columna(regla, tableau_f1)
+        if col_pivote < 0:
+            break
+        estado = _limite(tablas, max_iteraciones, fin)
+        if estado:
+            # Sin terminar la Fase 1 todavía no hay un punto factible
+            tablas.estado = estado
+            tablas.cerrar_segmento(tableau_f1)
+            tablas.cerrar()
+            return tablas
+        
+        # Razón mínima
+        fila = control.fila(tableau_f1, col_pivote, base)
+        if fila < 0:
+            break
+        control.registrar(tableau_f1, fila, col_pivote)
+        
+        fila_pivote = fila + 1
+        actualizar_tableau(regla, tableau_f1, fila_pivote, col_pivote, base[fila_pivote - 1])
+        
+        # Pivoteo
+        pivotear(tableau_f1, fila_pivote, col_pivote)
+        
+        tablas.agregar_pivote(fila_pivote, col_pivote)
+    
+    # Verificar factibilidad
+    z_fase1 = tableau_f1[0, -1]
+    if abs(z_fase1) > 1e-6:
+        tablas.estado = "no_factible"
+        tablas.cerrar_segmento(tableau_f1)
+        tablas.cerrar()
+        return tablas
+
+    # Una artificial que quedó básica en cero (Fase 1 degenerada) se saca con un
+    # pivoteo degenerado; si no, su fila queda sin básica al quitar las artificiales
+    for i, j in enumerate(base):
+        if j >= num_vars + num_rest:
+            candidatas = np.flatnonzero(np.abs(tableau_f1[i + 1, :num_vars + num_rest]) > 1e-9)
+            # Si toda la fila es cero la restricción es redundante y no importa
+            if len(candidatas):
+                pivotear(tableau_f1, i + 1, candidatas[0])
+                tablas.agregar_pivote(i + 1, candidatas[0])
+    tablas.cerrar_segmento(tableau_f1)
+    
+    # FASE 2: Usar la función objetivo original
+    
+    # Preparar tableau para Fase 2
+    # Eliminar columnas de variables artificiales
+    columnas_a_mantener = []
+    for j in range(tableau_f1.shape[1] - 1):  # Excluir LD
+        es_artificial = j >= (num_vars + num_rest) and j < (num_vars + num_rest + num_artificiales)
+        if not es_artificial:
+            columnas_a_mantener.append(j)
+    
+    # Agregar columna LD
+    columnas_a_mantener.append(tableau_f1.shape[1] - 1)
+    
+    tableau_f2 = tableau_f1[:, columnas_a_mantener]
+    
+    # Nombres para Fase 2
+    nombres_f2 = [nombres_f1[j] for j in columnas_a_mantener[:-1]] + ["LD"]
+    
+    # CORRECCIÓN: Reemplazar función objetivo por la original con limpieza mejorada
+    nueva_fila_z = np.zeros(tableau_f2.shape[1])
+    nueva_fila_z[:num_vars] = c  # Coeficientes originales
+    nueva_fila_z[-1] = 0  # LD
+    
+    # Reindexar la base sin las artificiales (-1 si alguna quedó básica en cero)
+    nueva_posicion = {j: k for k, j in enumerate(columnas_a_mantener[:-1])}
+    base = [nueva_posicion.get(j, -1) for j in base]
+
+    # Limpiar los costos de las básicas con la base conocida (buscar columnas
+    # unitarias confunde una estructural igual a una holgura con la básica)
+    for i, j in enumerate(base):
+        if j >= 0 and abs(nueva_fila_z[j]) > 1e-10:
+            nueva_fila_z -= nueva_fila_z[j] * tableau_f2[i + 1]
+    
+    tableau_f2[0] = nueva_fila_z
+    regla.iniciar(np.sum(tableau_f2[1:, :-1] ** 2, axis=0))
+    # Sin las artificiales ya no hay una B^-1 explícita: el desempate usa las filas completas
+    control = ControlDegeneracion(tableau_f2)
+    
+    tablas.nuevo_segmento(tableau_f2, "FASE 2", nombres_f2, base)
+    base = tablas.base
+    
+    # Iteraciones Fase 2
+    while True:
+        # Verificar optimalidad Fase 2 (minimización)
+        # Para minimización: óptimo cuando todos los coeficientes en Z son >= 0
+        col_pivote = control.columna(regla, tableau_f2)
+        if col_pivote < 0:
+            break
+        estado = _limite(tablas, max_iteraciones, fin)
+        if estado:
+            tablas.estado = estado
+            break
+        
+        # Razón mínima
+        fila = control.fila(tableau_f2, col_pivote, base)
+        if fila < 0:
+            tablas.estado = "no_acotado"
+            break
+        control.registrar(tableau_f2, fila, col_pivote)
+        
+        fila_pivote = fila + 1
+        actualizar_tableau(regla, tableau_f2, fila_pivote, col_pivote, base[fila_pivote - 1])
+        
+        # Pivoteo
+        pivotear(tableau_f2, fila_pivote, col_pivote)
+        
+        tablas.agregar_pivote(fila_pivote, col_pivote)
+    
+    tablas.mejor = _punto(tableau_f2, base, c)
+    tablas.cerrar_segmento(tableau_f2)
+    tablas.cerrar()
+    return tablas
@@ -0,0 +1,148 @@
+import numpy as np
+from pivoteo import pivotear
+
+class TrazaSimplex:
+    """
+    Historia compacta de un simplex: el tableau inicial de cada segmento
+    (fase) y la secuencia de pivotes (fila, columna) aplicados sobre él.
+
+    Se usa como la lista `tablas` de antes: cada elemento es
+    (iteracion, tableau), o (titulo, tableau, nombres) si el segmento tiene
+    prefijo, y el tableau se reconstruye al pedirlo reaplicando los pivotes.
+    Con `archivo` los pivotes van a disco y se leen con un memmap; el
+    solver que la llena cierra el archivo al terminar con `cerrar()` (o
+    usándola en un `with`), y agregar pivotes después lo vuelve a abrir.
+
+    `estado` ("optimo", "limite_iteraciones", "limite_tiempo", "no_factible"
+    o "no_acotado") y `mejor` ({"x", "z"} del mejor punto factible, o None)
+    los completa el solver que llenó la traza.
+
+    Si el segmento se abre con su base (índice de columna básica por fila,
+    -1 si la fila no tiene), `base` es la base actual: cada pivote la
+    actualiza, así que leer las básicas es O(m) y no hace falta buscar
+    columnas unitarias. `bases()` da la base de cada tableau de la traza.
+    """
+
+    def __init__(self, archivo=None):
+        self.segmentos = []
+        self.archivo = archivo
+        self.num_pivotes = 0
+        self.estado = "optimo"
+        self.mejor = None
+        self.base = None
+        self.salida = None
+        if archivo is None:
+            self.pivotes = np.empty((64, 2), dtype=np.int32)
+        else:
+            self.salida = open(archivo, "wb")
+        # Última reconstrucción (segmento, k, tableau) para recorridos hacia adelante
+        self.cache = None
+
+    def nuevo_segmento(self, tableau, prefijo=None, nombres=None, base=None):
+        self.base = None if base is None else np.array(base, dtype=int)
+        self.segmentos.append({
+            "inicial": tableau.copy(),
+            "final": None,
+            "prefijo": prefijo,
+            "nombres": nombres,
+            "base": None if base is None else self.base.copy(),
+            "inicio": self.num_pivotes,
+            "num": 0,
+        })
+
+    def agregar_pivote(self, fila, col):
+        if self.archivo is None:
+            if self.num_pivotes == len(self.pivotes):
+                self.pivotes = np.concatenate((self.pivotes, np.empty_like(self.pivotes)))
+            self.pivotes[self.num_pivotes] = (fila, col)
+        else:
+            if self.salida is None:
+                self.salida = open(self.archivo, "ab")
+            self.salida.write(np.array([fila, col], dtype=np.int32).tobytes())
+        self.num_pivotes += 1
+        self.segmentos[-1]["num"] += 1
+        if self.base is not None:
+            self.base[fila - 1] = col
+
+    def cerrar_segmento(self, tableau):
+        """Guarda el tableau final del segmento para no reconstruirlo"""
+        self.segmentos[-1]["final"] = tableau.copy()
+
+    def cerrar(self):
+        """Cierra el archivo de pivotes (la traza se sigue pudiendo leer)"""
+        if self.salida is not None:
+            self.salida.close()
+            self.salida = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def secuencia_pivotes(self):
+        if self.archivo is None:
+            return self.pivotes[:self.num_pivotes]
+        if self.salida is not None:
+            self.salida.flush()
+        if self.num_pivotes == 0:
+            return np.empty((0, 2), dtype=np.int32)
+        return np.memmap(self.archivo, dtype=np.int32, mode="r", shape=(self.num_pivotes, 2))
+
+    def tableau(self, segmento, k):
+        """Tableau del segmento después de sus primeros k pivotes"""
+        seg = self.segmentos[segmento]
+        if k == seg["num"] and seg["final"] is not None:
+            return seg["final"].copy()
+        if self.cache is not None and self.cache[0] == segmento and self.cache[1] <= k:
+            desde, tab = self.cache[1], self.cache[2]
+        else:
+            desde, tab = 0, seg["inicial"].copy()
+        for fila, col in self.secuencia_pivotes()[seg["inicio"] + desde:seg["inicio"] + k]:
+            pivotear(tab, fila, col)
+        self.cache = (segmento, k, tab)
+        return tab.copy()
+
+    def entrada(self, segmento, k, tab):
+        seg = self.segmentos[segmento]
+        if seg["prefijo"] is None:
+            return (k + 1, tab)
+        titulo = f"{seg['prefijo']} - Tabla Inicial" if k == 0 else f"{seg['prefijo']} - Iteración {k}"
+        return (titulo, tab, seg["nombres"])
+
+    def __len__(self):
+        return sum(seg["num"] + 1 for seg in self.segmentos)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        for s, seg in enumerate(self.segmentos):
+            if 0 <= indice <= seg["num"]:
+                return self.entrada(s, indice, self.tableau(s, indice))
+            indice -= seg["num"] + 1
+        raise IndexError("Iteración fuera de rango")
+
+    def bases(self):
+        """Base de cada tableau, en el mismo orden que la iteración (None si no se conoce)"""
+        pivotes = self.secuencia_pivotes()
+        for seg in self.segmentos:
+            base = None if seg["base"] is None else seg["base"].copy()
+            yield None if base is None else base.copy()
+            for k in range(seg["num"]):
+                if base is not None:
+                    fila, col = pivotes[seg["inicio"] + k]
+                    base[fila - 1] = col
+                yield None if base is None else base.copy()
+
+    def __iter__(self):
+        # Recorrido secuencial: un pivote por paso, sin reconstruir desde el inicio
+        pivotes = self.secuencia_pivotes()
+        for s, seg in enumerate(self.segmentos):
+            tab = seg["inicial"].copy()
+            yield self.entrada(s, 0, tab.copy())
+            for k in range(seg["num"]):
+                fila, col = pivotes[seg["inicio"] + k]
+                pivotear(tab, fila, col)
+                yield self.entrada(s, k + 1, tab.copy())
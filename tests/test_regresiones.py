@@ -0,0 +1,159 @@
+"""
+Casos de regresión de los motores de solución y del lector de expresiones.
+
+Uso: python -m pytest -q (desde la raíz del proyecto)
+"""
+import os
+import signal
+import sys
+
+import numpy as np
+import pytest
+from scipy.optimize import linprog
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from expresiones import fila_lineal, objetivo_lineal
+from escalado import escalar_modelo
+from presolve import presolve, postsolve
+from punto_interior import punto_interior
+from ramificacion import ramificacion_acotamiento
+from simplex_lote import simplex_lote
+from simplex_revisado import simplex_revisado
+from simplex_tableau import simplex_dos_fases, simplex_solver
+
+# Ejemplo de Beale: cicla con Dantzig y el desempate por la primera fila
+BEALE_C = np.array([0.75, -20.0, 0.5, -6.0])
+BEALE_A = np.array([[0.25, -8.0, -1.0, 9.0],
+                    [0.5, -12.0, -0.5, 3.0],
+                    [0.0, 0.0, 1.0, 0.0]])
+BEALE_B = np.array([0.0, 0.0, 1.0])
+BEALE_Z = 1.25
+
+@pytest.fixture
+def limite_tiempo():
+    """Falla en vez de colgarse si un motor vuelve a ciclar"""
+    def expirar(*_):
+        raise TimeoutError("El motor no terminó en 10 s (¿ciclado?)")
+    anterior = signal.signal(signal.SIGALRM, expirar)
+    signal.alarm(10)
+    yield
+    signal.alarm(0)
+    signal.signal(signal.SIGALRM, anterior)
+
+# ------------------------------------------------------------- Beale
+
+@pytest.mark.parametrize("escalar", [True, False])
+@pytest.mark.parametrize("regla", ["dantzig", "devex", "steepest_edge", "parcial", "multiple", "bland"])
+def test_beale_revisado(limite_tiempo, regla, escalar):
+    solucion = simplex_revisado(BEALE_C, BEALE_A, BEALE_B, ["<="] * 3, "max", regla=regla,
+                                escalar=escalar)
+    assert solucion["estado"] == "optimo"
+    assert solucion["z"] == pytest.approx(BEALE_Z)
+
+@pytest.mark.parametrize("regla", ["dantzig", "bland"])
+def test_beale_tableau(limite_tiempo, regla):
+    tablas = simplex_solver(BEALE_C, BEALE_A, BEALE_B, regla)
+    assert tablas[-1][1][0, -1] == pytest.approx(BEALE_Z)
+
+def test_beale_dos_fases(limite_tiempo):
+    tablas = simplex_dos_fases(-BEALE_C, BEALE_A, BEALE_B, ["<="] * 3)
+    assert tablas.estado == "optimo"
+    assert tablas.mejor["z"] == pytest.approx(-BEALE_Z)
+
+def test_beale_lote(limite_tiempo):
+    tableaux, estados, _, _ = simplex_lote(np.vstack([BEALE_C, 2 * BEALE_C]), BEALE_A,
+                                           np.vstack([BEALE_B, 3 * BEALE_B]))
+    assert list(estados) == ["optimo", "optimo"]
+    assert tableaux[:, 0, -1] == pytest.approx([BEALE_Z, 6 * BEALE_Z])
+
+def test_beale_punto_interior(limite_tiempo):
+    solucion = punto_interior(BEALE_C, BEALE_A, BEALE_B, ["<="] * 3, "max")
+    assert solucion["estado"] == "optimo"
+    assert solucion["z"] == pytest.approx(BEALE_Z)
+
+def test_beale_ramificacion(limite_tiempo):
+    solucion = ramificacion_acotamiento(BEALE_C, BEALE_A, BEALE_B, ["<="] * 3, "max",
+                                        enteras=np.ones(4, dtype=bool))
+    assert solucion["estado"] == "optimo"
+    assert solucion["z"] == pytest.approx(BEALE_Z)
+
+def test_limite_iteraciones_revisado():
+    solucion = simplex_revisado(BEALE_C, BEALE_A, BEALE_B, ["<="] * 3, "max", escalar=False,
+                                max_iteraciones=1)
+    assert solucion["estado"] == "limite_iteraciones"
+
+# ------------------------------------------------------------- Presolve
+
+@pytest.mark.parametrize("c, A, b, sentidos, z", [
+    ([1.0, 1.0], [[1.0, 0.0], [0.0, 1.0]], [2.0, 3.0], [">=", ">="], 5.0),
+    ([1.0, -1.0], [[1.0, 1.0], [0.0, 1.0], [1.0, 0.0]], [2.0, 3.0, 10.0], [">=", "<=", "<="], -3.0),
+])
+def test_presolve_vacio_minimizacion(limite_tiempo, c, A, b, sentidos, z):
+    # Como la pantalla de minimización: presolve, escalado y Dos Fases
+    modelo = presolve(c, A, b, sentidos, objetivo="min")
+    assert len(modelo["b"]) == 0 and len(modelo["c"]) == 0
+    c_e, A_e, b_e, _, _, s_esc = escalar_modelo(modelo["c"], modelo["A"], modelo["b"])
+    tablas = simplex_dos_fases(c_e, A_e, b_e, modelo["sentidos"])
+    assert tablas.estado == "optimo"
+    x = postsolve(modelo, tablas.mejor["x"] * s_esc)
+    assert np.dot(c, x) == pytest.approx(z)
+
+def test_dos_fases_sin_filas():
+    tablas = simplex_dos_fases(np.array([-1.0, 2.0]), np.zeros((0, 2)), np.zeros(0), [])
+    assert tablas.estado == "no_acotado"
+
+# ------------------------------------------------------------- Expresiones
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("2x2 <= 1.2e1", ({1: 2.0}, "<=", 12.0)),
+    ("x1 <= -2e-1", ({0: 1.0}, "<=", -0.2)),
+    ("x1 + 2x2 >= 3E2", ({0: 1.0, 1: 2.0}, ">=", 300.0)),
+    ("2x1 + 3 <= x2", ({0: 2.0, 1: -1.0}, "<=", -3.0)),
+])
+def test_exponentes(texto, esperado):
+    assert fila_lineal(texto, ["x1", "x2"]) == esperado
+
+@pytest.mark.parametrize("texto", ["x1 + <= 3", "<= 3", "x1 <=", "x1 - x2 -", "2 * <= 3"])
+def test_expresion_incompleta(texto):
+    with pytest.raises(ValueError):
+        fila_lineal(texto, ["x1", "x2"])
+
+def test_objetivo_con_exponente():
+    assert objetivo_lineal("z=1.5e1x1+5x2", ["x1", "x2"]) == {0: 15.0, 1: 5.0}
+
+# ------------------------------------------------------------- Contra linprog
+
+def _lp_aleatorio(semilla):
+    rng = np.random.default_rng(semilla)
+    m, n = rng.integers(1, 7), rng.integers(1, 7)
+    A = rng.integers(-3, 7, (m, n)).astype(float)
+    b = rng.integers(-2, 15, m).astype(float)
+    c = rng.integers(-4, 8, n).astype(float)
+    sentidos = list(rng.choice(["<=", ">=", "="], m, p=[0.6, 0.3, 0.1]))
+    return c, A, b, sentidos
+
+def _linprog(c, A, b, sentidos):
+    signos = np.array([{"<=": 1.0, ">=": -1.0, "=": 0.0}[s] for s in sentidos])
+    desigualdad, igualdad = signos != 0, signos == 0
+    resultado = linprog(c, A_ub=(A * signos[:, None])[desigualdad] if desigualdad.any() else None,
+                        b_ub=(b * signos)[desigualdad] if desigualdad.any() else None,
+                        A_eq=A[igualdad] if igualdad.any() else None,
+                        b_eq=b[igualdad] if igualdad.any() else None)
+    return {0: "optimo", 2: "no_factible", 3: "no_acotado"}[resultado.status], resultado.fun
+
+def _comparar(estado, z, esperado):
+    assert estado == esperado[0]
+    if estado == "optimo":
+        assert z == pytest.approx(esperado[1], rel=1e-6, abs=1e-6)
+
+@pytest.mark.parametrize("semilla", range(40))
+def test_aleatorios_contra_linprog(limite_tiempo, semilla):
+    c, A, b, sentidos = _lp_aleatorio(semilla)
+    esperado = _linprog(c, A, b, sentidos)
+    for escalar in (True, False):
+        solucion = simplex_revisado(c, A, b, sentidos, "min", escalar=escalar)
+        _comparar(solucion["estado"], solucion["z"], esperado)
+    solucion = punto_interior(c, A, b, sentidos, "min")
+    _comparar(solucion["estado"], solucion["z"], esperado)
+    tablas = simplex_dos_fases(c, A, b, sentidos)
+    _comparar(tablas.estado, tablas.mejor["z"] if tablas.mejor else None, esperado)